@@ -0,0 +1,70 @@
+"""
+Бенчмарк cat: пропускная способность (МБ/с) и пиковый RSS потокового cat
+против прежнего read_text() на большом файле
+
+Запуск:
+    python benchmarks/bench_cat.py [--size-mb N]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+STREAMING = (
+    "import sys; sys.path.insert(0, {root!r}); "
+    "from src.commands.cat import cat; cat([{path!r}])"
+)
+LEGACY = (
+    "import sys; from pathlib import Path; "
+    "sys.stdout.write(Path({path!r}).read_text(encoding='utf-8'))"
+)
+
+
+def _run(code: str) -> tuple[float, float]:
+    """
+    Запускает код в отдельном процессе с выводом в /dev/null
+
+    Выход:
+        tuple[float, float] - (время в секундах, пиковый RSS процесса в МиБ)
+    """
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        subprocess.run([sys.executable, "-c", code], stdout=devnull, check=True)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return elapsed, max(peak, before) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    options = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".log", encoding="utf-8", delete=False) as handle:
+        line = "2024-01-01 12:00:00 INFO запрос обработан за 12 мс id=0123456789\n"
+        block = line * (1024 * 1024 // len(line.encode("utf-8")))
+        for _ in range(options.size_mb):
+            handle.write(block)
+        path = handle.name
+
+    try:
+        size_mb = os.path.getsize(path) / 2**20
+        stream_time, stream_rss = _run(STREAMING.format(root=str(PROJECT_ROOT), path=path))
+        print(f"streaming cat: {size_mb / stream_time:8.1f} MB/s, peak RSS {stream_rss:8.1f} MiB")
+        legacy_time, legacy_rss = _run(LEGACY.format(path=path))
+        print(f"read_text:     {size_mb / legacy_time:8.1f} MB/s, peak RSS {legacy_rss:8.1f} MiB")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
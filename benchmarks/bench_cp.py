@@ -0,0 +1,100 @@
+"""
+Бенчмарк движка копирования: время копирования большого файла каждым способом
+(reflink, copy_file_range, sendfile, userspace) и через shutil.copyfile
+
+Способы, не поддерживаемые файловой системой каталога, пропускаются -
+для reflink запускайте на btrfs/xfs.
+
+Запуск:
+    python benchmarks/bench_cp.py [--size-mb N] [--dir PATH]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core import copy_engine  # noqa: E402
+
+STAGES = ("_reflink", "_copy_file_range", "_sendfile")
+
+
+def _skip_stage(src_fd: int, dst_fd: int, offset: int, size: int, notify: object) -> int:
+    """
+    Заглушка способа копирования: ничего не копирует
+    """
+
+    return offset
+
+
+def _forced(method: str) -> list:
+    """
+    Патчи, отключающие все способы, кроме method (userspace - все)
+    """
+
+    disabled = []
+    for stage in STAGES:
+        if stage.lstrip("_") == method:
+            continue
+        if stage == "_reflink":
+            disabled.append(patch.object(copy_engine, stage, return_value=False))
+        else:
+            disabled.append(patch.object(copy_engine, stage, side_effect=_skip_stage))
+    return disabled
+
+
+def _drop(path: str) -> None:
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--dir", default=None, help="каталог для тестовых файлов")
+    options = parser.parse_args()
+
+    root = tempfile.mkdtemp(dir=options.dir)
+    source = os.path.join(root, "source.bin")
+    target = os.path.join(root, "target.bin")
+    try:
+        block = os.urandom(1024 * 1024)
+        with open(source, "wb") as handle:
+            for _ in range(options.size_mb):
+                handle.write(block)
+        os.sync()
+
+        for method in ("reflink", "copy_file_range", "sendfile", "userspace"):
+            patches = _forced(method)
+            for active in patches:
+                active.start()
+            try:
+                start = time.perf_counter()
+                result = copy_engine.copy_file(source, target)
+                elapsed = time.perf_counter() - start
+            finally:
+                for active in patches:
+                    active.stop()
+            _drop(target)
+            if result.method != method:
+                print(f"{method:<16} not supported here (fell back to {result.method})")
+                continue
+            print(f"{method:<16} {elapsed:8.3f} s {options.size_mb / elapsed:9.1f} MB/s")
+
+        start = time.perf_counter()
+        shutil.copyfile(source, target)
+        elapsed = time.perf_counter() - start
+        print(f"{'shutil.copyfile':<16} {elapsed:8.3f} s {options.size_mb / elapsed:9.1f} MB/s")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Бенчмарк cp -r: дерево из множества мелких файлов, shutil.copytree
+против параллельного копирования с разным числом потоков
+
+Запуск:
+    python benchmarks/bench_cp_tree.py [--files N] [--jobs 1 4 16] [--dir PATH]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.commands.cp import cp  # noqa: E402
+
+
+def _make_tree(root: Path, files: int) -> None:
+    """
+    Создаёт дерево: 100 каталогов по files / 100 файлов размером 2 КБ
+    """
+
+    payload = os.urandom(2048)
+    for number in range(files):
+        directory = root / f"dir{number % 100:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{number}.dat").write_bytes(payload)
+
+
+def _measure(label: str, files: int, action) -> None:
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<18} {elapsed:8.3f} s {files / elapsed:10.0f} files/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--dir", default=None, help="каталог для тестовых файлов")
+    options = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(dir=options.dir))
+    source = root / "source"
+    try:
+        _make_tree(source, options.files)
+
+        _measure("shutil.copytree", options.files, lambda: shutil.copytree(source, root / "copytree"))
+        shutil.rmtree(root / "copytree")
+
+        for jobs in options.jobs:
+            target = root / f"jobs{jobs}"
+            _measure(f"cp -r -j {jobs}", options.files, lambda: cp(["-r", "-j", str(jobs), str(source), str(target)]))
+            shutil.rmtree(target)
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Микро-бенчмарк диспетчеризации команд: route_command + do_command
+
+Запуск:
+    python benchmarks/bench_dispatch.py [--count N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from src.core import registry
+from src.core.parser import route_command
+from src.main import do_command
+
+
+def _noop(args: list[str]) -> Optional[str]:
+    return None
+
+
+def _legacy_dispatch(command: str, args: list[str]) -> Optional[str]:
+    """Прежняя схема: словарь lambda и множество пересоздаются на каждый вызов"""
+
+    commands_map = {name: (lambda: _noop(args)) for name in (
+        "ls", "cat", "cd", "cp", "mv", "rm", "zip", "unzip", "tar", "bench_noop"
+    )}
+    error_log_commands = {"cd", "cp", "mv", "rm"}
+    if command in commands_map:
+        result = commands_map[command]()
+        if command in error_log_commands and result is not None:
+            return result
+        return result
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    registry.COMMAND_TABLE["bench_noop"] = registry.CommandSpec("core", "bench", "noop")
+    registry._loaded["bench_noop"] = _noop
+
+    parsed = ("bench_noop", [], "bench_noop")
+
+    start = time.perf_counter()
+    for _ in range(options.count):
+        module, name, args, raw = route_command(parsed)
+        do_command(module, name, args, raw)
+    table_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(options.count):
+        _legacy_dispatch("bench_noop", [])
+    legacy_time = time.perf_counter() - start
+
+    per_call = table_time / options.count * 1e9
+    print(f"table dispatch:  {table_time:.3f} s ({per_call:.0f} ns/command)")
+    print(f"legacy lambdas:  {legacy_time:.3f} s ({legacy_time / options.count * 1e9:.0f} ns/command)")
+
+
+if __name__ == "__main__":
+    main()
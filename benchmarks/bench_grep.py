@@ -0,0 +1,85 @@
+"""
+Бенчмарк grep: поиск по дереву логов построчным чтением с декодированием
+против mmap-поиска одним процессом и пулом процессов
+
+Запуск:
+    python benchmarks/bench_grep.py [--files N] [--size-mb N]
+"""
+
+import argparse
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.commands.grep import grep  # noqa: E402
+
+
+def _make_tree(root: Path, files: int, size_mb: int) -> None:
+    """
+    Создаёт дерево логов общим размером около size_mb МиБ
+    """
+
+    line = "2024-01-01 12:00:00 INFO запрос обработан за 12 мс id=0123456789\n"
+    per_file = max(1, size_mb * 2**20 // files // len(line.encode("utf-8")))
+    for number in range(files):
+        directory = root / f"service{number % 8}"
+        directory.mkdir(exist_ok=True)
+        with open(directory / f"app{number}.log", "w", encoding="utf-8") as handle:
+            handle.write(line * per_file)
+            handle.write("2024-01-01 12:00:01 ERROR timeout id=42\n")
+
+
+def _line_by_line(root: Path) -> int:
+    """
+    Наивный поиск: чтение строк с декодированием и str-регулярным выражением
+    """
+
+    regex = re.compile("ERROR.*timeout")
+    found = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            with open(os.path.join(directory, name), encoding="utf-8") as handle:
+                found += sum(1 for line in handle if regex.search(line))
+    return found
+
+
+def _measure(label: str, size_mb: float, action) -> None:
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms {size_mb / elapsed:9.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=256)
+    parser.add_argument("--size-mb", type=int, default=512)
+    options = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        _make_tree(root, options.files, options.size_mb)
+        size_mb = sum(path.stat().st_size for path in root.rglob("*.log")) / 2**20
+
+        def builtin(jobs: int) -> None:
+            with patch("sys.stdout", new_callable=io.StringIO):
+                grep(["-rc", "--jobs", str(jobs), "ERROR.*timeout", str(root)])
+
+        _measure("line-by-line", size_mb, lambda: _line_by_line(root))
+        _measure("grep mmap, 1 process", size_mb, lambda: builtin(1))
+        _measure(f"grep mmap, {os.cpu_count()} procs", size_mb, lambda: builtin(os.cpu_count() or 1))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
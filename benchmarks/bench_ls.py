@@ -0,0 +1,70 @@
+"""
+Бенчмарк ls -l на большом каталоге: os.scandir (один stat на элемент) против Path.iterdir
+
+Запуск:
+    python benchmarks/bench_ls.py [--entries N]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.commands.ls import ls
+
+
+def _legacy_ls_l(goal_path: Path) -> str:
+    """Прежняя реализация: iterdir + stat + два is_dir на элемент"""
+
+    items = list(goal_path.iterdir())
+    items.sort(key=lambda x: x.name.lower())
+    lines = []
+    for item in items:
+        stat_info = item.stat()
+        file_type = "d" if item.is_dir() else "-"
+        mtime = datetime.datetime.fromtimestamp(stat_info.st_mtime)
+        name = item.name + "/" if item.is_dir() else item.name
+        lines.append(f"{file_type} {stat_info.st_size:8} {mtime.strftime('%Y-%m-%d %H:%M')} {name}")
+    return "\n".join(lines)
+
+
+def _populate(directory: Path, entries: int) -> None:
+    for index in range(entries):
+        if index % 50 == 0:
+            (directory / f"dir_{index:07d}").mkdir()
+        else:
+            fd = os.open(directory / f"file_{index:07d}.dat", os.O_CREAT | os.O_WRONLY, 0o644)
+            os.close(fd)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100_000)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        _populate(directory, options.entries)
+
+        start = time.perf_counter()
+        new_output = ls(["-l", str(directory)])
+        scandir_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy_output = _legacy_ls_l(directory)
+        legacy_time = time.perf_counter() - start
+
+        assert new_output == legacy_output, "outputs differ"
+        print(f"ls -l on {options.entries} entries")
+        print(f"  scandir engine: {scandir_time:.3f} s")
+        print(f"  Path.iterdir:   {legacy_time:.3f} s ({legacy_time / scandir_time:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Бенчмарк ls -R: параллельный обход пулом потоков против последовательного
+
+Запуск:
+    python benchmarks/bench_ls_recursive.py [--dirs N] [--files N] [--jobs N] [--root PATH]
+
+На локальном диске с прогретым кэшем выигрыш невелик; заметный эффект даёт
+хранилище с высокой задержкой (NFS, HDD) - для него укажите --root.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.commands.ls import ls
+
+
+def _populate(root: Path, dirs: int, files: int) -> None:
+    for index in range(dirs):
+        directory = root / f"d{index % 10}" / f"sub{index:05d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for number in range(files):
+            fd = os.open(directory / f"f{number:04d}", os.O_CREAT | os.O_WRONLY, 0o644)
+            os.close(fd)
+
+
+def _timed_ls(args: list[str]) -> tuple[float, str]:
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(buffer):
+        ls(args)
+    return time.perf_counter() - start, buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dirs", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--root", help="существующий каталог для обхода вместо синтетического")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(options.root) if options.root else Path(tmp)
+        if not options.root:
+            _populate(root, options.dirs, options.files)
+
+        for detailed in (False, True):
+            flags = "-lR" if detailed else "-R"
+            serial_time, serial_output = _timed_ls([flags, "--jobs", "1", str(root)])
+            parallel_time, parallel_output = _timed_ls([flags, "--jobs", str(options.jobs), str(root)])
+            assert serial_output == parallel_output, "parallel output is not deterministic"
+            print(f"ls {flags}: serial {serial_time:.3f} s, "
+                  f"{options.jobs} workers {parallel_time:.3f} s "
+                  f"({serial_time / parallel_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
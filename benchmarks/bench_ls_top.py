@@ -0,0 +1,64 @@
+"""
+Бенчмарк ls --top N: колоночная таблица (array + куча/argpartition) против
+сортировки списка Path по stat
+
+Запуск:
+    python benchmarks/bench_ls_top.py [--entries N] [--top N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.commands.ls import ls
+
+
+def _legacy_top(directory: Path, top: int) -> list[str]:
+    items = list(directory.iterdir())
+    items.sort(key=lambda item: item.stat().st_size, reverse=True)
+    return [item.name for item in items[:top]]
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--top", type=int, default=20)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for index in range(options.entries):
+            fd = os.open(directory / f"f{index:07d}", os.O_CREAT | os.O_WRONLY, 0o644)
+            os.ftruncate(fd, (index * 7919) % 1_000_003)
+            os.close(fd)
+
+        table_result, table_time, table_peak = _measure(
+            ls, ["--top", str(options.top), str(directory)]
+        )
+        legacy_result, legacy_time, legacy_peak = _measure(_legacy_top, directory, options.top)
+
+        assert table_result.split("\n") == legacy_result, "top-k results differ"
+        print(f"top {options.top} of {options.entries} entries by size")
+        print(f"  columnar table: {table_time:.3f} s, peak {table_peak / 2**20:.1f} MiB")
+        print(f"  list[Path]:     {legacy_time:.3f} s, peak {legacy_peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Бенчмарк rm -r: дерево из множества мелких файлов, shutil.rmtree
+против параллельного удаления через dir_fd с разным числом потоков
+
+Запуск:
+    python benchmarks/bench_rm_tree.py [--files 1000000] [--jobs 1 4 16] [--dir PATH]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.tree_remove import remove_tree  # noqa: E402
+
+
+def _make_tree(root: Path, files: int) -> None:
+    """
+    Создаёт дерево: 1000 каталогов в два уровня (10 x 100), пустые файлы
+    """
+
+    for number in range(files):
+        directory = root / f"top{number % 10}" / f"dir{number % 1000:03d}"
+        if number < 1000:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file{number}.o").touch()
+
+
+def _measure(label: str, files: int, action) -> None:
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<18} {elapsed:8.3f} s {files / elapsed:10.0f} files/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--dir", default=None, help="каталог для тестовых файлов")
+    options = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(dir=options.dir))
+    try:
+        _make_tree(root / "rmtree", options.files)
+        _measure("shutil.rmtree", options.files, lambda: shutil.rmtree(root / "rmtree"))
+
+        for jobs in options.jobs:
+            target = root / f"jobs{jobs}"
+            _make_tree(target, options.files)
+            _measure(f"rm -r -j {jobs}", options.files, lambda: remove_tree(str(target), jobs))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Бенчмарк времени запуска оболочки до первого приглашения (time-to-first-prompt)
+
+Запуск:
+    python benchmarks/bench_startup.py [--runs N] [--budget SECONDS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MAIN_PATH = PROJECT_ROOT / "src" / "main.py"
+PROMPT_MARKER = "dev-1-lan".encode()
+
+
+def time_to_first_prompt() -> float:
+    """
+    Запускает оболочку и измеряет время до появления приглашения
+
+    Выход:
+        float - время в секундах
+    """
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(MAIN_PATH), "-i"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        cwd=tempfile.gettempdir(),
+    )
+    assert proc.stdout is not None and proc.stdin is not None
+
+    buffer = b""
+    while PROMPT_MARKER not in buffer:
+        chunk = os.read(proc.stdout.fileno(), 4096)
+        if not chunk:
+            break
+        buffer += chunk
+    elapsed = time.perf_counter() - start
+
+    proc.stdin.write(b"exit\n")
+    proc.stdin.close()
+    proc.wait(timeout=10)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=0.3)
+    options = parser.parse_args()
+
+    samples = [time_to_first_prompt() for _ in range(options.runs)]
+    median = statistics.median(samples)
+    print(f"time-to-first-prompt: median {median * 1000:.1f} ms, "
+          f"min {min(samples) * 1000:.1f} ms, max {max(samples) * 1000:.1f} ms")
+
+    assert median < options.budget, f"startup {median:.3f}s exceeds budget {options.budget:.3f}s"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,54 @@
-from src.commands.ls import ls
-from src.commands.cd import cd
-from src.commands.cat import cat
-from src.commands.cp import cp
-from src.commands.mv import mv
-from src.commands.rm import rm
-from src.commands.zip_tar import zippig, unzipping, tarring, untarring
+import importlib
+from typing import Any
+
+_LAZY_ATTRS = {
+    "ls": "src.commands.ls",
+    "cd": "src.commands.cd",
+    "cat": "src.commands.cat",
+    "head": "src.commands.head_tail",
+    "tail": "src.commands.head_tail",
+    "grep": "src.commands.grep",
+    "cp": "src.commands.cp",
+    "mv": "src.commands.mv",
+    "rm": "src.commands.rm",
+    "trash": "src.commands.trash",
+    "zippig": "src.commands.zip_tar",
+    "unzipping": "src.commands.zip_tar",
+    "tarring": "src.commands.zip_tar",
+    "untarring": "src.commands.zip_tar",
+}
 
 __all__ = [
     "ls",
     "cd",
     "cat",
+    "head",
+    "tail",
+    "grep",
     "cp",
     "mv",
     "rm",
+    "trash",
     "zippig",
     "unzipping",
     "tarring",
     "untarring",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Ленивый импорт команд: модуль загружается только при первом обращении
+
+    Вход:
+        name: str - имя атрибута пакета
+
+    Выход:
+        Any - функция команды
+    """
+
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(module_name), name)
@@ -1,31 +1,206 @@
+import codecs
+import sys
+from pathlib import Path
+from typing import Optional
 from src.core.path_utils import resolve_path
+from src.core import stats
 
-def cat(args: list[str]) -> str:
+CHUNK_SIZE = 1024 * 1024
+SNIFF_SIZE = 8192
+HEX_LINE = 16
+CONTROL_RATIO = 0.3
+_CONTROL_BYTES = bytes(byte for byte in range(32) if byte not in b"\t\n\r\f\b\x1b")
+_PRINTABLE = bytes(byte if 32 <= byte < 127 else ord(".") for byte in range(256))
+
+
+def cat(args: list[str]) -> Optional[str]:
     """
-    Команда cat - вывод содержимого файла
+    Команда cat - потоковый вывод содержимого файлов
+
+    Файлы читаются блоками фиксированного размера в один переиспользуемый буфер
+    и сразу пишутся в stdout, поэтому память не зависит от размера файла.
 
     Вход:
-        args: list[str] - список аргументов ['file.txt'] | ['/path/file.txt']
+        args: list[str] - список аргументов ['file.txt'] | ['/path/file.txt', 'other.txt']
+                          | ['--hexdump', 'image.png']
 
     Выход:
-        str - содержимое файла | строка с ошибкой
+        None | str - None при успехе; строка с ошибками при fail
     """
 
-    if len(args) == 0:
+    hexdump = "--hexdump" in args
+    names = [arg for arg in args if arg != "--hexdump"]
+
+    for name in names:
+        if name.startswith("-"):
+            return f"ERROR: Incorrect option {name}"
+
+    if len(names) == 0:
         return "ERROR: 'cat' requires filename"
 
-    file_path = resolve_path(args[0], must_be=True, must_file=True)
+    errors = []
+    for name in names:
+        file_path = resolve_path(name, must_be=True, must_file=True)
+
+        if file_path is None:
+            errors.append(f"ERROR: File '{name}' does not exist or is not a file")
+            continue
+
+        result = _hexdump_file(file_path) if hexdump else _stream_file(file_path)
+        if result is not None:
+            errors.append(result)
+
+    if errors:
+        return "\n".join(errors)
+    return None
+
+
+def _stream_file(file_path: Path) -> Optional[str]:
+    """
+    Выводит один файл в stdout блоками с инкрементальным декодированием UTF-8
+
+    Вход:
+        file_path: Path - путь к файлу
+
+    Выход:
+        None | str - None при успехе; сообщение об ошибке или бинарном файле
+    """
 
-    if file_path is None:
-        return f"ERROR: File '{args[0]}' does not exist or is not a file"
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    total = 0
+    last_char = "\n"
 
     try:
-        content = file_path.read_text(encoding='utf-8')
-        return content
+        with open(file_path, "rb", buffering=0) as source:
+            first = True
+            while True:
+                read = source.readinto(buffer)
+                if not read:
+                    break
+                if first and is_binary(view[:min(read, SNIFF_SIZE)]):
+                    return _binary_message(file_path)
+                first = False
+                total += read
+                text = decoder.decode(view[:read])
+                if text:
+                    sys.stdout.write(text)
+                    last_char = text[-1]
+
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                sys.stdout.write(tail)
+                last_char = tail[-1]
+
+    except UnicodeDecodeError:
+        return _binary_message(file_path)
+
+    except (PermissionError, IOError, OSError) as err:
+        return f"ERROR: {str(err)}"
+
+    finally:
+        view.release()
+        stats.count(bytes_read=total, entries=1)
+
+    if last_char != "\n":
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+    return None
+
+
+def is_binary(block: "bytes | memoryview") -> bool:
+    """
+    Эвристика бинарного файла по первому блоку: NUL-байты, невалидный UTF-8
+    или большая доля управляющих символов
+
+    Вход:
+        block: bytes | memoryview - первые байты файла
+
+    Выход:
+        bool - True если содержимое похоже на бинарное
+    """
 
+    data = bytes(block)
+    if b"\0" in data:
+        return True
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data, final=False)
     except UnicodeDecodeError:
-        file_size = file_path.stat().st_size
-        return f"BINARY FILE: {file_path.name} ({file_size} bytes)\nUse specialized tools to view binary files"
+        return True
+
+    if not data:
+        return False
+    controls = len(data) - len(data.translate(None, _CONTROL_BYTES))
+    return controls / len(data) > CONTROL_RATIO
+
+
+def _binary_message(file_path: Path) -> str:
+    """
+    Сообщение о бинарном файле
+
+    Вход:
+        file_path: Path - путь к файлу
+
+    Выход:
+        str - сообщение с размером файла
+    """
+
+    file_size = file_path.stat().st_size
+    return (
+        f"BINARY FILE: {file_path.name} ({file_size} bytes)\n"
+        "Use 'cat --hexdump' or specialized tools to view binary files"
+    )
+
+
+def _hexdump_file(file_path: Path) -> Optional[str]:
+    """
+    Потоковый вывод файла в шестнадцатеричном виде (как hexdump -C)
+
+    Вход:
+        file_path: Path - путь к файлу
+
+    Выход:
+        None | str - None при успехе; строка с ошибкой при fail
+    """
 
+    offset = 0
+    try:
+        with open(file_path, "rb") as source:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = []
+                for start in range(0, len(chunk), HEX_LINE):
+                    lines.append(_hex_line(offset + start, chunk[start:start + HEX_LINE]))
+                sys.stdout.write("\n".join(lines) + "\n")
+                offset += len(chunk)
+            sys.stdout.write(f"{offset:08x}\n")
+            sys.stdout.flush()
     except (PermissionError, IOError, OSError) as err:
         return f"ERROR: {str(err)}"
+    finally:
+        stats.count(bytes_read=offset, entries=1)
+
+    return None
+
+
+def _hex_line(offset: int, row: bytes) -> str:
+    """
+    Одна строка hexdump: смещение, 16 байт в hex двумя группами и ASCII-колонка
+
+    Вход:
+        offset: int - смещение первого байта строки
+        row: bytes - до 16 байт
+
+    Выход:
+        str - строка вида "00000000  89 50 4e 47 ...  |.PNG....|"
+    """
+
+    left = row[:8].hex(" ")
+    right = row[8:].hex(" ")
+    ascii_part = row.translate(_PRINTABLE).decode("ascii")
+    return f"{offset:08x}  {left:<23}  {right:<23}  |{ascii_part}|"
+
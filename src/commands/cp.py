@@ -1,9 +1,55 @@
-import shutil
-from typing import Optional, Union, Tuple, List
+import sys
+from typing import NamedTuple, Optional, Union
 from src.core.path_utils import resolve_path
+from src.core import stats
+from src.core.copy_engine import CopyResult
+from src.core.progress import Progress
+from src.core.tree_copy import COPY_WORKERS, TreeCopier
 
 
-def _parse_cp_args(args: list[str]) -> Union[Tuple[List[str], str, bool], str]:
+class CpOptions(NamedTuple):
+    """
+    Разобранные аргументы команды cp
+
+    Поля:
+        sources: list[str] - источники
+        destination: str - назначение
+        recursive: bool - рекурсивное копирование каталогов (-r)
+        verbose: bool - выводить каждый скопированный файл и способ копирования (-v)
+        jobs: int - число потоков копирования файлов (-j N)
+        update: bool - копировать только новые и изменённые файлы в существующее назначение (-u)
+        checksum: bool - сравнивать файлы по содержимому, а не по времени изменения (--checksum)
+        delete: bool - удалять из назначения то, чего нет в источнике (--delete)
+        progress: bool - показывать объём, скорость и оставшееся время в stderr (--progress)
+        resume: bool - продолжать частично скопированные файлы назначения (--resume)
+        verify: bool - хэшировать данные при копировании и проверять назначение (--verify)
+        manifest: str | None - файл для записи хэшей скопированных файлов (--manifest FILE)
+    """
+
+    sources: list[str]
+    destination: str
+    recursive: bool = False
+    verbose: bool = False
+    jobs: int = COPY_WORKERS
+    update: bool = False
+    checksum: bool = False
+    delete: bool = False
+    progress: bool = False
+    resume: bool = False
+    verify: bool = False
+    manifest: Optional[str] = None
+
+
+_SHORT_FLAGS = {"r": "recursive", "v": "verbose", "u": "update"}
+_LONG_FLAGS = {
+    "--update": "update", "--checksum": "checksum", "--delete": "delete",
+    "--progress": "progress", "--resume": "resume", "--verify": "verify",
+}
+_VALUE_OPTIONS = {"-j": "jobs", "--jobs": "jobs"}
+_PATH_OPTIONS = {"--manifest": "manifest"}
+
+
+def _parse_cp_args(args: list[str]) -> Union[CpOptions, str]:
     """
     Парсинг аргументов команды cp
 
@@ -11,17 +57,35 @@ def _parse_cp_args(args: list[str]) -> Union[Tuple[List[str], str, bool], str]:
         args: list[str] - список аргументов
 
     Выход:
-        tuple[list[str], str, bool] | str - (sources, destination, recursive) или строка с ошибкой
+        CpOptions | str - разобранные опции или строка с ошибкой
     """
 
     sources: list[str] = []
-    recurs = False
+    values: dict[str, object] = {}
     destination = None
-
-    for arg in args:
-        if arg.startswith("-"):
-            if arg == "-r":
-                recurs = True
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+
+        if arg in _VALUE_OPTIONS:
+            if index >= len(args) or not args[index].isdigit() or int(args[index]) < 1:
+                return f"ERROR: Option {arg} requires a positive number"
+            values[_VALUE_OPTIONS[arg]] = int(args[index])
+            index += 1
+        elif arg in _PATH_OPTIONS:
+            if index >= len(args):
+                return f"ERROR: Option {arg} requires a file name"
+            values[_PATH_OPTIONS[arg]] = args[index]
+            values["verify"] = True
+            index += 1
+        elif arg in _LONG_FLAGS:
+            values[_LONG_FLAGS[arg]] = True
+        elif arg.startswith("-"):
+            if len(arg) > 1 and not arg.startswith("--") and all(flag in _SHORT_FLAGS for flag in arg[1:]):
+                for flag in arg[1:]:
+                    values[_SHORT_FLAGS[flag]] = True
             else:
                 return f"ERROR: Incorrect option {arg}"
         else:
@@ -33,7 +97,10 @@ def _parse_cp_args(args: list[str]) -> Union[Tuple[List[str], str, bool], str]:
     if not sources or destination is None:
         return "ERROR: 'cp' requires source and destination"
 
-    return sources, destination, recurs
+    if (values.get("checksum") or values.get("delete")) and not values.get("update"):
+        return "ERROR: Options --checksum and --delete require -u"
+
+    return CpOptions(sources, destination, **values)  # type: ignore[arg-type]
 
 
 def cp(args: list[str]) -> Optional[str]:
@@ -42,6 +109,10 @@ def cp(args: list[str]) -> Optional[str]:
 
     Вход:
         args: list[str] - список аргументов ["source", "dest"] | ["-r", "source", "dest"]
+                          | ["-rv", "-j", "16", "source1", "dest", "source2"]
+                          | ["-ru", "--delete", "source", "backup"]
+                          | ["--progress", "--resume", "disk.img", "/mnt/backup"]
+                          | ["-r", "--verify", "--manifest", "backup.b2", "data", "backup"]
 
     Выход:
         None | str - None при успехе; строка с ошибкой при fail
@@ -50,36 +121,75 @@ def cp(args: list[str]) -> Optional[str]:
     if len(args) < 2:
         return "ERROR: 'cp' requires source and destination"
 
-    parsed_args = _parse_cp_args(args)
-    if isinstance(parsed_args, str):
-        return parsed_args
+    options = _parse_cp_args(args)
+    if isinstance(options, str):
+        return options
 
-    sources, destination, recurs = parsed_args
-
-    if len(sources) > 1:
-        destination_path = resolve_path(destination, must_be=True, must_dir=True)
+    if len(options.sources) > 1:
+        destination_path = resolve_path(options.destination, must_be=True, must_dir=True)
         if destination_path is None:
             return "ERROR: Multiple sources require existing directory destination"
 
+    manifest = None
+    if options.manifest is not None:
+        try:
+            manifest = open(options.manifest, "w", encoding="utf-8")
+        except OSError as err:
+            return f"ERROR: {str(err)}"
+
+    def on_copied(source: str, destination: str, result: CopyResult) -> None:
+        stats.count(bytes_read=result.size, bytes_written=result.size, entries=1)
+        if options.verbose:
+            resumed = f", resumed at {result.resumed}" if result.resumed else ""
+            verified = ", verified" if result.digest is not None else ""
+            sys.stdout.write(f"'{source}' -> '{destination}' ({result.method}{resumed}{verified})\n")
+        if manifest is not None:
+            manifest.write(f"{result.digest}  {destination}\n")
+
+    progress = Progress() if options.progress else None
     errors = []
-    for source in sources:
-        result = _copy_item(source, destination, recurs)
-        if result is not None:
-            errors.append(result)
+    copier = TreeCopier(
+        options.jobs,
+        on_copied,
+        update=options.update,
+        checksum=options.checksum,
+        delete=options.delete,
+        resume=options.resume,
+        verify=options.verify,
+        progress=progress,
+    )
+    try:
+        for source in options.sources:
+            result = _copy_item(source, options.destination, options, copier)
+            if result is not None:
+                errors.append(result)
+    finally:
+        errors.extend(copier.close())
+        stats.count(entries=copier.skipped)
+        if progress is not None:
+            progress.finish()
+        if manifest is not None:
+            manifest.close()
+
+    if options.verbose and options.update:
+        sys.stdout.write(f"skipped {copier.skipped} unchanged, removed {copier.removed}\n")
 
     if errors:
         return "\n".join(errors)
     return None
 
 
-def _copy_item(source: str, destination: str, recursive: bool) -> Optional[str]:
+def _copy_item(source: str, destination: str, options: CpOptions, copier: TreeCopier) -> Optional[str]:
     """
-    Копирует один элемент (файл или директорию)
+    Ставит в очередь копирование одного элемента (файла или директории)
+
+    Ошибки копирования отдельных файлов собирает copier.
 
     Вход:
         source: str - путь к источнику
         destination: str - путь к назначению
-        recursive: bool - флаг рекурсивного копирования
+        options: CpOptions - опции (recursive)
+        copier: TreeCopier - общий для всех источников параллельный копировщик
 
     Выход:
         None | str - None при успехе; строка с ошибкой при fail
@@ -100,7 +210,7 @@ def _copy_item(source: str, destination: str, recursive: bool) -> Optional[str]:
     if source_path == destination_path:
         return "ERROR: Source and destination are the same"
 
-    if recursive and source_path.is_dir():
+    if options.recursive and source_path.is_dir():
         try:
             if destination_path.is_relative_to(source_path):
                 return "ERROR: Cannot copy directory into itself"
@@ -109,16 +219,17 @@ def _copy_item(source: str, destination: str, recursive: bool) -> Optional[str]:
 
     try:
         if source_path.is_file():
-            shutil.copy2(source_path, destination_path)
+            copier.copy_file(str(source_path), str(destination_path))
         elif source_path.is_dir():
-            if recursive:
-                shutil.copytree(source_path, destination_path)
+            if options.recursive:
+                copier.copy_tree(str(source_path), str(destination_path))
             else:
                 return f"ERROR: '{source}' is a directory (use -r)"
         else:
             return f"ERROR: '{source}' is not a file or directory"
 
-    except (shutil.Error, OSError, IOError, PermissionError) as err:
+    except (OSError, IOError, PermissionError) as err:
         return f"ERROR: {str(err)}"
 
     return None
+
@@ -0,0 +1,446 @@
+import mmap
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+from src.core.path_utils import resolve_path
+from src.core import stats
+from src.commands.cat import SNIFF_SIZE, is_binary
+
+PARALLEL_MIN_FILES = 8
+PENDING_PER_WORKER = 4
+NEWLINE_CHUNK = 1 << 20
+
+
+class GrepOptions(NamedTuple):
+    """
+    Разобранные аргументы команды grep
+
+    Поля:
+        pattern: str - регулярное выражение
+        paths: list[str] - файлы и каталоги для поиска
+        recursive: bool - обход каталогов (-r)
+        ignore_case: bool - поиск без учёта регистра (-i)
+        line_numbers: bool - вывод номеров строк (-n)
+        count_only: bool - вывод числа совпавших строк по файлам (-c)
+        files_only: bool - вывод только имён файлов с совпадениями (-l)
+        jobs: int - число процессов поиска (--jobs N)
+    """
+
+    pattern: str
+    paths: list[str]
+    recursive: bool = False
+    ignore_case: bool = False
+    line_numbers: bool = False
+    count_only: bool = False
+    files_only: bool = False
+    jobs: int = os.cpu_count() or 1
+
+
+class _FileResult(NamedTuple):
+    """
+    Результат поиска в одном файле
+
+    Поля:
+        lines: list[str] - строки вывода для файла
+        scanned: int - число просмотренных байт
+        error: str | None - сообщение об ошибке чтения
+    """
+
+    lines: list[str]
+    scanned: int
+    error: Optional[str]
+
+
+_SHORT_FLAGS = {"r": "recursive", "i": "ignore_case", "n": "line_numbers", "c": "count_only", "l": "files_only"}
+_LONG_FLAGS = {"--recursive": "recursive", "--ignore-case": "ignore_case"}
+_VALUE_OPTIONS = {"--jobs": "jobs"}
+
+
+def _parse_grep_args(args: list[str]) -> Union[GrepOptions, str]:
+    """
+    Парсинг аргументов команды grep
+
+    Вход:
+        args: list[str] - список аргументов
+
+    Выход:
+        GrepOptions | str - разобранные опции или строка с ошибкой
+    """
+
+    values: dict[str, object] = {}
+    positional = []
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+
+        if arg in _VALUE_OPTIONS:
+            if index >= len(args) or not args[index].isdigit() or int(args[index]) < 1:
+                return f"ERROR: Option {arg} requires a positive number"
+            values[_VALUE_OPTIONS[arg]] = int(args[index])
+            index += 1
+        elif arg in _LONG_FLAGS:
+            values[_LONG_FLAGS[arg]] = True
+        elif arg.startswith("-") and len(arg) > 1 and not arg.startswith("--"):
+            for flag in arg[1:]:
+                if flag not in _SHORT_FLAGS:
+                    return f"ERROR: Incorrect option {arg}"
+                values[_SHORT_FLAGS[flag]] = True
+        elif arg.startswith("--"):
+            return f"ERROR: Incorrect option {arg}"
+        else:
+            positional.append(arg)
+
+    if not positional:
+        return "ERROR: 'grep' requires a pattern"
+
+    paths = positional[1:]
+    if not paths:
+        if not values.get("recursive"):
+            return "ERROR: 'grep' requires filename"
+        paths = ["."]
+
+    if values.get("count_only") and values.get("files_only"):
+        return "ERROR: Options -c and -l cannot be combined"
+
+    return GrepOptions(positional[0], paths, **values)  # type: ignore[arg-type]
+
+
+def grep(args: list[str]) -> Optional[str]:
+    """
+    Команда grep - поиск строк по регулярному выражению
+
+    Файлы отображаются в память (mmap) и просматриваются скомпилированным
+    байтовым регулярным выражением без декодирования всего содержимого.
+    При большом числе файлов поиск идёт параллельно в пуле процессов, а
+    результаты выводятся по мере готовности в порядке обхода.
+
+    Вход:
+        args: list[str] - список аргументов ["error", "app.log"] | ["-rin", "timeout", "logs"]
+                          | ["-c", "--jobs", "4", "ERROR", "a.log", "b.log"]
+
+    Выход:
+        None | str - None при успехе; строка с ошибками при fail
+    """
+
+    options = _parse_grep_args(args)
+    if isinstance(options, str):
+        return options
+
+    flags = re.MULTILINE | (re.IGNORECASE if options.ignore_case else 0)
+    try:
+        re.compile(os.fsencode(options.pattern), flags)
+    except re.error as err:
+        return f"ERROR: Invalid pattern: {err}"
+
+    errors: list[str] = []
+    files = list(_collect_files(options, errors))
+    show_names = options.recursive or len(files) > 1
+
+    scanned = 0
+    for result in _search_all(files, options, flags, show_names):
+        scanned += result.scanned
+        if result.error is not None:
+            errors.append(result.error)
+        elif result.lines:
+            sys.stdout.write("\n".join(result.lines) + "\n")
+            sys.stdout.flush()
+
+    stats.count(bytes_read=scanned, entries=len(files))
+
+    if errors:
+        return "\n".join(errors)
+    return None
+
+
+def _collect_files(options: GrepOptions, errors: list[str]) -> Iterator[str]:
+    """
+    Файлы для поиска: аргументы-файлы и, при -r, содержимое каталогов
+
+    Вход:
+        options: GrepOptions - опции
+        errors: list[str] - список, в который добавляются ошибки
+
+    Выход:
+        Iterator[str] - пути к файлам в порядке вывода (как заданы пользователем)
+    """
+
+    for name in options.paths:
+        path = resolve_path(name, must_be=True)
+        if path is None:
+            errors.append(f"ERROR: File '{name}' does not exist")
+        elif path.is_file():
+            yield name
+        elif not path.is_dir():
+            errors.append(f"ERROR: '{name}' is not a regular file")
+        elif not options.recursive:
+            errors.append(f"ERROR: '{name}' is a directory (use -r)")
+        else:
+            yield from _walk(path, name, errors)
+
+
+def _walk(directory: Path, shown: str, errors: list[str]) -> Iterator[str]:
+    """
+    Обход каталога в глубину в порядке имён (ссылки на каталоги не раскрываются)
+
+    Обход итеративный: стек хранит итераторы по уже прочитанным каталогам,
+    поэтому глубина дерева не ограничена глубиной рекурсии.
+
+    Вход:
+        directory: Path - каталог
+        shown: str - путь каталога для вывода
+        errors: list[str] - список, в который добавляются ошибки
+
+    Выход:
+        Iterator[str] - пути к файлам
+    """
+
+    stack = [(shown, iter(_sorted_entries(str(directory), errors)))]
+    while stack:
+        shown, items = stack[-1]
+        for item in items:
+            try:
+                if item.is_dir(follow_symlinks=False):
+                    subdirectory = os.path.join(shown, item.name)
+                    stack.append((subdirectory, iter(_sorted_entries(item.path, errors))))
+                    break
+                if item.is_file():
+                    yield os.path.join(shown, item.name)
+            except OSError as err:
+                errors.append(f"ERROR: {str(err)}")
+        else:
+            stack.pop()
+
+
+def _sorted_entries(directory: str, errors: list[str]) -> list[os.DirEntry[str]]:
+    """
+    Содержимое каталога в порядке имён
+
+    Выход:
+        list[os.DirEntry] - элементы; пустой список и ошибка в errors, если каталог не читается
+    """
+
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(entries, key=lambda x: x.name)
+    except OSError as err:
+        errors.append(f"ERROR: {str(err)}")
+        return []
+
+
+def _search_all(
+    files: list[str], options: GrepOptions, flags: int, show_names: bool
+) -> Iterator[_FileResult]:
+    """
+    Поиск по всем файлам: последовательно или пулом процессов
+
+    Пул создаётся только при числе файлов не меньше PARALLEL_MIN_FILES, так как
+    запуск процессов дороже поиска в нескольких файлах. Задачи отправляются
+    окном ограниченного размера, результаты отдаются в порядке файлов.
+
+    Вход:
+        files: list[str] - пути к файлам
+        options: GrepOptions - опции
+        flags: int - флаги регулярного выражения
+        show_names: bool - выводить ли имя файла перед строкой
+
+    Выход:
+        Iterator[_FileResult] - результаты по файлам
+    """
+
+    pattern: Union[bytes, str] = os.fsencode(options.pattern)
+    if options.ignore_case and not options.pattern.isascii():
+        pattern = options.pattern
+    task = (pattern, flags, options.line_numbers, options.count_only, options.files_only, show_names)
+    cwd = os.getcwd()
+
+    if options.jobs == 1 or len(files) < PARALLEL_MIN_FILES:
+        for name in files:
+            yield _search_file(os.path.join(cwd, name), name, *task)
+        return
+
+    with ProcessPoolExecutor(max_workers=options.jobs) as executor:
+        pending: deque[Future[_FileResult]] = deque()
+        window = options.jobs * PENDING_PER_WORKER
+        for name in files:
+            pending.append(executor.submit(_search_file, os.path.join(cwd, name), name, *task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _count_newlines(data: mmap.mmap, start: int, end: int) -> int:
+    """
+    Число переводов строки в data[start:end]
+
+    Диапазон считается срезами не длиннее NEWLINE_CHUNK: подсчёт идёт в C
+    (bytes.count), а копируется не больше одного среза за раз.
+
+    Вход:
+        data: mmap.mmap - отображённый файл
+        start: int - начало диапазона
+        end: int - конец диапазона (не включается)
+
+    Выход:
+        int - число переводов строки
+    """
+
+    return sum(
+        data[offset:min(offset + NEWLINE_CHUNK, end)].count(b"\n") for offset in range(start, end, NEWLINE_CHUNK)
+    )
+
+
+def _search_file(
+    path: str,
+    shown: str,
+    pattern: Union[bytes, str],
+    flags: int,
+    line_numbers: bool,
+    count_only: bool,
+    files_only: bool,
+    show_names: bool,
+) -> _FileResult:
+    """
+    Поиск в одном файле через mmap (выполняется и в процессах пула)
+
+    Байтовое выражение с IGNORECASE сворачивает регистр только для ASCII,
+    поэтому шаблон-строка (-i с не-ASCII символами) ищется построчно по
+    декодированному тексту файла.
+
+    Вход:
+        path: str - абсолютный путь к файлу
+        shown: str - путь для вывода
+        pattern: bytes | str - регулярное выражение (str - поиск по декодированному тексту)
+        flags: int - флаги регулярного выражения
+        line_numbers: bool - выводить номера строк
+        count_only: bool - выводить только число совпавших строк
+        files_only: bool - выводить только имя файла
+        show_names: bool - выводить имя файла перед строкой
+
+    Выход:
+        _FileResult - строки вывода, число просмотренных байт и ошибка
+    """
+
+    prefix = f"{shown}:" if show_names else ""
+
+    try:
+        with open(path, "rb") as source:
+            size = os.fstat(source.fileno()).st_size
+            if size == 0:
+                return _FileResult([f"{prefix}0"] if count_only else [], 0, None)
+
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                binary = is_binary(data[:SNIFF_SIZE])
+                if isinstance(pattern, str):
+                    text = data[:].decode("utf-8", errors="replace")
+                    return _search_text(
+                        re.compile(pattern, flags), text, binary, shown, prefix, size,
+                        line_numbers, count_only, files_only,
+                    )
+
+                regex = re.compile(pattern, flags)
+                if binary:
+                    found = regex.search(data) is not None
+                    return _binary_result(found, shown, prefix, size, count_only, files_only)
+
+                lines = []
+                matched = 0
+                line_number = 1
+                counted_to = 0
+                position = 0
+                while position < size:
+                    match = regex.search(data, position)
+                    if match is None:
+                        break
+                    matched += 1
+                    if files_only:
+                        return _FileResult([shown], size, None)
+
+                    start = data.rfind(b"\n", 0, match.start()) + 1
+                    end = data.find(b"\n", match.start())
+                    if end < 0:
+                        end = size
+                    if not count_only:
+                        line = data[start:end].decode("utf-8", errors="replace")
+                        if line_numbers:
+                            line_number += _count_newlines(data, counted_to, start)
+                            counted_to = start
+                            line = f"{line_number}:{line}"
+                        lines.append(prefix + line)
+                    position = end + 1
+
+    except (PermissionError, IOError, OSError) as err:
+        return _FileResult([], 0, f"ERROR: {str(err)}")
+
+    if count_only:
+        return _FileResult([f"{prefix}{matched}"], size, None)
+    return _FileResult(lines, size, None)
+
+
+def _search_text(
+    regex: re.Pattern[str],
+    text: str,
+    binary: bool,
+    shown: str,
+    prefix: str,
+    size: int,
+    line_numbers: bool,
+    count_only: bool,
+    files_only: bool,
+) -> _FileResult:
+    """
+    Построчный поиск по декодированному тексту файла
+
+    Вход:
+        regex: re.Pattern[str] - скомпилированное выражение
+        text: str - содержимое файла
+        binary: bool - файл двоичный (выводится только факт совпадения)
+        shown: str - путь для вывода
+        prefix: str - префикс строк вывода ("путь:" или "")
+        size: int - размер файла в байтах
+        line_numbers, count_only, files_only: bool - режимы вывода, как в _search_file
+
+    Выход:
+        _FileResult - строки вывода, число просмотренных байт и ошибка
+    """
+
+    if binary:
+        return _binary_result(regex.search(text) is not None, shown, prefix, size, count_only, files_only)
+
+    lines = []
+    matched = 0
+    for line_number, line in enumerate(text.split("\n"), 1):
+        if regex.search(line) is None:
+            continue
+        matched += 1
+        if files_only:
+            return _FileResult([shown], size, None)
+        if not count_only:
+            lines.append(f"{prefix}{line_number}:{line}" if line_numbers else prefix + line)
+
+    if count_only:
+        return _FileResult([f"{prefix}{matched}"], size, None)
+    return _FileResult(lines, size, None)
+
+
+def _binary_result(
+    found: bool, shown: str, prefix: str, size: int, count_only: bool, files_only: bool
+) -> _FileResult:
+    """
+    Результат поиска в двоичном файле: строки не выводятся, только факт совпадения
+
+    Выход:
+        _FileResult - число совпадений (0/1), имя файла или "Binary file ... matches"
+    """
+
+    if not found or count_only:
+        return _FileResult([f"{prefix}{int(found)}"] if count_only else [], size, None)
+    if files_only:
+        return _FileResult([shown], size, None)
+    return _FileResult([f"Binary file {shown} matches"], size, None)
@@ -0,0 +1,359 @@
+import codecs
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+from src.core.path_utils import resolve_path
+from src.core import stats
+from src.core.inotify import IN_ATTRIB, IN_MODIFY, Inotify
+
+BLOCK_SIZE = 64 * 1024
+DEFAULT_LINES = 10
+POLL_INTERVAL = 0.5
+
+
+def _parse_head_tail_args(
+    args: list[str], command: str, allow_follow: bool
+) -> Union[tuple[int, bool, list[str]], str]:
+    """
+    Парсинг аргументов команд head и tail
+
+    Вход:
+        args: list[str] - список аргументов
+        command: str - имя команды для сообщений об ошибках
+        allow_follow: bool - допускается ли опция -f
+
+    Выход:
+        tuple[int, bool, list[str]] | str - (число строк, follow, файлы) или строка с ошибкой
+    """
+
+    lines = DEFAULT_LINES
+    follow = False
+    files = []
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if arg == "-n":
+            if index >= len(args) or not args[index].isdigit():
+                return "ERROR: Option -n requires a number"
+            lines = int(args[index])
+            index += 1
+        elif arg == "-f" and allow_follow:
+            follow = True
+        elif arg.startswith("-"):
+            return f"ERROR: Incorrect option {arg}"
+        else:
+            files.append(arg)
+
+    if not files:
+        return f"ERROR: '{command}' requires filename"
+
+    if follow and len(files) > 1:
+        return "ERROR: 'tail -f' follows a single file"
+
+    return lines, follow, files
+
+
+def head(args: list[str]) -> Optional[str]:
+    """
+    Команда head - вывод первых строк файла
+
+    Файл читается блоками с начала только до нужного числа строк.
+
+    Вход:
+        args: list[str] - список аргументов ["file"] | ["-n", "20", "file1", "file2"]
+
+    Выход:
+        None | str - None при успехе; строка с ошибками при fail
+    """
+
+    parsed_args = _parse_head_tail_args(args, "head", allow_follow=False)
+    if isinstance(parsed_args, str):
+        return parsed_args
+
+    lines, _, files = parsed_args
+    return _for_each_file(files, lambda path: _head_file(path, lines))
+
+
+def tail(args: list[str]) -> Optional[str]:
+    """
+    Команда tail - вывод последних строк файла, -f - слежение за дописыванием
+
+    Файл читается блоками с конца, поэтому стоимость зависит от объёма вывода,
+    а не от размера файла. tail -f использует inotify, а без него - опрос размера.
+
+    Вход:
+        args: list[str] - список аргументов ["file"] | ["-n", "20", "file"] | ["-f", "file"]
+
+    Выход:
+        None | str - None при успехе; строка с ошибками при fail
+    """
+
+    parsed_args = _parse_head_tail_args(args, "tail", allow_follow=True)
+    if isinstance(parsed_args, str):
+        return parsed_args
+
+    lines, follow, files = parsed_args
+    if not follow:
+        return _for_each_file(files, lambda path: _tail_file(path, lines))
+
+    file_path = resolve_path(files[0], must_be=True, must_file=True)
+    if file_path is None:
+        return f"ERROR: File '{files[0]}' does not exist or is not a file"
+
+    try:
+        position = _tail_file(file_path, lines, follow=True)
+        _follow(file_path, position, threading.Event())
+    except KeyboardInterrupt:
+        sys.stdout.write("\n")
+    except OSError as err:
+        return f"ERROR: {str(err)}"
+    return None
+
+
+def _for_each_file(files: list[str], action: Callable[[Path], int]) -> Optional[str]:
+    """
+    Выполняет вывод для каждого файла, с заголовками при нескольких файлах
+
+    Вход:
+        files: list[str] - пути к файлам
+        action: Callable[[Path], int] - функция вывода одного файла
+
+    Выход:
+        None | str - None при успехе; строка с ошибками при fail
+    """
+
+    errors = []
+    for number, name in enumerate(files):
+        file_path = resolve_path(name, must_be=True, must_file=True)
+        if file_path is None:
+            errors.append(f"ERROR: File '{name}' does not exist or is not a file")
+            continue
+
+        if len(files) > 1:
+            separator = "\n" if number > 0 else ""
+            sys.stdout.write(f"{separator}==> {name} <==\n")
+        try:
+            action(file_path)
+        except OSError as err:
+            errors.append(f"ERROR: {str(err)}")
+
+    sys.stdout.flush()
+    if errors:
+        return "\n".join(errors)
+    return None
+
+
+class _TextOutput:
+    """
+    Вывод байтов файла в stdout как текста
+
+    Декодер инкрементальный, поэтому символ UTF-8, разрезанный границей блока,
+    не искажается; невалидные последовательности заменяются. finish() дописывает
+    обрезанную в конце файла последовательность (как символ замены) и, как cat,
+    завершает вывод переводом строки.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._last_char = "\n"
+
+    def write(self, data: bytes) -> None:
+        """
+        Выводит очередной блок байтов
+        """
+
+        self._emit(self._decoder.decode(data))
+
+    def pending(self) -> int:
+        """
+        Выход:
+            int - число байт незавершённого символа, ещё не выведенных декодером
+        """
+
+        return len(self._decoder.getstate()[0])
+
+    def finish(self) -> None:
+        """
+        Завершает вывод файла: остаток декодера и перевод строки, если его нет
+        """
+
+        self._emit(self._decoder.decode(b"", final=True))
+        if self._last_char != "\n":
+            sys.stdout.write("\n")
+            self._last_char = "\n"
+
+    def _emit(self, text: str) -> None:
+        if text:
+            sys.stdout.write(text)
+            self._last_char = text[-1]
+
+
+def _head_file(file_path: Path, lines: int) -> int:
+    """
+    Выводит первые lines строк, читая файл блоками с начала
+
+    Вход:
+        file_path: Path - путь к файлу
+        lines: int - число строк
+
+    Выход:
+        int - число прочитанных байт
+    """
+
+    remaining = lines
+    total = 0
+    output = _TextOutput()
+    with open(file_path, "rb") as source:
+        while remaining > 0:
+            block = source.read(BLOCK_SIZE)
+            if not block:
+                break
+            total += len(block)
+
+            end = 0
+            while remaining > 0:
+                found = block.find(b"\n", end)
+                if found < 0:
+                    end = len(block)
+                    break
+                end = found + 1
+                remaining -= 1
+            output.write(block[:end])
+    output.finish()
+
+    stats.count(bytes_read=total, entries=1)
+    return total
+
+
+def _tail_start(fd: int, size: int, lines: int) -> int:
+    """
+    Смещение начала последних lines строк: блоки читаются с конца файла
+
+    Вход:
+        fd: int - дескриптор открытого файла
+        size: int - размер файла
+        lines: int - число строк
+
+    Выход:
+        int - смещение, с которого начинается вывод
+    """
+
+    if lines == 0:
+        return size
+
+    position = size
+    newlines = 0
+    skip_trailing = True
+
+    while position > 0:
+        read_size = min(BLOCK_SIZE, position)
+        position -= read_size
+        block = os.pread(fd, read_size, position)
+        stats.count(bytes_read=len(block))
+
+        end = len(block)
+        if skip_trailing:
+            skip_trailing = False
+            if block.endswith(b"\n"):
+                end -= 1
+
+        while True:
+            found = block.rfind(b"\n", 0, end)
+            if found < 0:
+                break
+            newlines += 1
+            if newlines == lines:
+                return position + found + 1
+            end = found
+
+    return 0
+
+
+def _tail_file(file_path: Path, lines: int, follow: bool = False) -> int:
+    """
+    Выводит последние lines строк файла
+
+    Вход:
+        file_path: Path - путь к файлу
+        lines: int - число строк
+        follow: bool - вывод продолжит tail -f: перевод строки не дописывается,
+                       а незавершённый символ в конце выводится при слежении
+
+    Выход:
+        int - позиция конца выведенных данных (для tail -f)
+    """
+
+    output = _TextOutput()
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        position = start = _tail_start(fd, size, lines)
+        while position < size:
+            block = os.pread(fd, min(BLOCK_SIZE, size - position), position)
+            if not block:
+                break
+            output.write(block)
+            position += len(block)
+    finally:
+        os.close(fd)
+
+    stats.count(bytes_read=position - start, entries=1)
+    if follow:
+        position -= output.pending()
+    else:
+        output.finish()
+    sys.stdout.flush()
+    return position
+
+
+def _follow(file_path: Path, position: int, stop: threading.Event) -> None:
+    """
+    Следит за дописыванием в файл и выводит новые данные (tail -f)
+
+    При доступном inotify поток ждёт событий IN_MODIFY, иначе раз в
+    POLL_INTERVAL секунд проверяет размер. Усечение файла начинает вывод сначала.
+
+    Вход:
+        file_path: Path - путь к файлу
+        position: int - позиция, с которой выводить новые данные
+        stop: threading.Event - событие остановки слежения
+    """
+
+    watcher: Optional[Inotify] = None
+    try:
+        watcher = Inotify()
+        watcher.add_watch(file_path, IN_MODIFY | IN_ATTRIB)
+    except OSError:
+        if watcher is not None:
+            watcher.close()
+        watcher = None
+
+    output = _TextOutput()
+    try:
+        with open(file_path, "rb") as source:
+            while not stop.is_set():
+                size = os.fstat(source.fileno()).st_size
+                if size < position:
+                    position = 0
+                if size > position:
+                    source.seek(position)
+                    while True:
+                        block = source.read(BLOCK_SIZE)
+                        if not block:
+                            break
+                        output.write(block)
+                        position += len(block)
+                    sys.stdout.flush()
+                    continue
+
+                if watcher is not None:
+                    watcher.read_events(timeout=POLL_INTERVAL)
+                else:
+                    stop.wait(POLL_INTERVAL)
+    finally:
+        if watcher is not None:
+            watcher.close()
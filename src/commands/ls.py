@@ -1,10 +1,59 @@
-import datetime
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import NamedTuple, Optional, Union
 from src.core.path_utils import resolve_path
+from src.core import stats
+from src.core.dirtable import DirTable
+from src.core.listing_cache import get_listing_cache
 
 
-def _parse_ls_args(args: list[str]) -> Union[tuple[bool, Optional[str]], str]:
+STREAM_BATCH = 1024
+RECURSIVE_WORKERS = 8
+READ_AHEAD_PER_WORKER = 4
+
+
+class LsOptions(NamedTuple):
+    """
+    Разобранные аргументы команды ls
+
+    Поля:
+        detailed: bool - подробный формат (-l)
+        path: str | None - путь к каталогу
+        unsorted: bool - потоковый вывод без сортировки (-f, --unsorted)
+        limit: int | None - размер страницы (--limit N)
+        page: int - номер страницы, начиная с 1 (--page N)
+        recursive: bool - рекурсивный обход подкаталогов (-R)
+        depth: int | None - максимальная глубина обхода для -R (--depth N)
+        jobs: int - число потоков чтения каталогов для -R (--jobs N)
+        sort_by: str - порядок: "name", "size" (-S) или "mtime" (-t)
+        top: int | None - вывести только N первых элементов по -S/-t (--top N)
+        cached: bool - использовать кэш листингов (--cache)
+    """
+
+    detailed: bool = False
+    path: Optional[str] = None
+    unsorted: bool = False
+    limit: Optional[int] = None
+    page: int = 1
+    recursive: bool = False
+    depth: Optional[int] = None
+    jobs: int = RECURSIVE_WORKERS
+    sort_by: str = "name"
+    top: Optional[int] = None
+    cached: bool = False
+
+
+_SHORT_FLAGS = {"l": "detailed", "f": "unsorted", "R": "recursive", "S": "sort_size", "t": "sort_mtime"}
+_LONG_FLAGS = {"--unsorted": "unsorted", "--recursive": "recursive", "--cache": "cached"}
+_VALUE_OPTIONS = {
+    "--limit": "limit", "--page": "page", "--depth": "depth", "--jobs": "jobs", "--top": "top"
+}
+
+
+def _parse_ls_args(args: list[str]) -> Union[LsOptions, str]:
     """
     Парсинг аргументов команды ls
 
@@ -12,63 +61,377 @@ def _parse_ls_args(args: list[str]) -> Union[tuple[bool, Optional[str]], str]:
         args: list[str] - список аргументов
 
     Выход:
-        tuple[bool, str | None] | str - (detailed, path) или строка с ошибкой
+        LsOptions | str - разобранные опции или строка с ошибкой
     """
 
-    detailed = False
-    path = None
+    values: dict[str, object] = {}
+    index = 0
 
-    for arg in args:
-        if arg.startswith("-"):
-            if arg == "-l":
-                detailed = True
-            else:
-                return f"ERROR: Incorrect option {arg}"
+    while index < len(args):
+        arg = args[index]
+        index += 1
+
+        if arg in _VALUE_OPTIONS:
+            minimum = 0 if arg == "--depth" else 1
+            if index >= len(args) or not args[index].isdigit() or int(args[index]) < minimum:
+                return f"ERROR: Option {arg} requires a positive number"
+            values[_VALUE_OPTIONS[arg]] = int(args[index])
+            index += 1
+        elif arg in _LONG_FLAGS:
+            values[_LONG_FLAGS[arg]] = True
+        elif arg.startswith("-") and len(arg) > 1 and not arg.startswith("--"):
+            for flag in arg[1:]:
+                if flag not in _SHORT_FLAGS:
+                    return f"ERROR: Incorrect option {arg}"
+                values[_SHORT_FLAGS[flag]] = True
+        elif arg.startswith("-"):
+            return f"ERROR: Incorrect option {arg}"
         else:
-            path = arg
+            values["path"] = arg
+
+    if "page" in values and "limit" not in values:
+        return "ERROR: Option --page requires --limit"
+
+    if values.get("recursive") and "limit" in values:
+        return "ERROR: Option --limit is not supported with -R"
+
+    if "depth" in values and not values.get("recursive"):
+        return "ERROR: Option --depth requires -R"
+
+    if values.pop("sort_mtime", False):
+        values["sort_by"] = "mtime"
+    elif values.pop("sort_size", False) or "top" in values:
+        values["sort_by"] = "size"
+    values.pop("sort_size", None)
 
-    return detailed, path
+    if values.get("sort_by") and (values.get("unsorted") or values.get("recursive")):
+        return "ERROR: Options -S/-t/--top cannot be combined with -f or -R"
 
+    if values.get("cached") and any(values.get(key) for key in ("unsorted", "recursive", "sort_by")):
+        return "ERROR: Option --cache works only with plain or -l listing"
 
-def ls(args: list[str]) -> str:
+    return LsOptions(**values)  # type: ignore[arg-type]
+
+
+def ls(args: list[str]) -> Optional[str]:
     """
     Главная функция команды ls
 
     Вход:
-        args: list[str] - список аргументов ["-l", "/path"] | [".."] | []
+        args: list[str] - список аргументов ["-l", "/path"] | [".."] | ["-f", "--limit", "100"] | []
 
     Выход:
-        str - отформатированная строка для вывода
+        str | None - отформатированная строка для вывода; None, если вывод уже
+        записан в stdout потоково (-f)
     """
 
-    parsed_args = _parse_ls_args(args)
-    if isinstance(parsed_args, str):
-        return parsed_args
-
-    detailed, path = parsed_args
+    options = _parse_ls_args(args)
+    if isinstance(options, str):
+        return options
 
+    path = options.path
     goal_path = resolve_path(path if path is not None else ".", must_be=True, must_dir=True)
     if goal_path is None:
         return "ERROR: Path does not exist or is not a directory"
 
+    if options.recursive:
+        return _recursive_list(goal_path, options)
+
+    if options.unsorted:
+        return _stream_list(goal_path, options)
+
+    if options.sort_by != "name":
+        return _table_list(goal_path, options)
+
+    if options.cached:
+        return _cached_list(goal_path, options)
+
     try:
-        items = list(goal_path.iterdir())
+        with os.scandir(goal_path) as entries:
+            items = list(entries)
         items.sort(key=lambda x: x.name.lower())
+        stats.count(entries=len(items))
     except (PermissionError, OSError) as err:
         return f"ERROR: {str(err)}"
 
-    if detailed:
+    if options.limit is not None:
+        start = (options.page - 1) * options.limit
+        items = items[start:start + options.limit]
+
+    if options.detailed:
         return _format_detailed_list(items)
     else:
         return _format_simple_list(items)
 
 
-def _format_simple_list(items: list[Path]) -> str:
+def _cached_list(goal_path: Path, options: LsOptions) -> str:
+    """
+    Вывод из кэша листингов: повторные вызовы для того же каталога не читают
+    его заново, а stat выполняется только для изменившихся элементов
+
+    Вход:
+        goal_path: Path - каталог
+        options: LsOptions - опции (detailed, limit, page)
+
+    Выход:
+        str - отформатированная строка для вывода | строка с ошибкой
+    """
+
+    try:
+        entries = get_listing_cache().listing(str(goal_path), need_stat=options.detailed)
+    except (PermissionError, OSError) as err:
+        return f"ERROR: {str(err)}"
+    stats.count(entries=len(entries))
+
+    if options.limit is not None:
+        start = (options.page - 1) * options.limit
+        entries = entries[start:start + options.limit]
+
+    if not options.detailed:
+        return "\n".join(entry.name for entry in entries)
+
+    date_cache: dict[int, str] = {}
+    return "\n".join(
+        _format_detailed_line(entry.name, entry.is_dir, entry.size, entry.mtime, date_cache)
+        for entry in entries
+    )
+
+
+def _table_list(goal_path: Path, options: LsOptions) -> str:
+    """
+    Вывод, отсортированный по размеру (-S) или времени изменения (-t)
+
+    Каталог читается в колоночную таблицу DirTable, сортируются индексы по
+    числовому столбцу; при --top выбираются только N первых (куча / argpartition).
+
+    Вход:
+        goal_path: Path - каталог
+        options: LsOptions - опции (detailed, sort_by, top, limit, page)
+
+    Выход:
+        str - отформатированная строка для вывода | строка с ошибкой
+    """
+
+    try:
+        table = DirTable.from_directory(goal_path)
+    except (PermissionError, OSError) as err:
+        return f"ERROR: {str(err)}"
+    stats.count(entries=len(table))
+
+    wanted = options.top
+    if options.limit is not None:
+        page_end = options.page * options.limit
+        wanted = page_end if wanted is None else min(wanted, page_end)
+
+    order = table.order_by(options.sort_by, wanted)
+    if options.limit is not None:
+        start = (options.page - 1) * options.limit
+        order = order[start:start + options.limit]
+
+    if not options.detailed:
+        return "\n".join(table.name(index) for index in order)
+
+    date_cache: dict[int, str] = {}
+    return "\n".join(
+        _format_detailed_line(table.name(index), table.is_dir(index), table.sizes[index],
+                              table.mtimes[index], date_cache)
+        for index in order
+    )
+
+
+def _stream_list(goal_path: Path, options: LsOptions) -> Optional[str]:
+    """
+    Потоковый вывод каталога без сортировки: строки пишутся в stdout по мере
+    чтения записей, память не зависит от размера каталога
+
+    Вход:
+        goal_path: Path - каталог
+        options: LsOptions - опции (detailed, limit, page)
+
+    Выход:
+        None | str - None при успехе; строка с ошибкой при fail
+    """
+
+    skip = (options.page - 1) * options.limit if options.limit is not None else 0
+    remaining = options.limit
+    date_cache: dict[int, str] = {}
+    batch: list[str] = []
+    listed = 0
+
+    try:
+        with os.scandir(goal_path) as entries:
+            for entry in entries:
+                if skip:
+                    skip -= 1
+                    continue
+                if remaining is not None:
+                    if remaining == 0:
+                        break
+                    remaining -= 1
+                listed += 1
+
+                if options.detailed:
+                    stat_info = _entry_stat(entry)
+                    batch.append(_format_detailed_line(entry.name, _entry_is_dir(entry),
+                                                       stat_info.st_size, stat_info.st_mtime,
+                                                       date_cache))
+                else:
+                    batch.append(entry.name)
+
+                if len(batch) >= STREAM_BATCH:
+                    _flush_lines(batch)
+    except (PermissionError, OSError) as err:
+        _flush_lines(batch)
+        return f"ERROR: {str(err)}"
+    finally:
+        stats.count(entries=listed)
+
+    _flush_lines(batch)
+    return None
+
+
+class _DirListing(NamedTuple):
+    """
+    Результат чтения одного каталога при рекурсивном обходе
+
+    Поля:
+        lines: list[str] - отформатированные строки содержимого
+        children: list[Path] - подкаталоги для обхода (в порядке вывода)
+        error: str | None - ошибка чтения каталога
+    """
+
+    lines: list[str]
+    children: list[Path]
+    error: Optional[str]
+
+
+def _recursive_list(goal_path: Path, options: LsOptions) -> Optional[str]:
+    """
+    Рекурсивный вывод (-R): каталоги читаются пулом потоков параллельно,
+    а вывод идёт в детерминированном порядке обхода в глубину
+
+    Чтение каталога на сетевых и дисковых хранилищах упирается в задержку,
+    поэтому основной поток заранее ставит в пул чтение следующих по порядку
+    обхода каталогов, не дожидаясь вывода. Опережение ограничено окном из
+    jobs * READ_AHEAD_PER_WORKER задач: прочитанные, но ещё не выведенные
+    каталоги не накапливаются в памяти на огромных деревьях.
+
+    Вход:
+        goal_path: Path - корневой каталог
+        options: LsOptions - опции (detailed, unsorted, depth, jobs)
+
+    Выход:
+        None | str - None при успехе; строки с ошибками чтения подкаталогов при fail
+    """
+
+    errors = []
+    listed = 0
+    window = options.jobs * READ_AHEAD_PER_WORKER
+
+    with ThreadPoolExecutor(max_workers=options.jobs) as executor:
+        stack: list[tuple[Path, int, Optional[Future[_DirListing]]]] = [(goal_path, 0, None)]
+        in_flight = 0
+        first = True
+        try:
+            while stack:
+                for index in range(len(stack) - 1, -1, -1):
+                    if in_flight >= window:
+                        break
+                    directory, depth, future = stack[index]
+                    if future is None:
+                        future = executor.submit(_scan_directory, directory, depth, options)
+                        stack[index] = (directory, depth, future)
+                        in_flight += 1
+
+                directory, depth, future = stack.pop()
+                if future is None:
+                    future = executor.submit(_scan_directory, directory, depth, options)
+                else:
+                    in_flight -= 1
+                listing = future.result()
+                if listing.error is not None:
+                    errors.append(listing.error)
+                    continue
+
+                section = [] if first else [""]
+                section.append(f"{directory}:")
+                section.extend(listing.lines)
+                _flush_lines(section)
+                listed += len(listing.lines)
+                first = False
+
+                stack.extend((child, depth + 1, None) for child in reversed(listing.children))
+        finally:
+            for _, _, pending in stack:
+                if pending is not None:
+                    pending.cancel()
+            stats.count(entries=listed)
+
+    if errors:
+        return "\n".join(errors)
+    return None
+
+
+def _scan_directory(directory: Path, depth: int, options: LsOptions) -> _DirListing:
+    """
+    Чтение одного каталога для ls -R (выполняется в пуле потоков)
+
+    Вход:
+        directory: Path - каталог
+        depth: int - глубина каталога относительно корня обхода
+        options: LsOptions - опции (detailed, unsorted, depth)
+
+    Выход:
+        _DirListing - строки вывода, подкаталоги для обхода и ошибка
+    """
+
+    try:
+        with os.scandir(directory) as entries:
+            items = list(entries)
+    except OSError as err:
+        return _DirListing([], [], f"ERROR: {str(err)}")
+
+    if not options.unsorted:
+        items.sort(key=lambda x: x.name.lower())
+
+    if options.detailed:
+        lines = _detailed_lines(items)
+    else:
+        lines = [item.name for item in items]
+
+    children = []
+    if options.depth is None or depth < options.depth:
+        for item in items:
+            try:
+                is_subdir = item.is_dir(follow_symlinks=False)
+            except OSError:
+                is_subdir = False
+            if is_subdir:
+                children.append(Path(item.path))
+
+    return _DirListing(lines, children, None)
+
+
+def _flush_lines(batch: list[str]) -> None:
+    """
+    Записывает накопленные строки в stdout и очищает буфер
+
+    Вход:
+        batch: list[str] - строки для вывода
+    """
+
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
+        sys.stdout.flush()
+        batch.clear()
+
+
+def _format_simple_list(items: list[os.DirEntry[str]]) -> str:
     """
     Простой формат вывода: каждое имя с новой строки
 
     Вход:
-        items: list[Path] - список элементов для вывода
+        items: list[os.DirEntry] - список элементов для вывода
 
     Выход:
         str - отформатированная строка с именами
@@ -78,29 +441,101 @@ def _format_simple_list(items: list[Path]) -> str:
     return "\n".join(names)
 
 
-def _format_detailed_list(items: list[Path]) -> str:
+def _format_detailed_list(items: list[os.DirEntry[str]]) -> str:
     """
     Подробный формат: тип, размер, дата, имя
 
+    Тип элемента берётся из DirEntry (d_type, без системного вызова), stat
+    выполняется не более одного раза на элемент: DirEntry кэширует результат.
+
     Вход:
-        items: list[Path] - список элементов для вывода
+        items: list[os.DirEntry] - список элементов для вывода
 
     Выход:
         str - отформатированная строка с детальной информацией
     """
 
+    return "\n".join(_detailed_lines(items))
+
+
+def _detailed_lines(items: list[os.DirEntry[str]]) -> list[str]:
+    """
+    Строки подробного формата для списка элементов
+
+    Вход:
+        items: list[os.DirEntry] - элементы каталога
+
+    Выход:
+        list[str] - строки подробного формата
+    """
+
     lines = []
+    date_cache: dict[int, str] = {}
     for item in items:
-        stat_info = item.stat()
-        file_type = "d" if item.is_dir() else "-"
-        size = stat_info.st_size
-        mtime = datetime.datetime.fromtimestamp(stat_info.st_mtime)
-        date_str = mtime.strftime("%Y-%m-%d %H:%M")
-        name = item.name
+        is_dir = _entry_is_dir(item)
+        stat_info = _entry_stat(item)
+        lines.append(_format_detailed_line(item.name, is_dir, stat_info.st_size,
+                                           stat_info.st_mtime, date_cache))
+    return lines
+
+
+def _format_detailed_line(
+    name: str, is_dir: bool, size: int, mtime: float, date_cache: dict[int, str]
+) -> str:
+    """
+    Одна строка подробного формата
+
+    Вход:
+        name: str - имя элемента
+        is_dir: bool - является ли элемент директорией
+        size: int - размер в байтах
+        mtime: float - время изменения
+        date_cache: dict[int, str] - кэш отформатированных дат по минутам
+
+    Выход:
+        str - строка вида "d     4096 2024-01-01 12:00 name/"
+    """
 
-        if item.is_dir():
-            name = name + "/"
+    minute = int(mtime // 60)
+    date_str = date_cache.get(minute)
+    if date_str is None:
+        date_str = time.strftime("%Y-%m-%d %H:%M", time.localtime(minute * 60))
+        date_cache[minute] = date_str
 
-        lines.append(f"{file_type} {size:8} {date_str} {name}")
+    if is_dir:
+        return f"d {size:8} {date_str} {name}/"
+    return f"- {size:8} {date_str} {name}"
 
-    return "\n".join(lines)
+
+def _entry_is_dir(entry: os.DirEntry[str]) -> bool:
+    """
+    Является ли элемент директорией (битая ссылка считается файлом)
+
+    Вход:
+        entry: os.DirEntry - элемент каталога
+
+    Выход:
+        bool - True для директории
+    """
+
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _entry_stat(entry: os.DirEntry[str]) -> os.stat_result:
+    """
+    stat элемента с переходом по ссылке; для битой ссылки - stat самой ссылки
+
+    Вход:
+        entry: os.DirEntry - элемент каталога
+
+    Выход:
+        os.stat_result - результат stat
+    """
+
+    try:
+        return entry.stat()
+    except OSError:
+        return entry.stat(follow_symlinks=False)
@@ -1,14 +1,84 @@
+import errno
+import os
+import shutil
+import stat
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional, Union
 from src.core.path_utils import resolve_path, is_safe_path
+from src.core import stats
+from src.core.copy_engine import CopyResult
+from src.core.progress import Progress
+from src.core.tree_copy import COPY_WORKERS, TreeCopier
+
+
+class MvOptions(NamedTuple):
+    """
+    Разобранные аргументы команды mv
+
+    Поля:
+        sources: list[str] - источники
+        destination: str - назначение
+        jobs: int - число потоков копирования при переносе на другую файловую систему (-j N)
+        progress: bool - показывать прогресс переноса на другую файловую систему в stderr (--progress)
+    """
+
+    sources: list[str]
+    destination: str
+    jobs: int = COPY_WORKERS
+    progress: bool = False
+
+
+_VALUE_OPTIONS = {"-j": "jobs", "--jobs": "jobs"}
+_LONG_FLAGS = {"--progress": "progress"}
+
+
+def _parse_mv_args(args: list[str]) -> Union[MvOptions, str]:
+    """
+    Парсинг аргументов команды mv
+
+    Вход:
+        args: list[str] - список аргументов
+
+    Выход:
+        MvOptions | str - разобранные опции или строка с ошибкой
+    """
+
+    positional = []
+    values: dict[str, object] = {}
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+
+        if arg in _VALUE_OPTIONS:
+            if index >= len(args) or not args[index].isdigit() or int(args[index]) < 1:
+                return f"ERROR: Option {arg} requires a positive number"
+            values[_VALUE_OPTIONS[arg]] = int(args[index])
+            index += 1
+        elif arg in _LONG_FLAGS:
+            values[_LONG_FLAGS[arg]] = True
+        else:
+            positional.append(arg)
+
+    if len(positional) < 2:
+        return "ERROR: 'mv' requires source and destination"
+
+    return MvOptions(positional[:-1], positional[-1], **values)  # type: ignore[arg-type]
 
 
 def mv(args: list[str]) -> Optional[str]:
     """
     Команда mv - перемещение или переименование файлов/каталогов
 
+    В пределах одной файловой системы элемент переименовывается. Если источник
+    и назначение на разных файловых системах (разные st_dev или EXDEV от
+    rename), данные копируются движком cp (деревья - параллельно), а источник
+    удаляется только после успешного копирования всего элемента.
+
     Вход:
         args: list[str] - список аргументов ["source", "dest"] | ["file1", "file2", "dest_dir"]
+                          | ["--progress", "-j", "16", "/scratch/run42", "/archive"]
 
     Выход:
         None | str - None при успехе, строка с ошибкой при fail
@@ -17,32 +87,45 @@ def mv(args: list[str]) -> Optional[str]:
     if len(args) < 2:
         return "ERROR: 'mv' requires source and destination"
 
-    sources = args[:-1]
-    destination = args[-1]
+    options = _parse_mv_args(args)
+    if isinstance(options, str):
+        return options
 
-    if len(sources) > 1:
-        destination_path = resolve_path(destination, must_be=True, must_dir=True)
+    if len(options.sources) > 1:
+        destination_path = resolve_path(options.destination, must_be=True, must_dir=True)
         if destination_path is None:
             return "ERROR: Multiple sources require existing directory destination"
 
+    progress = Progress() if options.progress else None
     errors = []
-    for source in sources:
-        result = _move_item(source, destination)
-        if result is not None:
-            errors.append(result)
+    try:
+        for source in options.sources:
+            result = _move_item(source, options.destination, options, progress)
+            if result is not None:
+                errors.append(result)
+    finally:
+        if progress is not None:
+            progress.finish()
 
     if errors:
         return "\n".join(errors)
     return None
 
 
-def _move_item(source: str, destination: str) -> Optional[str]:
+def _move_item(
+    source: str,
+    destination: str,
+    options: MvOptions,
+    progress: Optional[Progress] = None,
+) -> Optional[str]:
     """
     Перемещает один элемент (файл или директорию)
 
     Вход:
         source: str - путь к источнику
         destination: str - путь к назначению
+        options: MvOptions - опции (jobs для переноса между файловыми системами)
+        progress: Progress | None - общий индикатор прогресса копирования
 
     Выход:
         None | str - None при успехе, строка с ошибкой при fail
@@ -77,43 +160,196 @@ def _move_item(source: str, destination: str) -> Optional[str]:
     if parent_dir is None:
         return f"ERROR: Destination directory '{destination_path.parent}' does not exist"
 
+    if destination_path.exists() and not (
+        (source_path.is_file() and destination_path.is_file())
+        or (source_path.is_dir() and destination_path.is_dir())
+    ):
+        return f"ERROR: Cannot overwrite {destination_path.name} with different type"
+
     try:
-        if destination_path.exists():
-            if source_path.is_file() and destination_path.is_file():
-                destination_path.unlink()
-                source_path.rename(destination_path)
-            elif source_path.is_dir() and destination_path.is_dir():
-                _recurs_merge_directories(source_path, destination_path)
-            else:
-                return f"ERROR: Cannot overwrite {destination_path.name} with different type"
+        if os.lstat(source_path).st_dev == os.stat(parent_dir).st_dev:
+            return _rename_item(source_path, destination_path)
+    except (OSError, IOError, PermissionError) as e:
+        if e.errno != errno.EXDEV:
+            return f"ERROR: {str(e)}"
+
+    return _move_across_devices(source_path, destination_path, options, progress)
+
+
+def _rename_item(source_path: Path, destination_path: Path) -> Optional[str]:
+    """
+    Перемещение в пределах одной файловой системы: rename или слияние каталогов
+
+    Выход:
+        None | str - None при успехе, строка с ошибками слияния
+
+    Исключения:
+        OSError - ошибка переименования (EXDEV - источник на другой файловой системе)
+    """
+
+    if destination_path.exists() and source_path.is_dir():
+        merge_errors = _merge_directories(source_path, destination_path)
+        if merge_errors:
+            return "\n".join(merge_errors)
+    else:
+        os.replace(source_path, destination_path)
+
+    stats.count(entries=1)
+    return None
+
+
+def _move_across_devices(
+    source_path: Path, destination_path: Path, options: MvOptions, progress: Optional[Progress]
+) -> Optional[str]:
+    """
+    Перенос на другую файловую систему: копирование, затем удаление источника
+
+    Файл копируется движком копирования, каталог - TreeCopier (скелет, затем
+    файлы пулом потоков); символические ссылки воссоздаются. При слиянии с
+    существующим каталогом заменяются все файлы: совпадение размера и времени
+    изменения не гарантирует совпадения содержимого, а источник будет удалён. Файл и ссылка создаются под
+    временным именем рядом с назначением и заменяют его через os.replace только
+    после успешного копирования, поэтому при ошибке существующее назначение не
+    теряется. Источник удаляется, только если скопировано всё.
+
+    Вход:
+        source_path: Path - источник
+        destination_path: Path - назначение (тип совпадает с источником, если существует)
+        options: MvOptions - опции (jobs)
+        progress: Progress | None - общий индикатор прогресса копирования
+
+    Выход:
+        None | str - None при успехе, строка с ошибками при fail
+    """
+
+    source, destination = str(source_path), str(destination_path)
+    partial = str(destination_path.with_name(f".{destination_path.name}.{os.getpid()}.mv-part"))
+
+    try:
+        if source_path.is_symlink():
+            os.symlink(os.readlink(source), partial)
+            os.replace(partial, destination)
+            os.unlink(source)
+            stats.count(entries=1)
+            return None
+    except OSError as err:
+        return f"ERROR: {str(err)}"
+
+    def on_copied(source: str, destination: str, result: CopyResult) -> None:
+        stats.count(bytes_read=result.size, bytes_written=result.size, entries=1)
+
+    is_dir = source_path.is_dir()
+    copier = TreeCopier(
+        options.jobs,
+        on_copied,
+        symlinks=True,
+        merge=is_dir and destination_path.exists(),
+        progress=progress,
+    )
+    try:
+        if is_dir:
+            copier.copy_tree(source, destination)
         else:
-            source_path.rename(destination_path)
+            copier.copy_file(source, partial)
+    except OSError as err:
+        copier.errors.append(f"ERROR: {str(err)}")
+    errors = copier.close()
 
-    except (OSError, IOError, PermissionError) as e:
-        return f"ERROR: {str(e)}"
+    if not is_dir and not errors:
+        try:
+            os.replace(partial, destination)
+        except OSError as err:
+            errors.append(f"ERROR: {str(err)}")
 
+    if errors:
+        if not is_dir:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+        errors.append(f"ERROR: '{source}' was not removed: copy to '{destination}' is incomplete")
+        return "\n".join(errors)
+
+    try:
+        if is_dir:
+            shutil.rmtree(source)
+        else:
+            os.unlink(source)
+    except OSError as err:
+        return f"ERROR: {str(err)}"
     return None
 
 
-def _recurs_merge_directories(source_dir: Path, dest_dir: Path) -> None:
+def _merge_directories(source_dir: Path, dest_dir: Path) -> list[str]:
     """
-    Рекурсивно объединяет две директории
+    Итеративно объединяет две директории
+
+    Подкаталог, которого нет в назначении, переносится целиком одним rename;
+    файлы перемещаются через os.replace (атомарная перезапись без отдельного
+    unlink). Обходятся только каталоги, существующие с обеих сторон, - очередь
+    работ ограничена их числом, а не числом файлов, и не зависит от глубины.
+    Ошибки отдельных элементов собираются, объединение продолжается.
 
     Вход:
         source_dir: Path - исходная директория
         dest_dir: Path - целевая директория
+
+    Выход:
+        list[str] - ошибки (строки "ERROR: ..."); пустой список при успехе
     """
 
-    for item in source_dir.iterdir():
-        destination_item = dest_dir / item.name
+    errors: list[str] = []
+    moved = 0
+    stack: list[tuple[str, Optional[str]]] = [(str(source_dir), str(dest_dir))]
+
+    while stack:
+        source, destination = stack.pop()
+        if destination is None:
+            try:
+                os.rmdir(source)
+            except OSError as err:
+                if err.errno != errno.ENOTEMPTY or not errors:
+                    errors.append(f"ERROR: {str(err)}")
+            continue
 
-        if item.is_file():
-            if destination_item.exists():
-                destination_item.unlink()
-            item.rename(destination_item)
-        elif item.is_dir():
-            if not destination_item.exists():
-                destination_item.mkdir()
-            _recurs_merge_directories(item, destination_item)
+        stack.append((source, None))
+        try:
+            with os.scandir(source) as entries:
+                for entry in entries:
+                    target = os.path.join(destination, entry.name)
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            mode = _lstat_mode(target)
+                            if mode is not None and stat.S_ISDIR(mode):
+                                stack.append((entry.path, target))
+                                continue
+                            if mode is not None:
+                                errors.append(f"ERROR: Cannot overwrite {target} with different type")
+                                continue
+                            os.rename(entry.path, target)
+                        else:
+                            os.replace(entry.path, target)
+                        moved += 1
+                    except IsADirectoryError:
+                        errors.append(f"ERROR: Cannot overwrite {target} with different type")
+                    except OSError as err:
+                        errors.append(f"ERROR: {str(err)}")
+        except OSError as err:
+            errors.append(f"ERROR: {str(err)}")
+
+    stats.count(entries=moved)
+    return errors
+
+
+def _lstat_mode(path: str) -> Optional[int]:
+    """
+    Тип и права элемента без перехода по ссылке
 
-    source_dir.rmdir()
+    Выход:
+        int | None - st_mode или None, если элемента нет
+    """
+
+    try:
+        return os.lstat(path).st_mode
+    except FileNotFoundError:
+        return None
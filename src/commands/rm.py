@@ -1,5 +1,8 @@
-import shutil
+import os
 from src.core.path_utils import resolve_path, is_safe_path
+from src.core import session, stats
+from src.core.tree_remove import REMOVE_WORKERS, remove_tree
+from src.core.trash import TRASH_NAME, move_to_trash
 
 
 def rm(args: list[str]) -> None | str:
@@ -8,6 +11,8 @@ def rm(args: list[str]) -> None | str:
 
     Вход:
         args: list[str] - список аргументов ["file"] | ["-r", "dir"] | ["-r", "file1", "file2"]
+                          | ["-r", "-j", "16", "build"] | ["-r", "--trash", "build"]
+                          | ["-r", "-f", "build"] (-f/--force - без подтверждения)
 
     Выход:
         None | str - None при успехе, строка с ошибкой при fail
@@ -17,12 +22,29 @@ def rm(args: list[str]) -> None | str:
         return "ERROR: 'rm' requires at least one argument"
 
     recursive = False
+    force = False
+    to_trash = False
+    jobs = REMOVE_WORKERS
     purposes = []
+    index = 0
 
-    for arg in args:
+    while index < len(args):
+        arg = args[index]
+        index += 1
         if arg.startswith("-"):
             if "-r" == arg:
                 recursive = True
+            elif arg in ("-f", "--force"):
+                force = True
+            elif arg in ("-rf", "-fr"):
+                recursive = force = True
+            elif arg == "--trash":
+                to_trash = True
+            elif arg in ("-j", "--jobs"):
+                if index >= len(args) or not args[index].isdigit() or int(args[index]) < 1:
+                    return f"ERROR: Option {arg} requires a positive number"
+                jobs = int(args[index])
+                index += 1
             else:
                 return f"ERROR: Incorrect option {arg}"
         else:
@@ -33,7 +55,10 @@ def rm(args: list[str]) -> None | str:
 
     errors = []
     for target in purposes:
-        result = _remove_item(target, recursive)
+        if to_trash:
+            result = _trash_item(target, recursive)
+        else:
+            result = _remove_item(target, recursive, jobs, force)
         if result is not None:
             errors.append(result)
 
@@ -42,13 +67,20 @@ def rm(args: list[str]) -> None | str:
     return None
 
 
-def _remove_item(target: str, recursive: bool) -> None | str:
+def _remove_item(target: str, recursive: bool, jobs: int = REMOVE_WORKERS, force: bool = False) -> None | str:
     """
     Удаляет один элемент (файл или директорию)
 
+    Директория удаляется параллельно (remove_tree): поддеревья распределяются
+    по пулу потоков, unlink/rmdir выполняются относительно дескрипторов каталогов.
+    Без force удаление директории подтверждается; в пакетном режиме запрос
+    не выводится, и без force директория не удаляется.
+
     Вход:
         target: str - цель для удаления
         recursive: bool - флаг рекурсивного удаления
+        jobs: int - число потоков удаления директории
+        force: bool - удалять директорию без подтверждения
 
     Выход:
         None | str - None при успехе, строка с ошибкой при fail
@@ -66,23 +98,70 @@ def _remove_item(target: str, recursive: bool) -> None | str:
         if not recursive:
             return f"ERROR: '{target}' is a directory (use -r)"
 
-        if not _confirm_deletion(target):
-            return f"Cancelled: '{target}'"
+        if not force:
+            if not session.is_interactive():
+                return f"ERROR: Cannot confirm removal of directory '{target}' in batch mode (use -f)"
+            if not _confirm_deletion(target):
+                return f"Cancelled: '{target}'"
 
     try:
         if goal_path.is_file():
             goal_path.unlink()
         elif goal_path.is_dir():
             if recursive:
-                shutil.rmtree(goal_path)
+                removed, errors = remove_tree(str(goal_path), jobs)
+                stats.count(entries=removed)
+                if errors:
+                    return "\n".join(errors)
+                return None
             else:
                 return f"ERROR: '{target}' is a directory (use -r)"
         else:
             return f"ERROR: '{target}' is not a file or directory"
 
-    except (OSError, PermissionError, shutil.Error) as err:
+    except (OSError, PermissionError) as err:
+        return f"ERROR: {str(err)}"
+
+    stats.count(entries=1)
+    return None
+
+
+def _trash_item(target: str, recursive: bool) -> None | str:
+    """
+    Переносит один элемент в корзину (rm --trash)
+
+    Перенос - один rename в корзину той же файловой системы, поэтому время не
+    зависит от размера дерева, а подтверждение для директорий не запрашивается:
+    элемент можно вернуть командой trash restore.
+
+    Вход:
+        target: str - цель для удаления
+        recursive: bool - флаг рекурсивного удаления
+
+    Выход:
+        None | str - None при успехе, строка с ошибкой при fail
+    """
+
+    goal_path = resolve_path(target, must_be=False)
+
+    if goal_path is None or not os.path.lexists(goal_path):
+        return f"ERROR: '{target}' does not exist"
+
+    if not is_safe_path(goal_path):
+        return f"ERROR: Cannot remove system directory '{target}'"
+
+    if any(part.startswith(TRASH_NAME) for part in goal_path.parts):
+        return f"ERROR: '{target}' is in trash (use 'trash purge')"
+
+    if goal_path.is_dir() and not goal_path.is_symlink() and not recursive:
+        return f"ERROR: '{target}' is a directory (use -r)"
+
+    try:
+        move_to_trash(goal_path)
+    except OSError as err:
         return f"ERROR: {str(err)}"
 
+    stats.count(entries=1)
     return None
 
 
@@ -0,0 +1,73 @@
+from src.core import stats as shell_stats
+from src.core.progress import format_size
+
+
+def stats(args: list[str]) -> str:
+    """
+    Команда stats - статистика времени выполнения команд
+
+    Вход:
+        args: list[str] - список аргументов [] | ["--reset"] | ["--log", "on"|"off"] | ["--hist", "cp"]
+
+    Выход:
+        str - таблица со статистикой | строка результата или ошибки
+    """
+
+    if args == ["--reset"]:
+        shell_stats.reset()
+        return "Statistics cleared"
+
+    if len(args) == 2 and args[0] == "--log":
+        if args[1] not in ("on", "off"):
+            return "ERROR: '--log' expects 'on' or 'off'"
+        shell_stats.set_log_enabled(args[1] == "on")
+        return f"Statistics logging {args[1]}"
+
+    if len(args) == 2 and args[0] == "--hist":
+        return _format_histogram(args[1], shell_stats.histogram(args[1]))
+
+    if args:
+        return f"ERROR: Incorrect option {args[0]}"
+
+    summary = shell_stats.summary()
+    if not summary:
+        return "No commands recorded yet"
+
+    lines = [
+        f"{'command':<8} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+        f"{'total ms':>10} {'read':>10} {'written':>10} {'entries':>8}"
+    ]
+    ordered = sorted(summary.items(), key=lambda item: item[1]["total"], reverse=True)
+    for command, row in ordered:
+        lines.append(
+            f"{command:<8} {row['count']:>6.0f} {row['p50'] * 1000:>9.3f} "
+            f"{row['p95'] * 1000:>9.3f} {row['p99'] * 1000:>9.3f} {row['total'] * 1000:>10.3f} "
+            f"{format_size(row['bytes_read']):>10} {format_size(row['bytes_written']):>10} "
+            f"{row['entries']:>8.0f}"
+        )
+    return "\n".join(lines)
+
+
+def _format_histogram(command: str, buckets: list[int]) -> str:
+    """
+    Текстовая гистограмма задержек команды
+
+    Вход:
+        command: str - название команды
+        buckets: list[int] - счётчики по степеням двойки микросекунд
+
+    Выход:
+        str - строки вида "<   1024 us  ####  12"
+    """
+
+    if not any(buckets):
+        return f"No samples for '{command}'"
+
+    peak = max(buckets)
+    lines = [f"Latency histogram for '{command}':"]
+    first = next(i for i, value in enumerate(buckets) if value)
+    last = max(i for i, value in enumerate(buckets) if value)
+    for index in range(first, last + 1):
+        bar = "#" * max(round(buckets[index] / peak * 40), 1 if buckets[index] else 0)
+        lines.append(f"< {2 ** index:>10} us {bar:<40} {buckets[index]}")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+from typing import Optional
+from src.core.path_utils import resolve_path
+from src.core import stats
+from src.core.trash import (
+    PURGE_RATE, TrashEntry, claim_for_purge, known_trash_dirs, list_entries, purge, restore, start_purge,
+)
+
+
+def trash(args: list[str]) -> Optional[str]:
+    """
+    Команда trash - работа с корзиной, в которую переносит rm --trash
+
+    Подкоманды:
+        list - элементы корзины: время удаления, имя в корзине, исходный путь
+        restore NAME... - вернуть элемент на место (NAME - имя в корзине, исходный
+                          путь или имя файла; при нескольких совпадениях - последний удалённый)
+        purge [--rate N] [--wait] [NAME...] - окончательно удалить элементы (по умолчанию все)
+                          в фоновом процессе с темпом не выше N элементов в секунду;
+                          --wait - удалить сразу, в текущем процессе
+
+    Вход:
+        args: list[str] - список аргументов ["list"] | ["restore", "build"]
+                          | ["purge"] | ["purge", "--rate", "1000", "build"]
+
+    Выход:
+        None | str - вывод подкоманды или None при успехе; строка с ошибкой при fail
+    """
+
+    if not args:
+        return "ERROR: 'trash' requires a subcommand: list, restore or purge"
+
+    command, rest = args[0], args[1:]
+    if command == "list":
+        if rest:
+            return f"ERROR: Incorrect option {rest[0]}"
+        return _list()
+    if command == "restore":
+        return _restore(rest)
+    if command == "purge":
+        return _purge(rest)
+    return f"ERROR: Unknown trash subcommand '{command}'"
+
+
+def _list() -> str:
+    """
+    Таблица элементов корзины
+
+    Выход:
+        str - строки "время  имя в корзине  исходный путь" или сообщение о пустой корзине
+    """
+
+    entries = list_entries()
+    if not entries:
+        return "Trash is empty"
+    return "\n".join(f"{entry.deleted.isoformat(' ')}  {entry.entry_id}  {entry.original}" for entry in entries)
+
+
+def _find(name: str, entries: list[TrashEntry]) -> Optional[TrashEntry]:
+    """
+    Последний удалённый элемент, совпавший по имени в корзине, исходному пути
+    или имени файла
+
+    Вход:
+        name: str - имя, как его ввёл пользователь
+        entries: list[TrashEntry] - элементы корзины в порядке удаления
+
+    Выход:
+        TrashEntry | None - найденный элемент или None
+    """
+
+    path = resolve_path(name, must_be=False)
+    for entry in reversed(entries):
+        if name in (entry.entry_id, entry.original.name) or entry.original == path:
+            return entry
+    return None
+
+
+def _restore(names: list[str]) -> Optional[str]:
+    """
+    Подкоманда trash restore
+
+    Вход:
+        names: list[str] - что восстановить
+
+    Выход:
+        None | str - None при успехе, строка с ошибками при fail
+    """
+
+    if not names:
+        return "ERROR: 'trash restore' requires a name"
+
+    entries = list_entries()
+    errors = []
+    for name in names:
+        entry = _find(name, entries)
+        if entry is None:
+            errors.append(f"ERROR: '{name}' is not in trash")
+            continue
+        try:
+            restore(entry)
+        except OSError as err:
+            errors.append(f"ERROR: {str(err)}")
+            continue
+        entries.remove(entry)
+        stats.count(entries=1)
+
+    if errors:
+        return "\n".join(errors)
+    return None
+
+
+def _purge(args: list[str]) -> Optional[str]:
+    """
+    Подкоманда trash purge
+
+    Элементы сразу переносятся в purging/ корзины (пропадают из trash list),
+    а их удаление выполняет фоновый процесс; каталоги purging/, оставшиеся
+    от прерванной очистки, очищаются тем же процессом.
+
+    Вход:
+        args: list[str] - опции и имена элементов
+
+    Выход:
+        None | str - сообщение о запуске фоновой очистки; при fail - строки с ошибками
+                     (и сообщение, если очистка всё же запущена)
+    """
+
+    rate = PURGE_RATE
+    wait = False
+    names = []
+    index = 0
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if arg == "--rate":
+            if index >= len(args) or not args[index].isdigit():
+                return f"ERROR: Option {arg} requires a number"
+            rate = int(args[index])
+            index += 1
+        elif arg == "--wait":
+            wait = True
+        elif arg.startswith("-"):
+            return f"ERROR: Incorrect option {arg}"
+        else:
+            names.append(arg)
+
+    entries = list_entries()
+    errors = []
+    messages = []
+    if names:
+        selected = []
+        for name in names:
+            entry = _find(name, entries)
+            if entry is None:
+                errors.append(f"ERROR: '{name}' is not in trash")
+            else:
+                entries.remove(entry)
+                selected.append(entry)
+        entries = selected
+
+    try:
+        purging_dirs = claim_for_purge(entries)
+    except OSError as err:
+        errors.append(f"ERROR: {str(err)}")
+        purging_dirs = []
+    for trash_dir in known_trash_dirs():
+        leftover = trash_dir / "purging"
+        if leftover not in purging_dirs and leftover.is_dir() and any(leftover.iterdir()):
+            purging_dirs.append(leftover)
+
+    if purging_dirs:
+        if wait:
+            removed = sum(purge(purging_dir, rate) for purging_dir in purging_dirs)
+            stats.count(entries=removed)
+        else:
+            try:
+                process = start_purge(purging_dirs, rate)
+            except OSError as err:
+                errors.append(f"ERROR: {str(err)}")
+            else:
+                messages.append(f"Purging {len(entries)} item(s) in background (pid {process.pid})")
+
+    if errors or messages:
+        return "\n".join(errors + messages)
+    return None
@@ -1,5 +1,6 @@
 import shutil
 from src.core.path_utils import resolve_path
+from src.core import stats
 
 
 def zippig(args: list[str]) -> str:
@@ -38,6 +39,7 @@ def zippig(args: list[str]) -> str:
             base_dir=folder_path.name
         )
 
+        stats.count(bytes_written=archive_path.stat().st_size, entries=1)
         return f"Created archive: {archive_path}"
 
     except (shutil.Error, OSError, IOError, PermissionError) as err:
@@ -68,6 +70,7 @@ def unzipping(args: list[str]) -> str:
 
     try:
         shutil.unpack_archive(archive_path, extract_dir, 'zip')
+        stats.count(bytes_read=archive_path.stat().st_size, entries=1)
         return f"Extracted to: {extract_dir}"
 
     except (shutil.Error, OSError, IOError, PermissionError) as err:
@@ -110,6 +113,7 @@ def tarring(args: list[str]) -> str:
             base_dir=folder_path.name
         )
 
+        stats.count(bytes_written=archive_path.stat().st_size, entries=1)
         return f"Created archive: {archive_path}"
 
     except (shutil.Error, OSError, IOError, PermissionError) as err:
@@ -140,6 +144,7 @@ def untarring(args: list[str]) -> str:
 
     try:
         shutil.unpack_archive(archive_path, extract_dir, 'gztar')
+        stats.count(bytes_read=archive_path.stat().st_size, entries=1)
         return f"Extracted to: {extract_dir}"
 
     except (shutil.Error, OSError, IOError, PermissionError) as err:
@@ -0,0 +1,418 @@
+import errno
+import hashlib
+import io
+import os
+import shutil
+import stat
+from pathlib import Path
+from typing import Callable, Literal, NamedTuple, Optional, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+HASH_ALGORITHM = "blake2b"
+BUFFER_SIZE = 8 * 1024 * 1024
+MIN_BUFFER_SIZE = 64 * 1024
+ZERO_COPY_CHUNK = 64 * 1024 * 1024
+RESUME_CHUNK = 8 * 1024 * 1024
+FICLONE = 0x40049409
+
+METHOD_REFLINK = "reflink"
+METHOD_SPARSE = "sparse"
+METHOD_COPY_FILE_RANGE = "copy_file_range"
+METHOD_SENDFILE = "sendfile"
+METHOD_USERSPACE = "userspace"
+
+# Ошибки, означающие "способ не поддерживается для этой пары файлов" - переход к следующему
+_UNSUPPORTED = {
+    errno.EBADF, errno.EINVAL, errno.ENOSYS, errno.ENOTTY, errno.EOPNOTSUPP,
+    errno.EPERM, errno.EXDEV, errno.ETXTBSY,
+}
+
+ProgressCallback = Callable[[int], None]
+
+
+class CopyResult(NamedTuple):
+    """
+    Результат копирования одного файла
+
+    Поля:
+        method: str - способ, которым скопирована основная часть данных
+        size: int - размер файла назначения
+        resumed: int - смещение, с которого продолжено копирование (--resume)
+        digest: str | None - хэш содержимого, подтверждённый для назначения (--verify)
+    """
+
+    method: str
+    size: int
+    resumed: int = 0
+    digest: Optional[str] = None
+
+
+def _no_progress(copied: int) -> None:
+    """
+    Пустой обработчик прогресса
+    """
+
+
+def copy_file(
+    source: Union[str, Path],
+    destination: Union[str, Path],
+    preserve_metadata: bool = True,
+    progress: Optional[ProgressCallback] = None,
+    resume: bool = False,
+    verify: bool = False,
+) -> CopyResult:
+    """
+    Копирует файл самым дешёвым доступным способом
+
+    Порядок: reflink (FICLONE, мгновенно на CoW-файловых системах btrfs/xfs),
+    os.copy_file_range (копирование внутри ядра), os.sendfile и, наконец,
+    цикл чтения/записи с большим буфером. Если способ не поддерживается,
+    копирование продолжается следующим с того же смещения.
+
+    Разреженный файл (занятых блоков меньше размера) копируется по областям
+    данных, найденным через SEEK_DATA/SEEK_HOLE, - дыры в назначении
+    остаются дырами.
+
+    При resume существующее назначение не обрезается: его начало сверяется с
+    источником блоками по RESUME_CHUNK, и копирование продолжается с первого
+    несовпавшего блока.
+
+    При verify данные идут только через цикл чтения/записи: каждый блок
+    хэшируется в момент копирования, после чего хэш сверяется с хэшем
+    прочитанного назначения - источник повторно не читается.
+
+    Вход:
+        source: str | Path - исходный файл
+        destination: str | Path - файл назначения (перезаписывается)
+        preserve_metadata: bool - копировать права и времена (как shutil.copy2)
+        progress: Callable[[int], None] | None - вызывается с числом байт,
+                  скопированных очередной порцией
+        resume: bool - продолжить частично скопированный файл
+        verify: bool - хэшировать данные при копировании и проверить назначение
+
+    Выход:
+        CopyResult - способ копирования, размер, смещение продолжения и хэш
+
+    Исключения:
+        shutil.SameFileError - источник и назначение - один файл (ссылка на него)
+        shutil.SpecialFileError - источник или назначение - не обычный файл (FIFO, устройство)
+        OSError - ошибки открытия, чтения или записи; EIO, если проверка не прошла
+    """
+
+    source_stat = os.stat(source)
+    try:
+        destination_stat: Optional[os.stat_result] = os.stat(destination)
+    except FileNotFoundError:
+        destination_stat = None
+    if destination_stat is not None and os.path.samestat(source_stat, destination_stat):
+        raise shutil.SameFileError(f"'{source}' and '{destination}' are the same file")
+    if not stat.S_ISREG(source_stat.st_mode):
+        raise shutil.SpecialFileError(f"'{source}' is not a regular file")
+    if destination_stat is not None and stat.S_ISFIFO(destination_stat.st_mode):
+        raise shutil.SpecialFileError(f"'{destination}' is a named pipe")
+
+    notify = progress or _no_progress
+    mode: Literal["r+b", "wb"] = "r+b" if resume and os.path.isfile(destination) else "wb"
+    hasher = hashlib.new(HASH_ALGORITHM) if verify else None
+
+    with open(source, "rb", buffering=0) as src, open(destination, mode, buffering=0) as dst:
+        size = os.fstat(src.fileno()).st_size
+        method = None
+        copied = resumed = 0
+
+        if mode == "r+b":
+            copied = resumed = _verified_prefix(src.fileno(), dst.fileno(), size, hasher)
+            os.ftruncate(dst.fileno(), resumed)
+            notify(resumed)
+
+        if not verify:
+            method, copied = _zero_copy(src.fileno(), dst.fileno(), copied, size, notify)
+
+        src.seek(copied)
+        dst.seek(copied)
+        buffer_size = min(BUFFER_SIZE, max(size - copied, MIN_BUFFER_SIZE))
+        tail = _userspace_copy(src, dst, buffer_size, notify, hasher)
+        if method is None:
+            method = METHOD_USERSPACE
+        copied += tail
+
+    digest = None
+    if hasher is not None:
+        digest = hasher.hexdigest()
+        if file_digest(destination) != digest:
+            raise OSError(errno.EIO, "Verification failed: content differs after copy", str(destination))
+
+    if preserve_metadata:
+        shutil.copystat(source, destination)
+
+    return CopyResult(method, copied, resumed, digest)
+
+
+def _zero_copy(
+    src_fd: int, dst_fd: int, offset: int, size: int, notify: ProgressCallback
+) -> tuple[Optional[str], int]:
+    """
+    Копирование без участия пользовательского буфера: reflink или разреженное
+    копирование (только с начала файла), затем copy_file_range и sendfile
+
+    Вход:
+        src_fd: int - дескриптор источника
+        dst_fd: int - дескриптор назначения
+        offset: int - смещение, с которого копировать
+        size: int - размер источника
+        notify: Callable[[int], None] - обработчик прогресса
+
+    Выход:
+        tuple[str | None, int] - (способ или None, смещение, до которого скопировано)
+    """
+
+    if offset == 0 and size > 0:
+        if _reflink(src_fd, dst_fd):
+            notify(size)
+            return METHOD_REFLINK, size
+        if _is_sparse(os.fstat(src_fd)) and _sparse_copy(src_fd, dst_fd, size, notify):
+            return METHOD_SPARSE, size
+
+    method = None
+    for name, stage in ((METHOD_COPY_FILE_RANGE, _copy_file_range), (METHOD_SENDFILE, _sendfile)):
+        if offset >= size:
+            break
+        before = offset
+        offset = stage(src_fd, dst_fd, offset, size, notify)
+        if method is None and offset > before:
+            method = name
+    return method, offset
+
+
+def _verified_prefix(src_fd: int, dst_fd: int, size: int, hasher: Optional["hashlib._Hash"]) -> int:
+    """
+    Длина начала назначения, совпадающего с источником (сверка блоками по RESUME_CHUNK)
+
+    Совпадающее начало читается из обоих файлов целиком: без этого нельзя
+    доверять уже скопированным данным, а чтение двух файлов дешевле повторного
+    копирования (чтение и запись). Блоки сравниваются напрямую (bytes ==),
+    а не по хэшам: хэширование обоих блоков не сократило бы чтение и только
+    добавило бы работы. Сверка останавливается на первом несовпавшем блоке.
+
+    Вход:
+        src_fd: int - дескриптор источника
+        dst_fd: int - дескриптор частично скопированного назначения
+        size: int - размер источника
+        hasher: hashlib._Hash | None - хэш, в который добавляются совпавшие блоки (--verify)
+
+    Выход:
+        int - смещение, с которого нужно продолжить копирование
+    """
+
+    limit = min(os.fstat(dst_fd).st_size, size)
+    offset = 0
+    while offset < limit:
+        length = min(RESUME_CHUNK, limit - offset)
+        expected = os.pread(src_fd, length, offset)
+        if len(expected) < length or os.pread(dst_fd, length, offset) != expected:
+            return offset
+        if hasher is not None:
+            hasher.update(expected)
+        offset += length
+    return offset
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    """
+    Клонирование содержимого файла (общие экстенты, без копирования данных)
+
+    Выход:
+        bool - True если файл склонирован
+    """
+
+    if fcntl is None:
+        return False
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as err:
+        if err.errno in _UNSUPPORTED:
+            return False
+        raise
+    return True
+
+
+def _is_sparse(stat_info: os.stat_result) -> bool:
+    """
+    Есть ли в файле дыры: занятых блоков меньше, чем нужно под его размер
+    """
+
+    blocks = getattr(stat_info, "st_blocks", None)
+    return blocks is not None and blocks * 512 < stat_info.st_size
+
+
+def _sparse_copy(src_fd: int, dst_fd: int, size: int, notify: ProgressCallback) -> bool:
+    """
+    Копирует только области данных; дыры получаются усечением до размера
+
+    Вход:
+        src_fd: int - дескриптор источника
+        dst_fd: int - дескриптор назначения (пустой файл)
+        size: int - размер источника
+        notify: Callable[[int], None] - обработчик прогресса
+
+    Выход:
+        bool - False, если SEEK_DATA/SEEK_HOLE не поддерживаются (ничего не скопировано)
+    """
+
+    seek_data = getattr(os, "SEEK_DATA", None)
+    seek_hole = getattr(os, "SEEK_HOLE", None)
+    if seek_data is None or seek_hole is None:
+        return False
+
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(src_fd, offset, seek_data)
+        except OSError as err:
+            if err.errno == errno.ENXIO:
+                break
+            if offset == 0 and err.errno in _UNSUPPORTED:
+                return False
+            raise
+        end = min(os.lseek(src_fd, start, seek_hole), size)
+        notify(start - offset)
+        _copy_range(src_fd, dst_fd, start, end, notify)
+        offset = end
+
+    os.ftruncate(dst_fd, size)
+    notify(size - offset)
+    return True
+
+
+def _copy_range(src_fd: int, dst_fd: int, start: int, end: int, notify: ProgressCallback) -> None:
+    """
+    Копирует байты [start, end) на то же смещение: copy_file_range,
+    sendfile, затем pread/pwrite
+    """
+
+    offset = _copy_file_range(src_fd, dst_fd, start, end, notify)
+    if offset < end:
+        offset = _sendfile(src_fd, dst_fd, offset, end, notify)
+    while offset < end:
+        block = os.pread(src_fd, min(BUFFER_SIZE, end - offset), offset)
+        if not block:
+            break
+        written = os.pwrite(dst_fd, block, offset)
+        offset += written
+        notify(written)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, size: int, notify: ProgressCallback) -> int:
+    """
+    Копирование через os.copy_file_range начиная со смещения offset
+
+    Выход:
+        int - смещение, до которого данные скопированы
+    """
+
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return offset
+
+    while offset < size:
+        try:
+            written = copy_range(
+                src_fd, dst_fd, min(ZERO_COPY_CHUNK, size - offset), offset, offset
+            )
+        except OSError as err:
+            if err.errno in _UNSUPPORTED:
+                return offset
+            raise
+        if written == 0:
+            break
+        offset += written
+        notify(written)
+    return offset
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, size: int, notify: ProgressCallback) -> int:
+    """
+    Копирование через os.sendfile (файл в файл, Linux 2.6.33+)
+
+    Выход:
+        int - смещение, до которого данные скопированы
+    """
+
+    if not hasattr(os, "sendfile"):
+        return offset
+
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while offset < size:
+        try:
+            written = os.sendfile(dst_fd, src_fd, offset, min(ZERO_COPY_CHUNK, size - offset))
+        except OSError as err:
+            if err.errno in _UNSUPPORTED:
+                return offset
+            raise
+        if written == 0:
+            break
+        offset += written
+        notify(written)
+    return offset
+
+
+def _userspace_copy(
+    src: io.FileIO,
+    dst: io.FileIO,
+    buffer_size: int,
+    notify: ProgressCallback,
+    hasher: Optional["hashlib._Hash"] = None,
+) -> int:
+    """
+    Цикл чтения/записи через один переиспользуемый буфер до конца файла
+
+    Вход:
+        src: io.FileIO - источник без буферизации, позиция выставлена
+        dst: io.FileIO - назначение без буферизации, позиция выставлена
+        buffer_size: int - размер буфера (меньше BUFFER_SIZE для небольших остатков)
+        notify: Callable[[int], None] - обработчик прогресса
+        hasher: hashlib._Hash | None - хэш, обновляемый каждым скопированным блоком
+
+    Выход:
+        int - число скопированных байт
+    """
+
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    total = 0
+    try:
+        while True:
+            read = src.readinto(buffer)
+            if not read:
+                break
+            if hasher is not None:
+                hasher.update(view[:read])
+            written = 0
+            while written < read:
+                written += dst.write(view[written:read]) or 0
+            total += read
+            notify(read)
+    finally:
+        view.release()
+    return total
+
+
+def file_digest(path: Union[str, Path], algorithm: str = HASH_ALGORITHM) -> str:
+    """
+    Хэш содержимого файла
+
+    Вход:
+        path: str | Path - путь к файлу
+        algorithm: str - алгоритм hashlib
+
+    Выход:
+        str - шестнадцатеричный дайджест
+    """
+
+    with open(path, "rb") as source:
+        return hashlib.file_digest(source, algorithm).hexdigest()
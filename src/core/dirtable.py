@@ -0,0 +1,149 @@
+import heapq
+import os
+from array import array
+from typing import Any, Optional
+
+NUMPY_THRESHOLD = 50_000
+
+
+class DirTable:
+    """
+    Колоночное представление содержимого каталога
+
+    Имена хранятся в одном буфере (UTF-8) со смещениями, размеры и времена
+    изменения - в массивах array, поэтому для каталога из миллиона элементов
+    не создаётся миллион Path/DirEntry объектов, а сортировка идёт по числам.
+    """
+
+    def __init__(self) -> None:
+        self.names = bytearray()
+        self.offsets = array("Q", [0])
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.kinds = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def append(self, name: str, is_dir: bool, size: int, mtime: float) -> None:
+        """
+        Добавляет элемент в таблицу
+
+        Вход:
+            name: str - имя элемента
+            is_dir: bool - является ли элемент директорией
+            size: int - размер в байтах
+            mtime: float - время изменения
+        """
+
+        self.names += os.fsencode(name)
+        self.offsets.append(len(self.names))
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.kinds.append(1 if is_dir else 0)
+
+    def name(self, index: int) -> str:
+        """
+        Имя элемента по индексу
+
+        Вход:
+            index: int - индекс элемента
+
+        Выход:
+            str - имя
+        """
+
+        return os.fsdecode(bytes(self.names[self.offsets[index]:self.offsets[index + 1]]))
+
+    def is_dir(self, index: int) -> bool:
+        """
+        Вход:
+            index: int - индекс элемента
+
+        Выход:
+            bool - True если элемент является директорией
+        """
+
+        return self.kinds[index] == 1
+
+    @classmethod
+    def from_directory(cls, directory: "os.PathLike[str] | str") -> "DirTable":
+        """
+        Читает каталог через os.scandir, выполняя один stat на элемент
+
+        Вход:
+            directory: PathLike | str - путь к каталогу
+
+        Выход:
+            DirTable - таблица содержимого
+
+        Исключения:
+            OSError - если каталог не удалось прочитать
+        """
+
+        table = cls()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    stat_info = entry.stat()
+                except OSError:
+                    stat_info = entry.stat(follow_symlinks=False)
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                table.append(entry.name, is_dir, stat_info.st_size, stat_info.st_mtime)
+        return table
+
+    def order_by(self, column: str, top: Optional[int] = None) -> list[int]:
+        """
+        Индексы элементов по убыванию столбца; равные значения остаются в порядке каталога
+
+        Для top-k используется куча (heapq) или argpartition NumPy на больших
+        таблицах, полная сортировка - argsort NumPy или sorted по индексам.
+        argpartition берёт из равных k-му значению элементов произвольные, поэтому
+        граничные элементы отбираются заново по порядку каталога.
+
+        Вход:
+            column: str - "size" или "mtime"
+            top: int | None - вернуть только top первых индексов
+
+        Выход:
+            list[int] - индексы в порядке вывода
+        """
+
+        values = self.sizes if column == "size" else self.mtimes
+        count = len(values)
+        limit = count if top is None else min(top, count)
+
+        numpy = _numpy() if count >= NUMPY_THRESHOLD else None
+        if numpy is not None:
+            column_values = numpy.frombuffer(values, dtype=values.typecode)
+            if limit < count:
+                boundary = column_values[numpy.argpartition(-column_values, limit - 1)[limit - 1]]
+                above = numpy.flatnonzero(column_values > boundary)
+                ties = numpy.flatnonzero(column_values == boundary)[: limit - len(above)]
+                candidates = numpy.sort(numpy.concatenate((above, ties)))
+            else:
+                candidates = numpy.arange(count)
+            indices = candidates[numpy.argsort(-column_values[candidates], kind="stable")]
+            return [int(index) for index in indices]
+
+        if limit < count:
+            return heapq.nlargest(limit, range(count), key=values.__getitem__)
+        return sorted(range(count), key=values.__getitem__, reverse=True)
+
+
+def _numpy() -> Optional[Any]:
+    """
+    Ленивый импорт NumPy (необязательная зависимость)
+
+    Выход:
+        module | None - модуль numpy или None, если он не установлен
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
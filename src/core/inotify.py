@@ -0,0 +1,155 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from typing import Optional
+
+IN_ACCESS = 0x00000001
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+DIRECTORY_EVENTS = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_libc: Optional[ctypes.CDLL] = None
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """
+    Загружает libc с функциями inotify (только Linux)
+
+    Выход:
+        ctypes.CDLL | None - библиотека или None, если inotify недоступен
+    """
+    global _libc
+
+    if _libc is None:
+        library = ctypes.util.find_library("c")
+        try:
+            libc = ctypes.CDLL(library, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except (OSError, AttributeError):
+            return None
+        _libc = libc
+    return _libc
+
+
+def inotify_available() -> bool:
+    """
+    Проверка поддержки inotify в системе
+
+    Выход:
+        bool - True если inotify можно использовать
+    """
+
+    return _load_libc() is not None
+
+
+class Inotify:
+    """
+    Минимальная обёртка над inotify через ctypes
+
+    Дескриптор открывается в неблокирующем режиме; события читаются
+    методом read_events, при необходимости с ожиданием через select.
+    """
+
+    def __init__(self) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this system")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: "os.PathLike[str] | str", mask: int = DIRECTORY_EVENTS) -> int:
+        """
+        Добавляет наблюдение за путём
+
+        Вход:
+            path: PathLike | str - файл или каталог
+            mask: int - маска событий
+
+        Выход:
+            int - дескриптор наблюдения (wd)
+
+        Исключения:
+            OSError - если наблюдение не удалось добавить (например, исчерпан лимит)
+        """
+
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return int(wd)
+
+    def rm_watch(self, wd: int) -> None:
+        """
+        Удаляет наблюдение (ошибки игнорируются: наблюдение могло исчезнуть само)
+
+        Вход:
+            wd: int - дескриптор наблюдения
+        """
+
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout: float = 0.0) -> list[tuple[int, int, str]]:
+        """
+        Читает накопившиеся события
+
+        Вход:
+            timeout: float - сколько секунд ждать событий, если их ещё нет
+
+        Выход:
+            list[tuple[int, int, str]] - список (wd, mask, имя элемента или "")
+        """
+
+        if timeout > 0:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(raw_name)))
+        return events
+
+    def close(self) -> None:
+        """
+        Закрывает дескриптор inotify
+        """
+
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
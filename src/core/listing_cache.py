@@ -0,0 +1,255 @@
+import os
+import stat
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from src.core.inotify import (
+    DIRECTORY_EVENTS,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_MOVE_SELF,
+    IN_Q_OVERFLOW,
+    Inotify,
+)
+
+MAX_CACHED_DIRS = 64
+
+
+class CachedEntry(NamedTuple):
+    """
+    Запись каталога в кэше
+
+    Поля:
+        name: str - имя элемента
+        is_dir: bool - является ли элемент директорией
+        size: int - размер в байтах (-1, если stat ещё не выполнялся)
+        mtime: float - время изменения
+    """
+
+    name: str
+    is_dir: bool
+    size: int = -1
+    mtime: float = 0.0
+
+
+class _CachedDir:
+    """
+    Кэшированное содержимое одного каталога
+    """
+
+    def __init__(self, wd: Optional[int], dir_mtime_ns: int) -> None:
+        self.wd = wd
+        self.dir_mtime_ns = dir_mtime_ns
+        self.entries: dict[str, CachedEntry] = {}
+        self.sorted_names: Optional[list[str]] = None
+        self.dirty: set[str] = set()
+        self.stale = False
+
+
+class ListingCache:
+    """
+    Кэш содержимого каталогов для повторных ls / ls -l
+
+    При доступном inotify на каждый кэшированный каталог ставится наблюдение;
+    перед выдачей листинга события разбираются и повторно stat'ятся только
+    изменившиеся элементы. Без inotify используется проверка mtime каталога:
+    при неизменном mtime набор имён берётся из памяти, но для ls -l все элементы
+    stat'ятся заново, так как изменение содержимого файла не меняет mtime каталога.
+    """
+
+    def __init__(self, use_inotify: bool = True, max_dirs: int = MAX_CACHED_DIRS) -> None:
+        self.max_dirs = max_dirs
+        self._dirs: "OrderedDict[str, _CachedDir]" = OrderedDict()
+        self._by_wd: dict[int, str] = {}
+        self._inotify: Optional[Inotify] = None
+        if use_inotify:
+            try:
+                self._inotify = Inotify()
+            except OSError:
+                self._inotify = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        """
+        Выход:
+            bool - True если инвалидация идёт по событиям inotify
+        """
+
+        return self._inotify is not None
+
+    def listing(self, directory: str, need_stat: bool) -> list[CachedEntry]:
+        """
+        Содержимое каталога, отсортированное по имени без учёта регистра
+
+        Вход:
+            directory: str - абсолютный путь к каталогу
+            need_stat: bool - нужны ли размер и время изменения (ls -l)
+
+        Выход:
+            list[CachedEntry] - элементы каталога
+
+        Исключения:
+            OSError - если каталог не удалось прочитать
+        """
+
+        self._drain_events()
+
+        cached = self._dirs.get(directory)
+        if cached is not None and self._inotify is None:
+            if os.stat(directory).st_mtime_ns != cached.dir_mtime_ns:
+                cached.stale = True
+            elif need_stat:
+                cached.dirty.update(cached.entries)
+
+        if cached is None or cached.stale:
+            cached = self._load(directory, cached)
+        else:
+            self._dirs.move_to_end(directory)
+            self._refresh_dirty(directory, cached)
+
+        if need_stat:
+            unstated = [name for name, entry in cached.entries.items() if entry.size < 0]
+            if unstated:
+                cached.dirty.update(unstated)
+                self._refresh_dirty(directory, cached)
+
+        if cached.sorted_names is None:
+            cached.sorted_names = sorted(cached.entries, key=str.lower)
+        return [cached.entries[name] for name in cached.sorted_names]
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """
+        Сбрасывает кэш каталога (или весь кэш)
+
+        Вход:
+            directory: str | None - каталог; None - все каталоги
+        """
+
+        targets = list(self._dirs) if directory is None else [directory]
+        for target in targets:
+            cached = self._dirs.pop(target, None)
+            if cached is not None and cached.wd is not None:
+                self._by_wd.pop(cached.wd, None)
+                if self._inotify is not None:
+                    self._inotify.rm_watch(cached.wd)
+
+    def close(self) -> None:
+        """
+        Очищает кэш и закрывает inotify
+        """
+
+        self.invalidate()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _load(self, directory: str, previous: Optional[_CachedDir]) -> _CachedDir:
+        """
+        Полное чтение каталога; наблюдение ставится до чтения, чтобы не потерять изменения
+        """
+
+        wd = previous.wd if previous is not None else None
+        if wd is None and self._inotify is not None:
+            try:
+                wd = self._inotify.add_watch(directory, DIRECTORY_EVENTS)
+            except OSError:
+                wd = None
+
+        cached = _CachedDir(wd, os.stat(directory).st_mtime_ns)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                cached.entries[entry.name] = CachedEntry(entry.name, is_dir)
+
+        self._dirs[directory] = cached
+        self._dirs.move_to_end(directory)
+        if wd is not None:
+            self._by_wd[wd] = directory
+
+        while len(self._dirs) > self.max_dirs:
+            oldest = next(iter(self._dirs))
+            self.invalidate(oldest)
+        return cached
+
+    def _refresh_dirty(self, directory: str, cached: _CachedDir) -> None:
+        """
+        Повторный stat только изменившихся элементов
+        """
+
+        if not cached.dirty:
+            return
+
+        for name in cached.dirty:
+            known = name in cached.entries
+            try:
+                cached.entries[name] = _stat_entry(directory, name)
+            except FileNotFoundError:
+                cached.entries.pop(name, None)
+                if known:
+                    cached.sorted_names = None
+                continue
+            if not known:
+                cached.sorted_names = None
+        cached.dirty.clear()
+
+    def _drain_events(self) -> None:
+        """
+        Разбирает накопившиеся события inotify
+        """
+
+        if self._inotify is None:
+            return
+
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                for cached in self._dirs.values():
+                    cached.stale = True
+                continue
+
+            directory = self._by_wd.get(wd)
+            if directory is None:
+                continue
+            cached = self._dirs[directory]
+
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                self._by_wd.pop(wd, None)
+                cached.wd = None
+                cached.stale = True
+            elif name:
+                cached.dirty.add(name)
+
+
+def _stat_entry(directory: str, name: str) -> CachedEntry:
+    """
+    stat одного элемента (с переходом по ссылке; для битой ссылки - lstat)
+
+    Исключения:
+        FileNotFoundError - если элемента больше нет
+    """
+
+    path = os.path.join(directory, name)
+    try:
+        stat_info = os.stat(path)
+    except FileNotFoundError:
+        stat_info = os.lstat(path)
+    return CachedEntry(name, stat.S_ISDIR(stat_info.st_mode), stat_info.st_size, stat_info.st_mtime)
+
+
+_cache: Optional[ListingCache] = None
+
+
+def get_listing_cache() -> ListingCache:
+    """
+    Общий кэш листингов оболочки (создаётся при первом обращении)
+
+    Выход:
+        ListingCache - кэш
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = ListingCache()
+    return _cache
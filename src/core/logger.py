@@ -1,23 +1,185 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Optional
 
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
 
-def setup_logging(log_file: str = "shell.log") -> None:
+_logger = logging.getLogger("shell")
+_logger.propagate = False
+_writer: Optional["BatchLogWriter"] = None
+
+
+class BatchLogWriter(threading.Thread):
+    """
+    Фоновый поток записи лога: забирает записи из очереди и пишет их пачками
+
+    В очередь кладутся пары (время, сообщение), поэтому на пути выполнения команды
+    не создаются LogRecord и не выполняется форматирование. Пачка сбрасывается на диск,
+    когда в ней набирается batch_size записей или с момента первой записи в пачке прошло
+    flush_interval секунд. Ротация по размеру выполняется средствами RotatingFileHandler.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        log_queue: "queue.SimpleQueue[object]",
+        handler: logging.handlers.RotatingFileHandler,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ) -> None:
+        super().__init__(name="shell-log-writer", daemon=True)
+        self.log_queue = log_queue
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def run(self) -> None:
+        batch: list[tuple[float, str]] = []
+        deadline = 0.0
+
+        while True:
+            timeout = max(deadline - time.monotonic(), 0.0) if batch else None
+            try:
+                item = self.log_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(batch)
+                return
+
+            if isinstance(item, tuple):
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+    def submit(self, message: str) -> None:
+        """
+        Ставит сообщение в очередь на запись (вызывается из потока команды)
+
+        Вход:
+            message: str - готовая строка сообщения
+        """
+
+        self.log_queue.put((time.time(), message))
+
+    def stop(self) -> None:
+        """
+        Дописывает оставшиеся записи и останавливает поток
+        """
+
+        self.log_queue.put(self._STOP)
+        self.join()
+        self.handler.close()
+
+    def _flush(self, batch: list[tuple[float, str]]) -> None:
+        """
+        Записывает пачку; ошибка записи или ротации передаётся в handler.handleError,
+        а поток продолжает обслуживать очередь (следующие пачки пишутся заново)
+
+        Вход:
+            batch: list[tuple[float, str]] - пары (время, сообщение)
+        """
+
+        try:
+            self._write_batch(batch)
+        except Exception:
+            self.handler.handleError(logging.makeLogRecord({"msg": batch[-1][1], "created": batch[-1][0]}))
+
+    def _write_batch(self, batch: list[tuple[float, str]]) -> None:
+        """
+        Записывает пачку записей одним сбросом буфера, выполняя ротацию при необходимости
+
+        Вход:
+            batch: list[tuple[float, str]] - пары (время, сообщение)
+        """
+
+        if not batch:
+            return
+
+        handler = self.handler
+        if handler.stream is None:
+            handler.stream = handler._open()
+        size = handler.stream.tell()
+
+        for created, message in batch:
+            stamp = time.strftime(LOG_DATEFMT, time.localtime(created))
+            line = f"[{stamp}] {message}{handler.terminator}"
+            line_size = len(line.encode("utf-8"))
+            if handler.maxBytes > 0 and size > 0 and size + line_size > handler.maxBytes:
+                handler.stream.flush()
+                handler.doRollover()
+                size = 0
+            handler.stream.write(line)
+            size += line_size
+
+        handler.stream.flush()
+
+
+def setup_logging(
+    log_file: str = "shell.log",
+    background: bool = False,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 3,
+    batch_size: int = 256,
+    flush_interval: float = 1.0,
+) -> None:
     """
     Настройка системы логирования
 
     Вход:
         log_file: str - путь к файлу лога (по умолчанию "shell.log")
+        background: bool - писать лог в фоновом потоке пачками (по умолчанию False)
+        max_bytes: int - размер файла, после которого выполняется ротация (0 - без ротации)
+        backup_count: int - сколько старых файлов лога хранить
+        batch_size: int - число записей, при котором пачка сбрасывается на диск
+        flush_interval: float - максимальная задержка записи пачки в секундах
     """
+    global _writer
+
+    shutdown_logging()
+
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format="[%(asctime)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
     )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT))
+
+    if background:
+        log_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        _writer = BatchLogWriter(log_queue, file_handler, batch_size, flush_interval)
+        _writer.start()
+    else:
+        _logger.addHandler(file_handler)
+        _logger.setLevel(logging.INFO)
+
+
+def shutdown_logging() -> None:
+    """
+    Сбрасывает накопленные записи на диск и закрывает обработчики лога
+    """
+    global _writer
+
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+        handler.close()
+
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
 
 
 def log_command(command: str, success: bool = True, error_msg: str = "") -> None:
@@ -30,7 +192,14 @@ def log_command(command: str, success: bool = True, error_msg: str = "") -> None
         error_msg: str - сообщение об ошибке (по умолчанию "")
     """
 
-    if success:
-        logging.info(command)
+    message = command if success else f"{command} - ERROR: {error_msg}"
+
+    if _writer is not None:
+        _writer.submit(message)
+    elif success:
+        _logger.info(message)
     else:
-        logging.error(f"{command} - ERROR: {error_msg}")
+        _logger.error(message)
+
+
+atexit.register(shutdown_logging)
@@ -1,4 +1,5 @@
 import shlex
+from src.core.registry import lookup
 
 
 def parse_command(user_input: str) -> tuple[str, list[str], str] | None:
@@ -47,18 +48,45 @@ def route_command(
     if command == "error":
         return ("core", "parse_error", args, raw_input)
 
-    match command:
-        case "ls" | "cd" | "cat" | "cp" | "mv" | "rm":
-            return ("file_ops", command, args, raw_input)
+    found = lookup(command)
+    if found is None:
+        return ("core", "unknown", args, raw_input)
 
-        case "zip" | "unzip" | "tar" | "untar":
-            return ("plugins", command, args, raw_input)
+    name, spec = found
+    return (spec.group, name, args, raw_input)
 
-        case "exit" | "EXIT":
-            return ("core", "exit", args, raw_input)
 
-        case "mai" | "MAI":
-            return ("core", "mai", args, raw_input)
+def split_commands(text: str) -> list[str]:
+    """
+    Разбивает текст на отдельные команды по ';' и переводам строк вне кавычек
+
+    Вход:
+        text: str - текст с одной или несколькими командами ("ls; cd ..")
+
+    Выход:
+        list[str] - список строк команд (без пустых)
+    """
 
-        case _:
-            return ("core", "unknown", args, raw_input)
+    commands = []
+    current: list[str] = []
+    quote = ""
+    escaped = False
+
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\" and quote != "'":
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = ""
+        elif char in "'\"":
+            quote = char
+        elif char in ";\n":
+            commands.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+
+    commands.append("".join(current))
+    return [command.strip() for command in commands if command.strip()]
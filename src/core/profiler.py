@@ -0,0 +1,87 @@
+import cProfile
+import io
+import pstats
+import tracemalloc
+from typing import Any, Callable, Optional
+
+
+def profile_call(
+    func: Callable[..., Any], *args: Any, top: int = 15, dump: Optional[str] = None
+) -> tuple[Any, str]:
+    """
+    Выполняет функцию под cProfile и tracemalloc
+
+    Вход:
+        func: Callable - профилируемая функция
+        *args: Any - аргументы функции
+        top: int - сколько функций и мест выделения памяти показать
+        dump: str | None - путь для сохранения статистики в формате .pstats
+
+    Выход:
+        tuple[Any, str] - (результат функции, текстовый отчёт)
+    """
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(func, *args)
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+
+    if dump:
+        profiler.dump_stats(dump)
+
+    return result, _format_report(profiler, snapshot, peak - baseline, current - baseline, top, dump)
+
+
+def _format_report(
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+    peak: int,
+    retained: int,
+    top: int,
+    dump: Optional[str],
+) -> str:
+    """
+    Собирает текстовый отчёт профилирования
+
+    Вход:
+        profiler: cProfile.Profile - собранный профиль
+        snapshot: tracemalloc.Snapshot - снимок выделенной памяти
+        peak: int - пик памяти во время выполнения (байт)
+        retained: int - память, оставшаяся выделенной после выполнения (байт)
+        top: int - число строк в каждом разделе
+        dump: str | None - путь сохранённого .pstats файла
+
+    Выход:
+        str - отчёт
+    """
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+    lines = [
+        "=== profile ===",
+        f"peak memory: {peak / 1024:.1f} KiB, retained: {retained / 1024:.1f} KiB",
+        f"top {top} allocation sites:",
+    ]
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+    for statistic in snapshot.statistics("lineno")[:top]:
+        lines.append(f"  {statistic}")
+
+    lines.append(stream.getvalue().rstrip())
+    if dump:
+        lines.append(f"stats saved to {dump}")
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from typing import Optional, TextIO
+
+REFRESH_INTERVAL = 0.5
+_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
+
+class Progress:
+    """
+    Индикатор прогресса копирования: объём, скорость и оставшееся время
+
+    advance вызывается из потоков копирования после каждой порции данных;
+    строка перерисовывается не чаще раза в REFRESH_INTERVAL секунд, поэтому
+    вывод не замедляет копирование. Общий объём может расти по мере обхода дерева.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, interval: float = REFRESH_INTERVAL) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.total = 0
+        self.done = 0
+        self._started = time.monotonic()
+        self._next_render = self._started + interval
+        self._lock = threading.Lock()
+        self._rendered = False
+
+    def add_total(self, size: int) -> None:
+        """
+        Увеличивает ожидаемый общий объём
+
+        Вход:
+            size: int - байт
+        """
+
+        with self._lock:
+            self.total += size
+
+    def advance(self, size: int) -> None:
+        """
+        Учитывает скопированную порцию данных
+
+        Вход:
+            size: int - байт
+        """
+
+        with self._lock:
+            self.done += size
+            now = time.monotonic()
+            if now < self._next_render:
+                return
+            self._next_render = now + self.interval
+            line = self.format_line(now)
+        self.stream.write("\r" + line)
+        self.stream.flush()
+        self._rendered = True
+
+    def finish(self) -> None:
+        """
+        Выводит итоговую строку
+        """
+
+        with self._lock:
+            line = self.format_line(time.monotonic())
+        if self._rendered or self.done:
+            self.stream.write("\r" + line + "\n")
+            self.stream.flush()
+
+    def format_line(self, now: float) -> str:
+        """
+        Строка прогресса
+
+        Вход:
+            now: float - текущее время (time.monotonic)
+
+        Выход:
+            str - строка вида "1.5 GiB / 10.0 GiB (15%) 320.0 MiB/s ETA 0:00:27"
+        """
+
+        elapsed = max(now - self._started, 1e-9)
+        rate = self.done / elapsed
+        percent = self.done * 100 // self.total if self.total else 100
+        if rate > 0 and self.total > self.done:
+            eta = _format_duration((self.total - self.done) / rate)
+        else:
+            eta = "0:00:00"
+        return (
+            f"{format_size(self.done)} / {format_size(self.total)} ({percent}%) "
+            f"{format_size(rate)}/s ETA {eta}"
+        )
+
+
+def format_size(size: float) -> str:
+    """
+    Размер в двоичных единицах
+
+    Вход:
+        size: float - байт
+
+    Выход:
+        str - строка вида "1.5 GiB"
+    """
+
+    for unit in _UNITS[:-1]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} {_UNITS[-1]}"
+
+
+def _format_duration(seconds: float) -> str:
+    """
+    Длительность в виде Ч:ММ:СС
+    """
+
+    whole = int(seconds)
+    return f"{whole // 3600}:{whole % 3600 // 60:02d}:{whole % 60:02d}"
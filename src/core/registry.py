@@ -0,0 +1,107 @@
+import importlib
+from typing import Callable, NamedTuple, Optional
+
+CommandHandler = Callable[[list[str]], Optional[str]]
+
+
+class CommandSpec(NamedTuple):
+    """
+    Описание команды в таблице диспетчеризации
+
+    Поля:
+        group: str - группа команды ("file_ops" | "plugins" | "core")
+        module: str | None - модуль с обработчиком (None для встроенных команд оболочки)
+        func: str | None - имя функции-обработчика в модуле
+        log_errors: bool - записывать ли в лог возвращённую ошибку (результат "ERROR: ...")
+    """
+
+    group: str
+    module: Optional[str] = None
+    func: Optional[str] = None
+    log_errors: bool = False
+
+
+COMMAND_TABLE: dict[str, CommandSpec] = {
+    "ls": CommandSpec("file_ops", "src.commands.ls", "ls"),
+    "cd": CommandSpec("file_ops", "src.commands.cd", "cd", log_errors=True),
+    "cat": CommandSpec("file_ops", "src.commands.cat", "cat"),
+    "head": CommandSpec("file_ops", "src.commands.head_tail", "head"),
+    "tail": CommandSpec("file_ops", "src.commands.head_tail", "tail"),
+    "grep": CommandSpec("file_ops", "src.commands.grep", "grep"),
+    "cp": CommandSpec("file_ops", "src.commands.cp", "cp", log_errors=True),
+    "mv": CommandSpec("file_ops", "src.commands.mv", "mv", log_errors=True),
+    "rm": CommandSpec("file_ops", "src.commands.rm", "rm", log_errors=True),
+    "trash": CommandSpec("file_ops", "src.commands.trash", "trash", log_errors=True),
+    "zip": CommandSpec("plugins", "src.commands.zip_tar", "zippig"),
+    "unzip": CommandSpec("plugins", "src.commands.zip_tar", "unzipping"),
+    "tar": CommandSpec("plugins", "src.commands.zip_tar", "tarring"),
+    "untar": CommandSpec("plugins", "src.commands.zip_tar", "untarring"),
+    "stats": CommandSpec("core", "src.commands.stats", "stats"),
+    "profile": CommandSpec("core"),
+    "exit": CommandSpec("core"),
+    "mai": CommandSpec("core"),
+}
+
+ALIASES: dict[str, str] = {
+    "EXIT": "exit",
+    "MAI": "mai",
+}
+
+_loaded: dict[str, CommandHandler] = {}
+
+
+def lookup(command: str) -> Optional[tuple[str, CommandSpec]]:
+    """
+    Поиск команды в таблице с учётом псевдонимов
+
+    Вход:
+        command: str - название команды, как его ввёл пользователь
+
+    Выход:
+        tuple[str, CommandSpec] | None - (каноническое имя, описание) или None
+    """
+
+    name = ALIASES.get(command, command)
+    spec = COMMAND_TABLE.get(name)
+    if spec is None:
+        return None
+    return name, spec
+
+
+def get_command(name: str) -> Optional[CommandHandler]:
+    """
+    Возвращает обработчик команды, импортируя его модуль при первом обращении
+
+    Вход:
+        name: str - каноническое название команды
+
+    Выход:
+        Callable | None - функция команды или None, если у команды нет обработчика
+    """
+
+    handler = _loaded.get(name)
+    if handler is not None:
+        return handler
+
+    spec = COMMAND_TABLE.get(name)
+    if spec is None or spec.module is None or spec.func is None:
+        return None
+
+    module = importlib.import_module(spec.module)
+    loaded: CommandHandler = getattr(module, spec.func)
+    _loaded[name] = loaded
+    return loaded
+
+
+def is_loaded(name: str) -> bool:
+    """
+    Проверка, был ли уже импортирован модуль команды
+
+    Вход:
+        name: str - название команды
+
+    Выход:
+        bool - True если обработчик уже загружен
+    """
+
+    return name in _loaded
@@ -0,0 +1,22 @@
+_interactive = True
+
+
+def set_interactive(enabled: bool) -> None:
+    """
+    Включает или выключает интерактивный режим сеанса
+
+    Вход:
+        enabled: bool - можно ли запрашивать подтверждение у пользователя через input()
+    """
+    global _interactive
+
+    _interactive = enabled
+
+
+def is_interactive() -> bool:
+    """
+    Выход:
+        bool - True если команды могут запрашивать подтверждение (не пакетный режим)
+    """
+
+    return _interactive
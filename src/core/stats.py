@@ -0,0 +1,187 @@
+import math
+from collections import deque
+from typing import NamedTuple
+
+RING_SIZE = 4096
+HISTOGRAM_BUCKETS = 32
+
+
+class Sample(NamedTuple):
+    """
+    Замер одного выполнения команды
+
+    Поля:
+        command: str - название команды
+        wall: float - время выполнения в секундах
+        bytes_read: int - прочитано байт
+        bytes_written: int - записано байт
+        entries: int - обработано элементов (файлов, записей каталога)
+    """
+
+    command: str
+    wall: float
+    bytes_read: int
+    bytes_written: int
+    entries: int
+
+
+_samples: deque[Sample] = deque(maxlen=RING_SIZE)
+_histograms: dict[str, list[int]] = {}
+_current = [0, 0, 0]
+_log_enabled = False
+
+
+def begin() -> None:
+    """
+    Обнуляет счётчики текущей команды перед её выполнением
+    """
+
+    _current[0] = _current[1] = _current[2] = 0
+
+
+def count(bytes_read: int = 0, bytes_written: int = 0, entries: int = 0) -> None:
+    """
+    Добавляет объём работы к счётчикам выполняемой команды (вызывается из команд)
+
+    Вход:
+        bytes_read: int - прочитано байт
+        bytes_written: int - записано байт
+        entries: int - обработано элементов
+    """
+
+    _current[0] += bytes_read
+    _current[1] += bytes_written
+    _current[2] += entries
+
+
+def record(command: str, wall: float) -> Sample:
+    """
+    Сохраняет замер команды в кольцевой буфер и гистограмму задержек
+
+    Вход:
+        command: str - название команды
+        wall: float - время выполнения в секундах
+
+    Выход:
+        Sample - сохранённый замер
+    """
+
+    sample = Sample(command, wall, _current[0], _current[1], _current[2])
+    _samples.append(sample)
+
+    histogram = _histograms.get(command)
+    if histogram is None:
+        histogram = _histograms[command] = [0] * HISTOGRAM_BUCKETS
+    bucket = min(int(wall * 1_000_000).bit_length(), HISTOGRAM_BUCKETS - 1)
+    histogram[bucket] += 1
+
+    return sample
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга
+
+    Вход:
+        values: list[float] - отсортированные значения
+        fraction: float - доля (0.5 для p50)
+
+    Выход:
+        float - значение перцентиля (0.0 для пустого списка)
+    """
+
+    if not values:
+        return 0.0
+    rank = min(max(math.ceil(fraction * len(values)) - 1, 0), len(values) - 1)
+    return values[rank]
+
+
+def summary() -> dict[str, dict[str, float]]:
+    """
+    Сводка по командам из кольцевого буфера
+
+    Выход:
+        dict[str, dict[str, float]] - для каждой команды: count, total, p50, p95, p99,
+        bytes_read, bytes_written, entries
+    """
+
+    grouped: dict[str, list[Sample]] = {}
+    for sample in _samples:
+        grouped.setdefault(sample.command, []).append(sample)
+
+    result = {}
+    for command, samples in grouped.items():
+        walls = sorted(sample.wall for sample in samples)
+        result[command] = {
+            "count": len(samples),
+            "total": sum(walls),
+            "p50": percentile(walls, 0.50),
+            "p95": percentile(walls, 0.95),
+            "p99": percentile(walls, 0.99),
+            "bytes_read": sum(sample.bytes_read for sample in samples),
+            "bytes_written": sum(sample.bytes_written for sample in samples),
+            "entries": sum(sample.entries for sample in samples),
+        }
+    return result
+
+
+def histogram(command: str) -> list[int]:
+    """
+    Гистограмма задержек команды за всё время работы оболочки
+
+    Вход:
+        command: str - название команды
+
+    Выход:
+        list[int] - счётчики по корзинам: корзина i содержит замеры < 2**i микросекунд
+    """
+
+    return list(_histograms.get(command, []))
+
+
+def reset() -> None:
+    """
+    Очищает все накопленные замеры
+    """
+
+    _samples.clear()
+    _histograms.clear()
+    begin()
+
+
+def set_log_enabled(enabled: bool) -> None:
+    """
+    Включает или выключает запись замеров в shell.log
+
+    Вход:
+        enabled: bool - записывать ли замер каждой команды в лог
+    """
+    global _log_enabled
+
+    _log_enabled = enabled
+
+
+def log_enabled() -> bool:
+    """
+    Выход:
+        bool - True если замеры команд пишутся в shell.log
+    """
+
+    return _log_enabled
+
+
+def format_sample(sample: Sample) -> str:
+    """
+    Строка замера для записи в лог
+
+    Вход:
+        sample: Sample - замер команды
+
+    Выход:
+        str - строка вида "STATS cp 12.345ms read=0 written=1024 entries=1"
+    """
+
+    return (
+        f"STATS {sample.command} {sample.wall * 1000:.3f}ms "
+        f"read={sample.bytes_read} written={sample.bytes_written} entries={sample.entries}"
+    )
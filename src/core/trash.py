@@ -0,0 +1,335 @@
+import errno
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import quote, unquote
+
+TRASH_NAME = ".shell_trash"
+INFO_SUFFIX = ".trashinfo"
+PURGE_RATE = 5000
+PURGE_BATCH = 100
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class TrashEntry(NamedTuple):
+    """
+    Элемент корзины
+
+    Поля:
+        trash_dir: Path - корзина, в которой лежит элемент
+        entry_id: str - имя элемента в корзине (files/<entry_id>)
+        original: Path - исходный путь
+        deleted: datetime - время удаления
+    """
+
+    trash_dir: Path
+    entry_id: str
+    original: Path
+    deleted: datetime
+
+
+def trash_dir_for(path: Path) -> Path:
+    """
+    Корзина на той же файловой системе, что и путь
+
+    Для файловой системы домашнего каталога - ~/.shell_trash, для остальных -
+    .shell_trash-<uid> в корне точки монтирования: перенос в корзину должен
+    быть одним rename, без копирования данных. Если корень точки монтирования
+    недоступен для записи, корзина создаётся в ближайшем к нему доступном для
+    записи каталоге на пути к элементу.
+
+    Вход:
+        path: Path - абсолютный путь к удаляемому элементу
+
+    Выход:
+        Path - каталог корзины (может ещё не существовать)
+
+    Исключения:
+        PermissionError - если на пути к элементу нет каталога, доступного для записи
+        OSError - если не удалось получить st_dev
+    """
+
+    device = os.stat(path.parent).st_dev
+    home = Path.home()
+    try:
+        if os.stat(home).st_dev == device:
+            return home / TRASH_NAME
+    except OSError:
+        pass
+
+    for directory in reversed(_same_device_ancestors(path.parent, device)):
+        trash_dir = directory / _mount_trash_name()
+        if trash_dir.is_dir() or os.access(directory, os.W_OK):
+            return trash_dir
+    raise PermissionError(
+        errno.EACCES, "No writable directory for trash on this file system (from mount point to parent)", str(path)
+    )
+
+
+def _mount_trash_name() -> str:
+    """
+    Имя корзины вне домашней файловой системы: .shell_trash-<uid>
+    """
+
+    return f"{TRASH_NAME}-{getattr(os, 'getuid', lambda: 0)()}"
+
+
+def _same_device_ancestors(directory: Path, device: int) -> list[Path]:
+    """
+    Каталог и его родители на той же файловой системе (до точки монтирования)
+
+    Выход:
+        list[Path] - от directory вверх к корню точки монтирования
+    """
+
+    ancestors = [directory]
+    while ancestors[-1].parent != ancestors[-1] and os.stat(ancestors[-1].parent).st_dev == device:
+        ancestors.append(ancestors[-1].parent)
+    return ancestors
+
+
+def known_trash_dirs() -> list[Path]:
+    """
+    Существующие корзины: домашняя и корзины файловой системы текущего каталога
+    (в корне точки монтирования и в каталогах на пути к текущему)
+    """
+
+    candidates = [Path.home() / TRASH_NAME]
+    try:
+        cwd = Path.cwd()
+        for directory in reversed(_same_device_ancestors(cwd, os.stat(cwd).st_dev)):
+            candidates.append(directory / _mount_trash_name())
+    except OSError:
+        pass
+
+    result = []
+    for candidate in candidates:
+        if candidate not in result and candidate.is_dir():
+            result.append(candidate)
+    return result
+
+
+def move_to_trash(path: Path) -> TrashEntry:
+    """
+    Переносит элемент в корзину одним атомарным rename
+
+    Сначала создаётся запись info/<id>.trashinfo (формат freedesktop.org) с
+    исходным путём и временем удаления, затем элемент переименовывается в
+    files/<id>. Время не зависит от размера дерева.
+
+    Вход:
+        path: Path - абсолютный путь к элементу
+
+    Выход:
+        TrashEntry - запись о перенесённом элементе
+
+    Исключения:
+        OSError - ошибки создания корзины или переименования
+    """
+
+    trash_dir = trash_dir_for(path)
+    (trash_dir / "files").mkdir(parents=True, exist_ok=True)
+    (trash_dir / "info").mkdir(exist_ok=True)
+
+    deleted = datetime.now().replace(microsecond=0)
+    entry_id = f"{path.name[:200]}.{time.time_ns()}"
+    info = trash_dir / "info" / f"{entry_id}{INFO_SUFFIX}"
+    with open(info, "x", encoding="utf-8") as record:
+        record.write(f"[Trash Info]\nPath={quote(str(path))}\nDeletionDate={deleted.isoformat()}\n")
+
+    try:
+        os.rename(path, trash_dir / "files" / entry_id)
+    except OSError:
+        info.unlink()
+        raise
+    return TrashEntry(trash_dir, entry_id, path, deleted)
+
+
+def list_entries(trash_dirs: Optional[list[Path]] = None) -> list[TrashEntry]:
+    """
+    Элементы корзин в порядке удаления
+
+    Вход:
+        trash_dirs: list[Path] | None - корзины (по умолчанию known_trash_dirs())
+
+    Выход:
+        list[TrashEntry] - элементы (записи без файла и повреждённые пропускаются)
+    """
+
+    entries = []
+    for trash_dir in known_trash_dirs() if trash_dirs is None else trash_dirs:
+        try:
+            with os.scandir(trash_dir / "info") as infos:
+                names = [info.name for info in infos if info.name.endswith(INFO_SUFFIX)]
+        except OSError:
+            continue
+
+        for name in names:
+            entry = _read_info(trash_dir, name[: -len(INFO_SUFFIX)])
+            if entry is not None and os.path.lexists(trash_dir / "files" / entry.entry_id):
+                entries.append(entry)
+
+    entries.sort(key=lambda entry: (entry.deleted, entry.entry_id))
+    return entries
+
+
+def restore(entry: TrashEntry) -> None:
+    """
+    Возвращает элемент на исходное место (rename в пределах файловой системы)
+
+    Вход:
+        entry: TrashEntry - элемент корзины
+
+    Исключения:
+        FileExistsError - если по исходному пути уже что-то есть
+        OSError - ошибки переименования (например, нет родительского каталога)
+    """
+
+    if os.path.lexists(entry.original):
+        raise FileExistsError(f"'{entry.original}' already exists")
+    os.rename(entry.trash_dir / "files" / entry.entry_id, entry.original)
+    (entry.trash_dir / "info" / f"{entry.entry_id}{INFO_SUFFIX}").unlink()
+
+
+def claim_for_purge(entries: list[TrashEntry]) -> list[Path]:
+    """
+    Переносит элементы в purging/ каждой корзины - они сразу пропадают из
+    списка и не могут быть восстановлены во время удаления
+
+    Вход:
+        entries: list[TrashEntry] - элементы для удаления
+
+    Выход:
+        list[Path] - каталоги purging/, которые нужно очистить
+    """
+
+    purging_dirs: list[Path] = []
+    for entry in entries:
+        purging = entry.trash_dir / "purging"
+        purging.mkdir(exist_ok=True)
+        try:
+            os.rename(entry.trash_dir / "files" / entry.entry_id, purging / entry.entry_id)
+            (entry.trash_dir / "info" / f"{entry.entry_id}{INFO_SUFFIX}").unlink()
+        except FileNotFoundError:
+            continue
+        if purging not in purging_dirs:
+            purging_dirs.append(purging)
+    return purging_dirs
+
+
+def start_purge(purging_dirs: list[Path], rate: int = PURGE_RATE) -> subprocess.Popen[bytes]:
+    """
+    Запускает фоновый процесс очистки каталогов purging/
+
+    Процесс работает в отдельной сессии (переживает выход из оболочки) с
+    пониженным приоритетом и ограничивает темп удаления rate элементами в секунду.
+
+    Вход:
+        purging_dirs: list[Path] - каталоги для очистки
+        rate: int - элементов в секунду
+
+    Выход:
+        subprocess.Popen - запущенный процесс
+    """
+
+    return subprocess.Popen(
+        [sys.executable, "-m", "src.core.trash", "--rate", str(rate), *map(str, purging_dirs)],
+        cwd=PROJECT_ROOT,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def purge(purging_dir: Path, rate: int = PURGE_RATE) -> int:
+    """
+    Удаляет содержимое каталога purging/ с ограничением темпа
+
+    После каждых PURGE_BATCH операций unlink/rmdir процесс засыпает, если
+    опережает темп rate элементов в секунду, - удаление огромного дерева не
+    забирает весь ресурс диска у остальных процессов.
+
+    Вход:
+        purging_dir: Path - каталог purging/ корзины
+        rate: int - элементов в секунду (0 - без ограничения)
+
+    Выход:
+        int - число удалённых элементов
+    """
+
+    removed = 0
+    started = time.monotonic()
+
+    def throttle() -> None:
+        nonlocal removed
+        removed += 1
+        if rate and removed % PURGE_BATCH == 0:
+            ahead = removed / rate - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    for root, directories, files in os.walk(purging_dir, topdown=False):
+        for name in files:
+            _remove_quietly(os.unlink, os.path.join(root, name))
+            throttle()
+        for name in directories:
+            path = os.path.join(root, name)
+            _remove_quietly(os.unlink if os.path.islink(path) else os.rmdir, path)
+            throttle()
+    return removed
+
+
+def _remove_quietly(remove: Callable[[str], None], path: str) -> None:
+    """
+    Удаление в фоновом процессе: ошибку некому показать, элемент пропускается
+    и останется в purging/ до следующего trash purge
+    """
+
+    try:
+        remove(path)
+    except OSError:
+        pass
+
+
+def _read_info(trash_dir: Path, entry_id: str) -> Optional[TrashEntry]:
+    """
+    Разбор записи info/<id>.trashinfo
+
+    Выход:
+        TrashEntry | None - запись или None, если файл не читается или повреждён
+    """
+
+    try:
+        text = (trash_dir / "info" / f"{entry_id}{INFO_SUFFIX}").read_text(encoding="utf-8")
+        fields = dict(line.split("=", 1) for line in text.splitlines() if "=" in line)
+        return TrashEntry(
+            trash_dir, entry_id, Path(unquote(fields["Path"])), datetime.fromisoformat(fields["DeletionDate"])
+        )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _main(argv: list[str]) -> None:
+    """
+    Точка входа фонового процесса очистки: [--rate N] PURGING_DIR...
+    """
+
+    rate = PURGE_RATE
+    if argv[:1] == ["--rate"]:
+        rate = int(argv[1])
+        argv = argv[2:]
+
+    if hasattr(os, "nice"):
+        os.nice(10)
+    for purging_dir in argv:
+        purge(Path(purging_dir), rate)
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
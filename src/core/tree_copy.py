@@ -0,0 +1,251 @@
+import os
+import shutil
+import stat
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.core.copy_engine import CopyResult, copy_file, file_digest
+from src.core.progress import Progress
+
+COPY_WORKERS = 8
+PENDING_PER_WORKER = 64
+
+CopiedCallback = Callable[[str, str, CopyResult], None]
+
+
+class TreeCopier:
+    """
+    Параллельное копирование файлов и деревьев каталогов пулом потоков
+
+    Для дерева сначала создаётся весь скелет каталогов, затем файлы копируются
+    пулом потоков: на деревьях из множества мелких файлов время уходит на
+    задержки открытия/создания, которые хорошо распараллеливаются. Права и
+    времена каталогов переносятся в конце, после записи их содержимого.
+
+    В режиме update (cp -u) копирование идёт в существующее назначение и
+    пропускает файлы с совпадающими размером и временем изменения (или, при
+    checksum, содержимым); delete удаляет из назначения то, чего нет в источнике.
+    В режиме resume частично скопированные файлы назначения продолжаются,
+    в режиме verify каждый файл хэшируется при копировании и проверяется.
+    При symlinks символические ссылки воссоздаются, а не копируется их цель.
+    В режиме merge (mv между файловыми системами) копирование идёт в
+    существующее назначение, и все файлы заменяются без сравнения.
+
+    Результаты обрабатываются в порядке постановки задач в вызывающем потоке
+    (callback on_copied), очередь ожидающих задач ограничена.
+    """
+
+    def __init__(
+        self,
+        jobs: int = COPY_WORKERS,
+        on_copied: Optional[CopiedCallback] = None,
+        update: bool = False,
+        checksum: bool = False,
+        delete: bool = False,
+        resume: bool = False,
+        verify: bool = False,
+        symlinks: bool = False,
+        merge: bool = False,
+        progress: Optional[Progress] = None,
+    ) -> None:
+        self.on_copied = on_copied
+        self.update = update
+        self.checksum = checksum
+        self.delete = delete
+        self.resume = resume
+        self.verify = verify
+        self.symlinks = symlinks
+        self.merge = merge
+        self.progress = progress
+        self.errors: list[str] = []
+        self.skipped = 0
+        self.removed = 0
+        self._window = jobs * PENDING_PER_WORKER
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._pending: deque[tuple[str, str, Future[Optional[CopyResult]]]] = deque()
+        self._directories: list[tuple[str, str]] = []
+
+    def copy_file(self, source: str, destination: str) -> None:
+        """
+        Ставит копирование файла в очередь
+
+        Вход:
+            source: str - исходный файл
+            destination: str - путь назначения
+        """
+
+        if self.progress is not None:
+            try:
+                self.progress.add_total(os.stat(source).st_size)
+            except OSError as err:
+                self.errors.append(f"ERROR: {str(err)}")
+                return
+
+        future = self._executor.submit(self._copy_one, source, destination)
+        self._pending.append((source, destination, future))
+        while self._pending and (len(self._pending) > self._window or self._pending[0][2].done()):
+            self._collect()
+
+    def copy_tree(self, source: str, destination: str) -> None:
+        """
+        Создаёт скелет каталогов дерева и ставит копирование файлов в очередь
+
+        Вход:
+            source: str - исходный каталог
+            destination: str - каталог назначения (без update/resume/merge не должен существовать)
+
+        Исключения:
+            OSError - если не удалось прочитать источник или создать корень назначения
+        """
+
+        os.makedirs(destination, exist_ok=self.update or self.resume or self.merge)
+        stack = [(source, destination)]
+        while stack:
+            source_dir, destination_dir = stack.pop()
+            self._directories.append((source_dir, destination_dir))
+            try:
+                with os.scandir(source_dir) as entries:
+                    items = list(entries)
+                existing = self._existing(destination_dir)
+            except OSError as err:
+                self.errors.append(f"ERROR: {str(err)}")
+                continue
+
+            for item in items:
+                target = os.path.join(destination_dir, item.name)
+                current = existing.pop(item.name, None)
+                try:
+                    if self.symlinks and item.is_symlink():
+                        if current is not None:
+                            if current.is_dir(follow_symlinks=False):
+                                self._replace(current)
+                            else:
+                                os.unlink(target)
+                        os.symlink(os.readlink(item.path), target)
+                    elif item.is_dir():
+                        if current is not None and not current.is_dir(follow_symlinks=False):
+                            self._replace(current)
+                            current = None
+                        if current is None:
+                            os.mkdir(target)
+                        stack.append((item.path, target))
+                    else:
+                        if current is not None and current.is_dir(follow_symlinks=False):
+                            self._replace(current)
+                        self.copy_file(item.path, target)
+                except OSError as err:
+                    self.errors.append(f"ERROR: {str(err)}")
+
+            if self.delete:
+                for extra in existing.values():
+                    try:
+                        self._remove(extra)
+                    except OSError as err:
+                        self.errors.append(f"ERROR: {str(err)}")
+
+    def close(self) -> list[str]:
+        """
+        Дожидается всех копирований, переносит метаданные каталогов
+
+        Выход:
+            list[str] - ошибки (строки "ERROR: ...")
+        """
+
+        while self._pending:
+            self._collect()
+        self._executor.shutdown()
+
+        for source_dir, destination_dir in reversed(self._directories):
+            try:
+                shutil.copystat(source_dir, destination_dir)
+            except OSError as err:
+                self.errors.append(f"ERROR: {str(err)}")
+        self._directories.clear()
+        return self.errors
+
+    def _existing(self, directory: str) -> dict[str, os.DirEntry[str]]:
+        """
+        Содержимое каталога назначения (только в режимах update, resume и merge)
+        """
+
+        if not (self.update or self.resume or self.merge):
+            return {}
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+
+    def _replace(self, entry: os.DirEntry[str]) -> None:
+        """
+        Удаляет элемент назначения другого типа (только с delete; при merge
+        элемент другого типа не заменяется, как и при mv в пределах файловой системы)
+
+        Исключения:
+            OSError - если delete не задан или удаление не удалось
+        """
+
+        if self.merge:
+            raise OSError(f"Cannot overwrite {entry.path} with different type")
+        if not self.delete:
+            raise OSError(f"Cannot overwrite '{entry.path}' of a different type (use --delete)")
+        self._remove(entry)
+
+    def _remove(self, entry: os.DirEntry[str]) -> None:
+        """
+        Удаляет файл или каталог назначения, которого нет в источнике
+        """
+
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+        self.removed += 1
+
+    def _copy_one(self, source: str, destination: str) -> Optional[CopyResult]:
+        """
+        Копирует файл (выполняется в пуле); в режиме update сначала сравнивает
+
+        Выход:
+            CopyResult | None - результат или None, если файл не изменился
+        """
+
+        if self.update and not self._changed(source, destination):
+            if self.progress is not None:
+                self.progress.advance(os.stat(source).st_size)
+            return None
+
+        notify = self.progress.advance if self.progress is not None else None
+        return copy_file(source, destination, progress=notify, resume=self.resume, verify=self.verify)
+
+    def _changed(self, source: str, destination: str) -> bool:
+        """
+        Отличается ли файл назначения от источника: размер и время изменения,
+        при checksum - размер и содержимое
+        """
+
+        try:
+            target = os.stat(destination)
+        except FileNotFoundError:
+            return True
+
+        origin = os.stat(source)
+        if not stat.S_ISREG(target.st_mode) or origin.st_size != target.st_size:
+            return True
+        if self.checksum:
+            return file_digest(source) != file_digest(destination)
+        return origin.st_mtime_ns != target.st_mtime_ns
+
+    def _collect(self) -> None:
+        """
+        Обрабатывает результат самой старой задачи (с ожиданием)
+        """
+
+        source, destination, future = self._pending.popleft()
+        try:
+            result = future.result()
+        except OSError as err:
+            self.errors.append(f"ERROR: {str(err)}")
+            return
+        if result is None:
+            self.skipped += 1
+        elif self.on_copied is not None:
+            self.on_copied(source, destination, result)
@@ -0,0 +1,174 @@
+import errno
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+REMOVE_WORKERS = 8
+SUBTREES_PER_WORKER = 4
+SPLIT_DEPTH = 4
+
+_DIR_FLAGS = (
+    os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+)
+
+
+class RemoveResult(NamedTuple):
+    """
+    Результат удаления дерева
+
+    Поля:
+        removed: int - число удалённых элементов (файлов, ссылок и каталогов)
+        errors: list[str] - ошибки (строки "ERROR: ...")
+    """
+
+    removed: int
+    errors: list[str]
+
+
+def remove_tree(path: str, jobs: int = REMOVE_WORKERS) -> RemoveResult:
+    """
+    Параллельно удаляет дерево каталогов
+
+    Все операции идут относительно дескрипторов каталогов (unlink/rmdir с
+    dir_fd), поэтому ядро не разбирает полный путь для каждого файла, а
+    подмена каталога на ссылку во время удаления не уводит его за пределы
+    дерева. Сначала в вызывающем потоке раскрываются верхние уровни (не
+    глубже SPLIT_DEPTH), пока поддеревьев не станет jobs * SUBTREES_PER_WORKER;
+    затем поддеревья удаляются пулом потоков, а раскрытые каталоги - в конце,
+    снизу вверх. Ошибки отдельных элементов собираются, удаление продолжается.
+
+    Вход:
+        path: str - каталог (ссылка на каталог не раскрывается)
+        jobs: int - число потоков
+
+    Выход:
+        RemoveResult - число удалённых элементов и ошибки
+
+    Исключения:
+        OSError - если корень не удалось открыть как каталог
+    """
+
+    root_fd = os.open(path, _DIR_FLAGS)
+    opened: list[tuple[int, Optional[int], str]] = [(root_fd, None, path)]
+    errors: list[str] = []
+    removed = 0
+
+    try:
+        level = [root_fd]
+        subtrees: list[tuple[int, str]] = []
+        for depth in range(SPLIT_DEPTH):
+            subtrees = []
+            for directory_fd in level:
+                removed += _clear_files(directory_fd, subtrees, errors)
+            if jobs == 1 or depth == SPLIT_DEPTH - 1 or len(subtrees) >= jobs * SUBTREES_PER_WORKER:
+                break
+
+            level = []
+            for parent_fd, name in subtrees:
+                try:
+                    directory_fd = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+                except OSError as err:
+                    errors.append(f"ERROR: {str(err)}")
+                    continue
+                opened.append((directory_fd, parent_fd, name))
+                level.append(directory_fd)
+            subtrees = []
+
+        if subtrees:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for count, subtree_errors in executor.map(_remove_subtree, subtrees):
+                    removed += count
+                    errors.extend(subtree_errors)
+    finally:
+        for directory_fd, opened_parent_fd, name in reversed(opened):
+            os.close(directory_fd)
+            try:
+                if opened_parent_fd is None:
+                    os.rmdir(name)
+                else:
+                    os.rmdir(name, dir_fd=opened_parent_fd)
+                removed += 1
+            except OSError as err:
+                if err.errno != errno.ENOTEMPTY or not errors:
+                    errors.append(f"ERROR: {str(err)}")
+
+    return RemoveResult(removed, errors)
+
+
+def _clear_files(directory_fd: int, subdirectories: list[tuple[int, str]], errors: list[str]) -> int:
+    """
+    Удаляет из каталога всё, кроме подкаталогов, и собирает подкаталоги
+
+    Вход:
+        directory_fd: int - дескриптор каталога
+        subdirectories: list[tuple[int, str]] - список, в который добавляются (directory_fd, имя)
+        errors: list[str] - список, в который добавляются ошибки
+
+    Выход:
+        int - число удалённых элементов
+    """
+
+    removed = 0
+    try:
+        with os.scandir(directory_fd) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append((directory_fd, entry.name))
+                    else:
+                        os.unlink(entry.name, dir_fd=directory_fd)
+                        removed += 1
+                except OSError as err:
+                    errors.append(f"ERROR: {str(err)}")
+    except OSError as err:
+        errors.append(f"ERROR: {str(err)}")
+    return removed
+
+
+def _remove_subtree(task: tuple[int, str]) -> tuple[int, list[str]]:
+    """
+    Удаляет поддерево в одном потоке (выполняется в пуле)
+
+    Обход итеративный, открыто не больше дескрипторов, чем глубина поддерева.
+
+    Вход:
+        task: tuple[int, str] - (дескриптор родительского каталога, имя поддерева)
+
+    Выход:
+        tuple[int, list[str]] - (число удалённых элементов, ошибки)
+    """
+
+    errors: list[str] = []
+    removed = 0
+    frames: list[tuple[int, int, str, list[tuple[int, str]]]] = []
+
+    parent_fd, name = task
+    while True:
+        if name:
+            try:
+                directory_fd = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+            except OSError as err:
+                errors.append(f"ERROR: {str(err)}")
+            else:
+                subdirectories: list[tuple[int, str]] = []
+                removed += _clear_files(directory_fd, subdirectories, errors)
+                frames.append((directory_fd, parent_fd, name, subdirectories))
+
+        if not frames:
+            break
+        directory_fd, parent_fd, name, subdirectories = frames[-1]
+        if subdirectories:
+            parent_fd, name = subdirectories.pop()
+            continue
+
+        frames.pop()
+        os.close(directory_fd)
+        try:
+            os.rmdir(name, dir_fd=parent_fd)
+            removed += 1
+        except OSError as err:
+            if err.errno != errno.ENOTEMPTY or not errors:
+                errors.append(f"ERROR: {str(err)}")
+        name = ""
+
+    return removed, errors
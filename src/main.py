@@ -1,25 +1,99 @@
+import argparse
 import sys
 import os
+import shlex
+import time
+from typing import Iterable, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import cv2
-from core.parser import parse_command, route_command
-from core.logger import setup_logging, log_command
-from commands.ls import ls
-from commands.zip_tar import zippig, unzipping, tarring, untarring
-from commands.cd import cd
-from commands.cat import cat
-from commands.cp import cp
-from commands.mv import mv
-from commands.rm import rm
+from src.core.parser import parse_command, route_command, split_commands
+from src.core.logger import setup_logging, shutdown_logging, log_command
+from src.core.registry import COMMAND_TABLE, get_command
+from src.core import stats as shell_stats
+from src.core import session
 
 
-def main() -> None:
+def main(argv: Optional[list[str]] = None) -> int:
     """
     Главная функция мини-оболочки
+
+    Вход:
+        argv: list[str] | None - аргументы командной строки (по умолчанию sys.argv[1:])
+
+    Выход:
+        int - код завершения (0 - все команды успешны, 1 - были ошибки, 2 - ошибка запуска)
+    """
+    options = _parse_main_args(sys.argv[1:] if argv is None else argv)
+    setup_logging(background=True)
+
+    try:
+        if options.profile:
+            from src.core.profiler import profile_call  # cProfile/pstats/tracemalloc - только по запросу
+
+            status, report = profile_call(_run, options, dump=options.profile_dump)
+            print(report, file=sys.stderr)
+            return int(status)
+        return _run(options)
+    finally:
+        shutdown_logging()
+
+
+def _run(options: argparse.Namespace) -> int:
+    """
+    Выбор режима работы по аргументам запуска
+
+    Вход:
+        options: argparse.Namespace - разобранные аргументы запуска
+
+    Выход:
+        int - код завершения
+    """
+
+    if options.command is not None:
+        return run_batch(split_commands(options.command))
+
+    if options.script is not None:
+        try:
+            with open(options.script, encoding="utf-8") as script:
+                return run_batch(script)
+        except OSError as err:
+            print(f"ERROR: {err}", file=sys.stderr)
+            return 2
+
+    if not options.interactive and not sys.stdin.isatty():
+        return run_batch(sys.stdin)
+
+    run_interactive()
+    return 0
+
+
+def _parse_main_args(argv: list[str]) -> argparse.Namespace:
+    """
+    Парсинг аргументов запуска оболочки
+
+    Вход:
+        argv: list[str] - аргументы командной строки
+
+    Выход:
+        argparse.Namespace - command, script, interactive, profile, profile_dump
+    """
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Dev1lan's Shell")
+    parser.add_argument("-c", dest="command", help="выполнить команды, разделённые ';', и выйти")
+    parser.add_argument("-i", dest="interactive", action="store_true",
+                        help="интерактивный режим, даже если stdin не терминал")
+    parser.add_argument("--profile", action="store_true",
+                        help="профилировать весь сеанс (cProfile + tracemalloc), отчёт в stderr")
+    parser.add_argument("--profile-dump", metavar="FILE", help="сохранить профиль сеанса в .pstats")
+    parser.add_argument("script", nargs="?", help="файл со скриптом команд")
+    return parser.parse_args(argv)
+
+
+def run_interactive() -> None:
+    """
+    Интерактивный цикл оболочки с приглашением
     """
-    setup_logging()
 
     print("<<< Dev1lan's Shell >>>\n")
     print("Доступные команды: ls, cd, cat, cp, mv, rm")
@@ -30,41 +104,163 @@ def main() -> None:
 
     while True:
         try:
-            user_input = input("\033[92mdev-1-lan:~₽\033[0m ").strip()
-            parsed_data = parse_command(user_input)
-
-            if parsed_data is None:
-                none_data_input_count += 1
-                if none_data_input_count == 20:
-                    print("Хватит уже просто нажимать на Enter!!!")
-                    none_data_input_count = 0
-                    continue
-                else:
-                    continue
-
-            else:
+            user_input = input("\033[92mdev-1-lan:~₽\033[0m ")
+        except EOFError:
+            print("\nВыход из мини-оболочки")
+            break
+
+        if parse_command(user_input) is None:
+            none_data_input_count += 1
+            if none_data_input_count == 20:
+                print("Хватит уже просто нажимать на Enter!!!")
                 none_data_input_count = 0
-                command_pass, args_pass, raw_input = parsed_data
-                log_command(raw_input)
-                module, cmd_name, cmd_args, orig_input = route_command(parsed_data)
+            continue
+
+        none_data_input_count = 0
+        outcome = execute_line(user_input)
+        if outcome is None:
+            print("Выход из мини-оболочки")
+            break
+
+        result, _ = outcome
+        if result is not None:
+            print(result)
+
+
+def run_batch(lines: Iterable[str]) -> int:
+    """
+    Неинтерактивное выполнение команд (без приглашения и баннера)
+
+    Команды не запрашивают подтверждение: stdin может быть источником команд,
+    и ответ на запрос поглотил бы следующую строку скрипта.
+
+    Вход:
+        lines: Iterable[str] - строки с командами (из -c, файла скрипта или stdin)
+
+    Выход:
+        int - 0 если все команды успешны, 1 если хотя бы одна завершилась ошибкой
+    """
+
+    status = 0
+    interactive = session.is_interactive()
+    session.set_interactive(False)
+    try:
+        for line in lines:
+            user_input = line.strip()
+            if not user_input or user_input.startswith("#"):
+                continue
+
+            outcome = execute_line(user_input)
+            if outcome is None:
+                break
+
+            result, success = outcome
+            if result is not None:
+                print(result)
+            if not success:
+                status = 1
+    finally:
+        session.set_interactive(interactive)
+
+    return status
 
-                if cmd_name == "exit":
-                    print("Выход из мини-оболочки")
-                    break
 
-                if cmd_name == "mai":
-                    koteki()
+def execute_line(user_input: str) -> Optional[tuple[Optional[str], bool]]:
+    """
+    Разбор, логирование и выполнение одной строки ввода
+
+    Вход:
+        user_input: str - строка ввода
+
+    Выход:
+        tuple[str | None, bool] | None - (результат для вывода, успех) или None для exit
+    """
 
-                result = do_command(module, cmd_name, cmd_args, orig_input)
+    parsed_data = parse_command(user_input)
+    if parsed_data is None:
+        return (None, True)
 
-                if result is not None:
-                    print(result)
+    raw_input = parsed_data[2]
+    try:
+        log_command(raw_input)
+        module, cmd_name, cmd_args, orig_input = route_command(parsed_data)
 
-        except Exception as err:
-            err_msg = f"Критическая ошибка: {err}"
-            print(err_msg)
-            if "raw_input" in locals():
-                log_command(raw_input, False, err_msg)
+        if cmd_name == "exit":
+            return None
+
+        if cmd_name == "mai":
+            koteki()
+
+        if cmd_name == "profile":
+            return _profile_command(cmd_args, orig_input)
+
+        if cmd_name == "parse_error":
+            err_msg = f"ERROR: {cmd_args[0]}"
+            log_command(raw_input, False, err_msg)
+            return (err_msg, False)
+
+        result = do_command(module, cmd_name, cmd_args, orig_input)
+        return (result, _is_success(cmd_name, result))
+
+    except Exception as err:
+        err_msg = f"Критическая ошибка: {err}"
+        log_command(raw_input, False, err_msg)
+        return (err_msg, False)
+
+
+def _is_success(cmd_name: str, result: Optional[str]) -> bool:
+    """
+    Проверка успешности выполнения команды по её результату
+
+    Вход:
+        cmd_name: str - название команды после маршрутизации
+        result: str | None - результат выполнения
+
+    Выход:
+        bool - False для неизвестной команды, результата с ошибкой или отменённой операции
+    """
+
+    return cmd_name != "unknown" and not (result is not None and result.startswith(("ERROR", "Cancelled")))
+
+
+def _profile_command(args: list[str], raw_input: str) -> tuple[Optional[str], bool]:
+    """
+    Команда profile - выполнение другой команды под cProfile и tracemalloc
+
+    Вход:
+        args: list[str] - ["--top", "20", "--dump", "ls.pstats", "ls", "-l"] | ["cat", "file.txt"]
+        raw_input: str - оригинальная строка ввода
+
+    Выход:
+        tuple[str | None, bool] - (результат команды и отчёт профилирования, успех)
+    """
+
+    top = 15
+    dump = None
+    while len(args) >= 2 and args[0] in ("--top", "--dump"):
+        if args[0] == "--top":
+            if not args[1].isdigit():
+                return (f"ERROR: Invalid value for --top: {args[1]}", False)
+            top = int(args[1])
+        else:
+            dump = args[1]
+        args = args[2:]
+
+    if not args:
+        return ("ERROR: 'profile' requires a command", False)
+
+    inner_input = shlex.join(args)
+    module, cmd_name, cmd_args, _ = route_command((args[0], args[1:], inner_input))
+    if cmd_name in ("exit", "mai", "profile"):
+        return (f"ERROR: Cannot profile '{args[0]}'", False)
+
+    from src.core.profiler import profile_call  # cProfile/pstats/tracemalloc - только по запросу
+
+    result, report = profile_call(
+        do_command, module, cmd_name, cmd_args, inner_input, top=top, dump=dump
+    )
+    output = report if result is None else f"{result}\n{report}"
+    return (output, _is_success(cmd_name, result))
 
 
 def do_command(module: str, command: str, args: list[str], raw_input: str) -> str | None:
@@ -81,27 +277,21 @@ def do_command(module: str, command: str, args: list[str], raw_input: str) -> st
         str | None - результат выполнения команды или None
     """
 
-    commands_map = {
-        "ls": lambda: ls(args),
-        "cat": lambda: cat(args),
-        "cd": lambda: cd(args),
-        "cp": lambda: cp(args),
-        "mv": lambda: mv(args),
-        "rm": lambda: rm(args),
-        "zip": lambda: zippig(args),
-        "unzip": lambda: unzipping(args),
-        "tar": lambda: tarring(args),
-        "untar": lambda: untarring(args),
-    }
-
-    error_log_commands = {"cd", "cp", "mv", "rm"}
+    spec = COMMAND_TABLE.get(command)
+    handler = get_command(command) if spec is not None else None
 
-    if command in commands_map:
-        result = commands_map[command]()
+    if spec is not None and handler is not None:
+        shell_stats.begin()
+        start = time.perf_counter()
+        result = handler(args)
+        sample = shell_stats.record(command, time.perf_counter() - start)
 
-        if command in error_log_commands and result is not None:
+        if spec.log_errors and result is not None and str(result).startswith("ERROR"):
             log_command(raw_input, False, result)
 
+        if shell_stats.log_enabled():
+            log_command(shell_stats.format_sample(sample))
+
         return str(result) if result is not None else None
 
     elif module == "core" and command == "unknown":
@@ -116,6 +306,8 @@ def koteki() -> None:
     """
     Функция для воспроизведения видео cats.mp4
     """
+    import cv2  # тяжёлый импорт (OpenCV) - только по запросу, чтобы не замедлять запуск
+
     video_path = "cats.mp4"
     cap = cv2.VideoCapture(video_path)
     print("Воспроизведение видео cats.mp4. \nНажмите 'q' для выхода.")
@@ -133,4 +325,4 @@ def koteki() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
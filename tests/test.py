@@ -1,8 +1,13 @@
+import io
 import unittest
 import tempfile
 import os
 import shutil
+import errno
+import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch
 
@@ -12,14 +17,27 @@ sys.path.insert(0, str(src_path))
 
 from src.commands.ls import ls
 from src.commands.cd import cd
-from src.commands.cat import cat
+from src.commands.cat import cat, is_binary
+from src.commands.head_tail import head, tail, _follow
+from src.commands.grep import grep
 from src.commands.cp import cp
 from src.commands.mv import mv
+from src.core.tree_remove import remove_tree
+from src.commands.trash import trash
+from src.core import trash as trash_store
 from src.commands.rm import rm
 from src.commands.zip_tar import zippig, unzipping, tarring, untarring
-from src.core.parser import parse_command, route_command
-from src.core.logger import setup_logging, log_command
+from src.core.parser import parse_command, route_command, split_commands
+from src.core.logger import setup_logging, shutdown_logging, log_command
+from src.core import logger as logger_module
 from src.core.path_utils import resolve_path, is_safe_path
+from src.core.registry import COMMAND_TABLE, get_command, is_loaded
+from src.core.dirtable import DirTable, NUMPY_THRESHOLD
+from src.core.listing_cache import ListingCache
+from src.core import copy_engine
+from src.core.progress import Progress
+from src.core import stats as shell_stats
+from src.main import do_command, execute_line
 
 
 class Test_MiniShell(unittest.TestCase):
@@ -114,8 +132,10 @@ class Test_MiniShell(unittest.TestCase):
         self.assertTrue("ERROR" in str(result))
 
     def test_cat_file(self) -> None:
-        result = cat(["file1.txt"])
-        self.assertIn("Hello World", result)
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = cat(["file1.txt"])
+        self.assertIsNone(result)
+        self.assertIn("Hello World", output.getvalue())
 
     def test_cat_nonexistent(self) -> None:
         result = cat(["nonexistent.txt"])
@@ -423,6 +443,820 @@ class Test_MiniShell(unittest.TestCase):
         result = rm(["-r", "/"])
         self.assertIn("ERROR", str(result))
 
+    def test_registry_get_command(self) -> None:
+        """Тест реестра команд с ленивой загрузкой"""
+        handler = get_command("ls")
+        self.assertIs(handler, ls)
+        self.assertTrue(is_loaded("ls"))
+        self.assertIsNone(get_command("unknown_cmd"))
+
+    def test_startup_skips_heavy_imports(self) -> None:
+        """Тест: запуск оболочки не импортирует cv2 и модули команд"""
+        code = (
+            "import sys; sys.path.insert(0, 'src'); import main; "
+            "print('cv2' in sys.modules, 'src.commands.cp' in sys.modules)"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True
+        )
+        self.assertEqual(completed.stdout.strip(), "False False")
+
+    def test_route_command_aliases(self) -> None:
+        """Тест маршрутизации псевдонимов EXIT/MAI через таблицу команд"""
+        self.assertEqual(route_command(("EXIT", [], "EXIT")), ("core", "exit", [], "EXIT"))
+        self.assertEqual(route_command(("MAI", [], "MAI")), ("core", "mai", [], "MAI"))
+
+    def test_command_table_handlers(self) -> None:
+        """Тест: каждая команда с модулем в таблице имеет обработчик"""
+        for name, spec in COMMAND_TABLE.items():
+            if spec.module is not None:
+                self.assertTrue(callable(get_command(name)), name)
+        self.assertIsNone(get_command("exit"))
+
+    def test_split_commands(self) -> None:
+        """Тест разбиения строки на команды по ';' вне кавычек"""
+        result = split_commands("ls -l; cat 'a;b'\ncd ..;;")
+        self.assertEqual(result, ["ls -l", "cat 'a;b'", "cd .."])
+
+    def test_batch_mode_command_string(self) -> None:
+        """Тест пакетного режима -c: без баннера, с кодом завершения"""
+        main_path = str(src_path / "main.py")
+        completed = subprocess.run(
+            [sys.executable, main_path, "-c", "cat file2.txt; exit; cat file1.txt"],
+            capture_output=True, text=True, stdin=subprocess.DEVNULL,
+        )
+        self.assertEqual(completed.returncode, 0)
+        self.assertEqual(completed.stdout.strip(), "Another file")
+
+        completed = subprocess.run(
+            [sys.executable, main_path], input="ls\nunknown_cmd\n", capture_output=True, text=True
+        )
+        self.assertEqual(completed.returncode, 1)
+        self.assertIn("file1.txt", completed.stdout)
+        self.assertNotIn("Dev1lan's Shell", completed.stdout)
+
+    def test_batch_mode_rm_does_not_prompt(self) -> None:
+        """Тест пакетного режима: rm -r не читает ответ из stdin со скриптом"""
+        main_path = str(src_path / "main.py")
+        completed = subprocess.run(
+            [sys.executable, main_path], input="rm -r subdir\ncat file2.txt\n", capture_output=True, text=True
+        )
+        self.assertEqual(completed.returncode, 1)
+        self.assertIn("use -f", completed.stdout)
+        self.assertIn("Another file", completed.stdout)
+        self.assertTrue(Path("subdir").exists())
+
+        completed = subprocess.run(
+            [sys.executable, main_path, "-c", "rm -r -f subdir"], capture_output=True, text=True,
+            stdin=subprocess.DEVNULL,
+        )
+        self.assertEqual(completed.returncode, 0)
+        self.assertFalse(Path("subdir").exists())
+
+    def test_logging_background_flush_on_shutdown(self) -> None:
+        """Тест фоновой записи лога: всё записано после shutdown_logging"""
+        setup_logging(str(self.log_file), background=True, flush_interval=60.0)
+        for i in range(10):
+            log_command(f"ls {i}")
+        log_command("cd nowhere", False, "no dir")
+        shutdown_logging()
+
+        lines = self.log_file.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 11)
+        self.assertTrue(lines[0].endswith("] ls 0"))
+        self.assertTrue(lines[-1].endswith("cd nowhere - ERROR: no dir"))
+
+    def test_logging_rotation(self) -> None:
+        """Тест ротации лога по размеру"""
+        setup_logging(str(self.log_file), background=True, max_bytes=200, backup_count=2)
+        for i in range(50):
+            log_command(f"command number {i}")
+        shutdown_logging()
+
+        self.assertTrue(Path(f"{self.log_file}.1").exists())
+        self.assertLessEqual(self.log_file.stat().st_size, 200)
+
+    def test_logging_background_survives_write_error(self) -> None:
+        """Тест фоновой записи лога: ошибка записи пачки не останавливает поток"""
+        setup_logging(str(self.log_file), background=True, batch_size=1)
+        writer = logger_module._writer
+        write_batch = writer._write_batch
+        failures = [OSError(errno.ENOSPC, "No space left on device")]
+
+        def flaky(batch: list) -> None:
+            if failures:
+                raise failures.pop()
+            write_batch(batch)
+
+        with patch.object(writer, "_write_batch", side_effect=flaky), \
+                patch.object(writer.handler, "handleError") as handle_error:
+            log_command("lost")
+            log_command("kept")
+            shutdown_logging()
+
+        handle_error.assert_called_once()
+        self.assertFalse(writer.is_alive())
+        self.assertTrue(self.log_file.read_text(encoding="utf-8").endswith("] kept\n"))
+
+    def test_stats_records_command_timing(self) -> None:
+        """Тест замеров команд в do_command и вывода builtin stats"""
+        shell_stats.reset()
+        do_command("file_ops", "cp", ["file1.txt", "copy.txt"], "cp file1.txt copy.txt")
+        do_command("file_ops", "ls", [], "ls")
+
+        summary = shell_stats.summary()
+        size = Path("file1.txt").stat().st_size
+        self.assertEqual(summary["cp"]["count"], 1)
+        self.assertEqual(summary["cp"]["bytes_written"], size)
+        self.assertGreater(summary["ls"]["entries"], 0)
+
+        table = do_command("core", "stats", [], "stats")
+        self.assertIn("p95", str(table))
+        self.assertIn("cp", str(table))
+        self.assertIn("Latency histogram", str(do_command("core", "stats", ["--hist", "cp"], "")))
+
+    def test_stats_percentiles(self) -> None:
+        """Тест перцентилей по методу ближайшего ранга"""
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(shell_stats.percentile(values, 0.50), 50.0)
+        self.assertEqual(shell_stats.percentile(values, 0.99), 99.0)
+        self.assertEqual(shell_stats.percentile([], 0.5), 0.0)
+
+    def test_profile_command(self) -> None:
+        """Тест команды profile: результат команды, отчёт и .pstats файл"""
+        output, success = execute_line("profile --top 5 --dump out.pstats ls")
+        self.assertTrue(success)
+        self.assertIn("file1.txt", output)
+        self.assertIn("peak memory", output)
+        self.assertIn("cumulative", output)
+        self.assertTrue(Path("out.pstats").exists())
+
+        output, success = execute_line("profile")
+        self.assertFalse(success)
+        self.assertIn("ERROR", output)
+
+    def test_ls_detailed_types_and_broken_link(self) -> None:
+        """Тест ls -l: директории помечены '/', битая ссылка не ломает вывод"""
+        if os.name != 'nt':
+            os.symlink("missing_target", "broken_link")
+        result = ls(["-l"])
+        lines = result.split("\n")
+        self.assertTrue(any(line.startswith("d") and line.endswith("subdir/") for line in lines))
+        self.assertTrue(any(line.startswith("-") and line.endswith("file1.txt") for line in lines))
+        if os.name != 'nt':
+            self.assertTrue(any(line.endswith("broken_link") for line in lines))
+
+    def test_ls_streaming_unsorted(self) -> None:
+        """Тест потокового ls -f: вывод пишется в stdout, ls возвращает None"""
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = ls(["-f"])
+        self.assertIsNone(result)
+        names = output.getvalue().splitlines()
+        self.assertIn("file1.txt", names)
+        self.assertEqual(len(names), len(os.listdir(".")))
+
+    def test_ls_limit_and_page(self) -> None:
+        """Тест постраничного вывода ls --limit/--page"""
+        everything = ls([]).split("\n")
+        self.assertEqual(ls(["--limit", "2"]).split("\n"), everything[:2])
+        self.assertEqual(ls(["--limit", "2", "--page", "2"]).split("\n"), everything[2:4])
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            ls(["-f", "--limit", "3"])
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+
+        self.assertIn("ERROR", ls(["--limit", "zero"]))
+        self.assertIn("ERROR", ls(["--page", "2"]))
+
+    def test_ls_recursive(self) -> None:
+        """Тест ls -R: порядок обхода в глубину и одинаковый вывод при любом числе потоков"""
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = ls(["-R", "--jobs", "4", "subdir"])
+        self.assertIsNone(result)
+        text = output.getvalue()
+        root = str(Path(self.test_dir) / "subdir")
+        self.assertTrue(text.startswith(f"{root}:\n"))
+        self.assertLess(text.index(f"{root}:"), text.index(f"{root}/deep:"))
+        self.assertIn("deep_file.txt", text)
+
+        with patch('sys.stdout', new_callable=io.StringIO) as serial:
+            ls(["-R", "--jobs", "1", "subdir"])
+        self.assertEqual(text, serial.getvalue())
+
+    def test_ls_recursive_bounded_read_ahead(self) -> None:
+        """Тест ls -R: чтение каталогов опережает вывод не больше чем на окно задач"""
+        from src.commands import ls as ls_module
+
+        for number in range(40):
+            Path("wide", f"d{number:02d}", "inner").mkdir(parents=True)
+        scan = ls_module._scan_directory
+        scanned = []
+        ahead = []
+
+        def counting_scan(*args):
+            scanned.append(args[0])
+            return scan(*args)
+
+        def counting_flush(batch):
+            ahead.append(len(scanned) - len(ahead))
+            batch.clear()
+
+        with patch.object(ls_module, "_scan_directory", side_effect=counting_scan), \
+                patch.object(ls_module, "_flush_lines", side_effect=counting_flush):
+            self.assertIsNone(ls(["-R", "--jobs", "2", "wide"]))
+        self.assertEqual(len(ahead), 81)
+        self.assertLessEqual(max(ahead), 2 * ls_module.READ_AHEAD_PER_WORKER + 1)
+
+    def test_ls_recursive_depth(self) -> None:
+        """Тест ограничения глубины ls -R --depth"""
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            ls(["-R", "--depth", "0", "subdir"])
+        self.assertNotIn("deep_file.txt", output.getvalue())
+        self.assertIn("ERROR", ls(["--depth", "1"]))
+
+    def test_ls_sort_by_size_and_mtime(self) -> None:
+        """Тест ls -S, ls -t и ls --top N"""
+        sizes = {"small.bin": 1, "medium.bin": 500, "large.bin": 9000}
+        for offset, (name, size) in enumerate(sizes.items()):
+            Path(name).write_bytes(b"x" * size)
+            os.utime(name, (1_000_000 + offset, 1_000_000 + offset))
+
+        by_size = ls(["-S"]).split("\n")
+        self.assertLess(by_size.index("large.bin"), by_size.index("medium.bin"))
+        self.assertLess(by_size.index("medium.bin"), by_size.index("small.bin"))
+
+        self.assertEqual(ls(["--top", "1"]), "large.bin")
+        by_mtime = ls(["-t"]).split("\n")
+        self.assertEqual(by_mtime[-3:], ["large.bin", "medium.bin", "small.bin"])
+        self.assertIn("ERROR", ls(["-S", "-f"]))
+
+    def test_dirtable_order_by(self) -> None:
+        """Тест колоночной таблицы каталога: top-k и полная сортировка"""
+        table = DirTable()
+        for index, size in enumerate([5, 40, 10, 40, 1]):
+            table.append(f"item{index}", False, size, float(index))
+        self.assertEqual(table.order_by("size"), [1, 3, 2, 0, 4])
+        self.assertEqual(table.order_by("size", top=2), [1, 3])
+        self.assertEqual(table.order_by("mtime", top=1), [4])
+        self.assertEqual(table.name(2), "item2")
+
+        large = DirTable()
+        for index in range(NUMPY_THRESHOLD):
+            large.append(f"item{index}", False, index % 3, 0.0)
+        self.assertEqual(large.order_by("size", top=5), [2, 5, 8, 11, 14])
+
+    def test_ls_cache_matches_fresh_listing(self) -> None:
+        """Тест ls --cache: после изменений каталога вывод совпадает с обычным ls"""
+        self.assertEqual(ls(["--cache", "-l"]), ls(["-l"]))
+
+        Path("new_file.txt").write_text("fresh")
+        Path("file2.txt").unlink()
+        Path("file1.txt").write_text("changed size of the file")
+
+        self.assertEqual(ls(["--cache", "-l"]), ls(["-l"]))
+        self.assertEqual(ls(["--cache"]), ls([]))
+        self.assertIn("ERROR", ls(["--cache", "-R"]))
+
+    def test_listing_cache_mtime_fallback(self) -> None:
+        """Тест кэша листингов без inotify (проверка по mtime каталога)"""
+        cache = ListingCache(use_inotify=False)
+        names = [entry.name for entry in cache.listing(self.test_dir, need_stat=False)]
+        self.assertIn("file1.txt", names)
+
+        Path("file1.txt").write_text("a much longer content than before")
+        entries = {entry.name: entry for entry in cache.listing(self.test_dir, need_stat=True)}
+        self.assertEqual(entries["file1.txt"].size, Path("file1.txt").stat().st_size)
+
+        os.mkdir("created_dir")
+        entries = {entry.name: entry for entry in cache.listing(self.test_dir, need_stat=True)}
+        self.assertTrue(entries["created_dir"].is_dir)
+        cache.close()
+
+    def test_cat_streams_multiple_files(self) -> None:
+        """Тест потокового cat нескольких файлов, включая многобайтовые символы на границе блока"""
+        text = "я" * 700_000
+        Path("unicode.txt").write_text(text, encoding="utf-8")
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = cat(["file2.txt", "unicode.txt", "missing.txt"])
+        self.assertIn("ERROR", str(result))
+        self.assertIn("missing.txt", str(result))
+        self.assertEqual(output.getvalue(), "Another file\n" + text + "\n")
+
+    def test_cat_binary_sniffing(self) -> None:
+        """Тест: бинарный файл распознаётся по первому блоку, до чтения остального"""
+        with open("big.bin", "wb") as handle:
+            handle.write(b"\x00\x01\x02" + b"text" * 1000)
+            handle.truncate(64 * 1024 * 1024)
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = cat(["big.bin"])
+        self.assertIn("BINARY FILE", str(result))
+        self.assertEqual(output.getvalue(), "")
+
+        self.assertTrue(is_binary(b"\x00abc"))
+        self.assertTrue(is_binary(b"\xff\xfe\xfa"))
+        self.assertFalse(is_binary("привет\n".encode("utf-8")))
+        self.assertFalse(is_binary("привет".encode("utf-8")[:-1]))
+
+    def test_cat_hexdump(self) -> None:
+        """Тест потокового hexdump бинарного файла"""
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = cat(["--hexdump", "binary_file.bin"])
+        self.assertIsNone(result)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], "00000000  89 50 4e 47 0d 0a 1a 0a  00 00 00 0d 49 48 44 52  |.PNG........IHDR|"
+        )
+        self.assertEqual(lines[-1], "00000010")
+
+    def test_head_tail_lines(self) -> None:
+        """Тест head и tail -n, включая несколько файлов"""
+        Path("numbers.txt").write_text("".join(f"{number}\n" for number in range(1, 100_001)))
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(head(["-n", "3", "numbers.txt"]))
+            self.assertIsNone(tail(["-n", "3", "numbers.txt"]))
+        self.assertEqual(output.getvalue(), "1\n2\n3\n99998\n99999\n100000\n")
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(tail(["file1.txt"]))
+            result = head(["-n", "1", "file1.txt", "missing.txt"])
+        self.assertEqual(output.getvalue(), "Hello World!\nLine 2\n==> file1.txt <==\nHello World!\n")
+        self.assertIn("missing.txt", str(result))
+        self.assertIn("ERROR", head(["-n", "x", "file1.txt"]))
+        self.assertIn("ERROR", head(["-f", "file1.txt"]))
+
+    def test_head_tail_incomplete_last_line(self) -> None:
+        """Тест head и tail: перевод строки в конце вывода, обрезанный символ UTF-8 заменяется"""
+        Path("cut.txt").write_bytes("строка\nконец".encode("utf-8") + "ж".encode("utf-8")[:1])
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(head(["cut.txt"]))
+            self.assertIsNone(tail(["-n", "1", "cut.txt"]))
+        self.assertEqual(output.getvalue(), "строка\nконец\ufffd\nконец\ufffd\n")
+
+    def test_tail_reads_from_end(self) -> None:
+        """Тест: tail читает блоки с конца, объём чтения не зависит от размера файла"""
+        with open("big.txt", "wb") as handle:
+            handle.write(b"x\n" * 4_000_000)
+        shell_stats.begin()
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            tail(["-n", "5", "big.txt"])
+        self.assertEqual(output.getvalue(), "x\n" * 5)
+        sample = shell_stats.record("tail", 0.0)
+        self.assertLess(sample.bytes_read, 1024 * 1024)
+
+    def test_tail_follow(self) -> None:
+        """Тест tail -f: дописанные в файл данные выводятся до остановки"""
+        Path("growing.log").write_text("old\n")
+        stop = threading.Event()
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            follower = threading.Thread(
+                target=_follow, args=(Path("growing.log"), Path("growing.log").stat().st_size, stop)
+            )
+            follower.start()
+            with open("growing.log", "a") as handle:
+                handle.write("new line\n")
+            deadline = time.monotonic() + 5
+            while "new line" not in output.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop.set()
+            follower.join(timeout=5)
+        self.assertFalse(follower.is_alive())
+        self.assertEqual(output.getvalue(), "new line\n")
+
+    def test_grep_file(self) -> None:
+        """Тест grep по файлу: -n, -i, -c и некорректный шаблон"""
+        Path("app.log").write_text("start\nERROR disk full\nok\nerror: timeout\n")
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(grep(["-n", "ERROR", "app.log"]))
+            self.assertIsNone(grep(["-ic", "error", "app.log"]))
+            self.assertIsNone(grep(["^ok$", "app.log", "file1.txt"]))
+        self.assertEqual(output.getvalue(), "2:ERROR disk full\n2\napp.log:ok\n")
+
+        self.assertIn("Invalid pattern", grep(["(", "app.log"]))
+        self.assertIn("use -r", grep(["ok", "subdir"]))
+        self.assertIn("ERROR", grep(["ok"]))
+
+    def test_grep_recursive_parallel(self) -> None:
+        """Тест grep -r: пул процессов, порядок вывода по обходу, -l и бинарные файлы"""
+        for number in range(12):
+            Path("logs", f"part{number % 3}").mkdir(parents=True, exist_ok=True)
+            Path("logs", f"part{number % 3}", f"{number:02d}.log").write_text(f"line\nhit {number}\n")
+        Path("logs", "data.bin").write_bytes(b"\x00\x01hit")
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(grep(["-rn", "--jobs", "2", "hit", "logs"]))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "Binary file logs/data.bin matches")
+        self.assertEqual(lines[1], os.path.join("logs", "part0", "00.log") + ":2:hit 0")
+        self.assertEqual(len(lines), 13)
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            grep(["-rl", "hit 1", "logs"])
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [os.path.join("logs", "part1", "01.log"), os.path.join("logs", "part1", "10.log"),
+             os.path.join("logs", "part2", "11.log")],
+        )
+
+    def test_grep_ignore_case_non_ascii(self) -> None:
+        """Тест grep -i с не-ASCII шаблоном: регистр сворачивается и для кириллицы"""
+        Path("app.log").write_text("старт\nошибка диска\nок\nОшибка сети\n", encoding="utf-8")
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(grep(["-in", "ОШИБКА", "app.log"]))
+            self.assertIsNone(grep(["-ic", "ошибка", "app.log"]))
+            self.assertIsNone(grep(["-c", "ОШИБКА", "app.log"]))
+        self.assertEqual(output.getvalue(), "2:ошибка диска\n4:Ошибка сети\n2\n0\n")
+
+    def test_copy_engine_fallbacks(self) -> None:
+        """Тест движка копирования: при неподдерживаемом способе используется следующий"""
+        data = os.urandom(300_000)
+        Path("source.bin").write_bytes(data)
+        os.chmod("source.bin", 0o640)
+
+        unsupported = OSError(errno.EXDEV, "cross-device")
+        with patch.object(copy_engine, "_reflink", return_value=False), \
+                patch("os.copy_file_range", side_effect=unsupported, create=True):
+            result = copy_engine.copy_file("source.bin", "sendfile.bin")
+        self.assertEqual(result, copy_engine.CopyResult("sendfile", len(data)))
+
+        with patch.object(copy_engine, "_reflink", return_value=False), \
+                patch("os.copy_file_range", side_effect=unsupported, create=True), \
+                patch("os.sendfile", side_effect=OSError(errno.EINVAL, "invalid")):
+            result = copy_engine.copy_file("source.bin", "userspace.bin")
+        self.assertEqual(result.method, "userspace")
+
+        for name in ("sendfile.bin", "userspace.bin"):
+            self.assertEqual(Path(name).read_bytes(), data)
+            self.assertEqual(os.stat(name).st_mode & 0o777, 0o640)
+        self.assertEqual(copy_engine.copy_file("empty.txt", "empty_copy.txt").size, 0)
+
+    def test_copy_engine_same_file(self) -> None:
+        """Тест движка копирования: ссылка на источник не перезаписывается"""
+        os.symlink("file1.txt", "link.txt")
+        os.link("file1.txt", "hard.txt")
+        for destination in ("link.txt", "hard.txt"):
+            with self.assertRaises(shutil.SameFileError):
+                copy_engine.copy_file("file1.txt", destination)
+        self.assertEqual(Path("file1.txt").read_text(), "Hello World!\nLine 2")
+        self.assertIn("same file", str(cp(["file1.txt", "link.txt"])))
+
+    def test_cp_tree_with_fifo(self) -> None:
+        """Тест cp -r: именованный канал даёт ошибку, а не зависание"""
+        if not hasattr(os, "mkfifo"):
+            self.skipTest("mkfifo is not available")
+        os.mkfifo(Path("subdir", "pipe"))
+        with self.assertRaises(shutil.SpecialFileError):
+            copy_engine.copy_file(Path("subdir", "pipe"), "pipe_copy")
+        result = cp(["-r", "subdir", "subdir_copy"])
+        self.assertIn("is not a regular file", str(result))
+        self.assertEqual(Path("subdir_copy", "nested.txt").read_text(), "Nested content")
+
+    def test_cp_verbose_reports_method(self) -> None:
+        """Тест cp -v: для каждого файла выводится способ копирования"""
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            result = cp(["-rv", "subdir", "subdir_copy"])
+        self.assertIsNone(result)
+        self.assertEqual(Path("subdir_copy/nested.txt").read_text(), "Nested content")
+        self.assertRegex(
+            output.getvalue(), r"nested\.txt' \((reflink|copy_file_range|sendfile|userspace)\)\n"
+        )
+
+    def test_cp_parallel_tree(self) -> None:
+        """Тест параллельного cp -r -j: скелет, метаданные каталогов и сбор ошибок"""
+        for number in range(40):
+            directory = Path("tree", f"d{number % 4}", f"e{number % 3}")
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"{number}.txt").write_text(f"content {number}")
+        os.symlink("missing_target", Path("tree", "dangling"))
+        os.utime(Path("tree", "d1"), (1_000_000, 1_000_000))
+
+        result = cp(["-r", "-j", "4", "tree", "tree_copy"])
+        self.assertIn("ERROR", str(result))
+        self.assertIn("dangling", str(result))
+        self.assertEqual(
+            sorted(str(path.relative_to("tree_copy")) for path in Path("tree_copy").rglob("*.txt")),
+            sorted(str(path.relative_to("tree")) for path in Path("tree").rglob("*.txt")),
+        )
+        self.assertEqual(Path("tree_copy", "d2", "e2", "14.txt").read_text(), "content 14")
+        self.assertEqual(os.stat(Path("tree_copy", "d1")).st_mtime, 1_000_000)
+        self.assertIn("ERROR: Option -j requires a positive number", cp(["-r", "-j", "0", "tree", "x"]))
+
+    def test_cp_update_sync(self) -> None:
+        """Тест cp -u: копируются только изменённые файлы, --delete зеркалирует назначение"""
+        Path("src_tree", "inner").mkdir(parents=True)
+        Path("src_tree", "same.txt").write_text("same")
+        Path("src_tree", "inner", "changed.txt").write_text("old")
+        Path("backup").mkdir()
+        self.assertIsNone(cp(["-r", "src_tree", "backup"]))
+        self.assertIn("File exists", str(cp(["-r", "src_tree", "backup"])))
+
+        mirror = Path("backup", "src_tree")
+        Path("src_tree", "inner", "changed.txt").write_text("new content")
+        Path("src_tree", "added.txt").write_text("added")
+        (mirror / "stale.txt").write_text("stale")
+        (mirror / "stale_dir").mkdir()
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(cp(["-ruv", "src_tree", "backup"]))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[-1], "skipped 1 unchanged, removed 0")
+        self.assertEqual((mirror / "inner" / "changed.txt").read_text(), "new content")
+        self.assertTrue((mirror / "stale.txt").exists())
+
+        os.utime(mirror / "same.txt", (1_000_000, 1_000_000))
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(cp(["-ruv", "--checksum", "--delete", "src_tree", "backup"]))
+        self.assertEqual(output.getvalue(), "skipped 3 unchanged, removed 2\n")
+        self.assertEqual(sorted(os.listdir(mirror)), ["added.txt", "inner", "same.txt"])
+        self.assertIn("require -u", cp(["-r", "--delete", "src_tree", "backup"]))
+
+    def test_cp_sparse_file(self) -> None:
+        """Тест копирования разреженного файла: дыры сохраняются, число блоков совпадает"""
+        with open("sparse.img", "wb") as handle:
+            handle.truncate(64 * 1024 * 1024)
+            for offset in (0, 10 * 1024 * 1024, 40 * 1024 * 1024):
+                handle.seek(offset)
+                handle.write(os.urandom(128 * 1024))
+        source_blocks = os.stat("sparse.img").st_blocks
+        if source_blocks * 512 >= 64 * 1024 * 1024:
+            self.skipTest("filesystem does not support sparse files")
+
+        with patch.object(copy_engine, "_reflink", return_value=False):
+            result = copy_engine.copy_file("sparse.img", "sparse_copy.img")
+        self.assertEqual(result, copy_engine.CopyResult("sparse", 64 * 1024 * 1024))
+        self.assertEqual(os.stat("sparse_copy.img").st_blocks, source_blocks)
+        self.assertEqual(
+            copy_engine.file_digest("sparse.img"), copy_engine.file_digest("sparse_copy.img")
+        )
+
+        self.assertIsNone(cp(["sparse.img", "sparse_cp.img"]))
+        self.assertLessEqual(os.stat("sparse_cp.img").st_blocks, source_blocks)
+
+    def test_cp_resume_partial_file(self) -> None:
+        """Тест --resume: сверенное начало назначения сохраняется, копирование продолжается"""
+        chunk = copy_engine.RESUME_CHUNK
+        data = os.urandom(3 * chunk + 1000)
+        Path("large.bin").write_bytes(data)
+        partial = bytearray(data[:2 * chunk + 500])
+        partial[chunk + 10] ^= 0xFF
+        Path("large_copy.bin").write_bytes(bytes(partial))
+
+        result = copy_engine.copy_file("large.bin", "large_copy.bin", resume=True)
+        self.assertEqual(result.resumed, chunk)
+        self.assertEqual(result.size, len(data))
+        self.assertEqual(Path("large_copy.bin").read_bytes(), data)
+
+        Path("longer.bin").write_bytes(data + b"garbage")
+        self.assertEqual(copy_engine.copy_file("large.bin", "longer.bin", resume=True).resumed, len(data))
+        self.assertEqual(Path("longer.bin").read_bytes(), data)
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertIsNone(cp(["-v", "--resume", "file1.txt", "empty.txt"]))
+        self.assertIn("file1.txt' -> ", output.getvalue())
+        self.assertEqual(Path("empty.txt").read_text(), Path("file1.txt").read_text())
+
+    def test_cp_progress(self) -> None:
+        """Тест индикатора прогресса: итоговая строка с объёмом и процентом"""
+        stream = io.StringIO()
+        progress = Progress(stream, interval=0.0)
+        data = os.urandom(200_000)
+        Path("payload.bin").write_bytes(data)
+        progress.add_total(len(data))
+        copy_engine.copy_file("payload.bin", "payload_copy.bin", progress=progress.advance)
+        progress.finish()
+        self.assertEqual(progress.done, len(data))
+        self.assertIn("195.3 KiB / 195.3 KiB (100%)", stream.getvalue().splitlines()[-1])
+
+        with patch('sys.stderr', new_callable=io.StringIO) as errors:
+            self.assertIsNone(cp(["-r", "--progress", "subdir", "subdir_progress"]))
+        self.assertIn("(100%)", errors.getvalue())
+
+    def test_cp_verify_manifest(self) -> None:
+        """Тест cp --verify --manifest: хэш считается при копировании, назначение проверяется"""
+        result = copy_engine.copy_file("file1.txt", "verified.txt", verify=True)
+        self.assertEqual(result.method, "userspace")
+        self.assertEqual(result.digest, copy_engine.file_digest("file1.txt"))
+
+        self.assertIsNone(cp(["-r", "--manifest", "copy.b2", "subdir", "subdir_verified"]))
+        entries = dict(
+            reversed(line.split("  ", 1)) for line in Path("copy.b2").read_text().splitlines()
+        )
+        copied = sorted(str(path) for path in Path(self.test_dir, "subdir_verified").rglob("*.txt"))
+        self.assertEqual(sorted(entries), copied)
+        for path, digest in entries.items():
+            self.assertEqual(copy_engine.file_digest(path), digest)
+
+        with patch.object(copy_engine, "file_digest", return_value="0" * 128):
+            result = cp(["--verify", "file2.txt", "broken.txt"])
+        self.assertIn("Verification failed", str(result))
+
+    def test_mv_merge_directories(self) -> None:
+        """Тест слияния каталогов в mv: обход без рекурсии, перезапись и частичные ошибки"""
+        deep = os.path.join(*["d"] * 400)
+        for root in ("incoming/uploads", "uploads"):
+            path = root
+            for _ in range(400):
+                path = os.path.join(path, "d")
+                os.makedirs(path, exist_ok=True)
+        Path("incoming", "uploads", deep, "leaf.txt").write_text("leaf")
+        Path("incoming", "uploads", "a.txt").write_text("new")
+        Path("incoming", "uploads", "fresh").mkdir()
+        Path("incoming", "uploads", "fresh", "f.txt").write_text("fresh")
+        Path("incoming", "uploads", "conflict").mkdir()
+
+        Path("uploads", "a.txt").write_text("old")
+        Path("uploads", "conflict").write_text("file in the way")
+        Path("uploads", "kept.txt").write_text("kept")
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(300)
+        try:
+            result = mv(["incoming/uploads", "."])
+        finally:
+            sys.setrecursionlimit(limit)
+
+        self.assertIn("Cannot overwrite", str(result))
+        self.assertEqual(str(result).count("ERROR"), 1)
+        self.assertEqual(Path("uploads", "a.txt").read_text(), "new")
+        self.assertEqual(Path("uploads", "fresh", "f.txt").read_text(), "fresh")
+        self.assertEqual(Path("uploads", deep, "leaf.txt").read_text(), "leaf")
+        self.assertTrue(Path("uploads", "kept.txt").exists())
+        self.assertEqual(os.listdir(Path("incoming", "uploads")), ["conflict"])
+
+    def test_mv_cross_device(self) -> None:
+        """Тест mv между файловыми системами: копирование, затем удаление источника"""
+        exdev = OSError(errno.EXDEV, "Invalid cross-device link")
+        os.symlink("nested.txt", Path("subdir", "link"))
+        with patch("src.commands.mv._rename_item", side_effect=exdev):
+            with patch('sys.stderr', new_callable=io.StringIO) as errors:
+                self.assertIsNone(mv(["--progress", "-j", "2", "subdir", "archive"]))
+            self.assertIsNone(mv(["file1.txt", "archive"]))
+
+        self.assertIn("(100%)", errors.getvalue())
+        self.assertFalse(Path("subdir").exists())
+        self.assertFalse(Path("file1.txt").exists())
+        self.assertEqual(Path("archive", "deep", "deep_file.txt").read_text(), "Very deep")
+        self.assertEqual(os.readlink(Path("archive", "link")), "nested.txt")
+        self.assertEqual(Path("archive", "file1.txt").read_text(), "Hello World!\nLine 2")
+
+        failure = OSError(errno.ENOSPC, "No space left on device")
+        Path("archive", "file2.txt").write_text("existing")
+        with patch("src.commands.mv._rename_item", side_effect=exdev), \
+                patch("src.core.tree_copy.copy_file", side_effect=failure):
+            result = mv(["file2.txt", "archive"])
+        self.assertIn("was not removed", str(result))
+        self.assertTrue(Path("file2.txt").exists())
+        self.assertEqual(Path("archive", "file2.txt").read_text(), "existing")
+        self.assertEqual(sorted(os.listdir("archive")), ["deep", "file1.txt", "file2.txt", "link", "nested.txt"])
+
+    def test_mv_cross_device_merge(self) -> None:
+        """Тест слияния mv между файловыми системами: файлы заменяются без сравнения"""
+        exdev = OSError(errno.EXDEV, "Invalid cross-device link")
+        Path("source", "same").mkdir(parents=True)
+        Path("source", "same", "data.txt").write_text("new")
+        Path("target", "same").mkdir(parents=True)
+        Path("target", "same", "data.txt").write_text("old")
+        stat_source = os.stat(Path("source", "same", "data.txt"))
+        os.utime(Path("target", "same", "data.txt"), ns=(stat_source.st_atime_ns, stat_source.st_mtime_ns))
+
+        with patch("src.commands.mv._rename_item", side_effect=exdev):
+            self.assertIsNone(mv(["source/same", "target"]))
+        self.assertEqual(Path("target", "same", "data.txt").read_text(), "new")
+        self.assertFalse(Path("source", "same").exists())
+
+        Path("source", "same", "data.txt").mkdir(parents=True)
+        with patch("src.commands.mv._rename_item", side_effect=exdev):
+            result = str(mv(["source/same", "target"]))
+        self.assertIn("with different type", result)
+        self.assertNotIn("--delete", result)
+        self.assertTrue(Path("source", "same").exists())
+
+    def test_main_does_not_import_profiler(self) -> None:
+        """Тест запуска: профилировщик импортируется только по запросу"""
+        code = "import sys, src.main; print(sorted({'cProfile', 'pstats', 'tracemalloc'} & set(sys.modules)))"
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True
+        )
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+    def test_tail_follow_closes_failed_watcher(self) -> None:
+        """Тест tail -f: при ошибке add_watch дескриптор inotify закрывается"""
+        stop = threading.Event()
+        stop.set()
+        closed = []
+        with patch("src.commands.head_tail.Inotify") as inotify:
+            inotify.return_value.add_watch.side_effect = OSError(errno.ENOSPC, "inotify watch limit reached")
+            inotify.return_value.close.side_effect = lambda: closed.append(True)
+            _follow(Path("file1.txt"), 0, stop)
+        self.assertEqual(closed, [True])
+
+    def test_grep_deep_tree_line_numbers(self) -> None:
+        """Тест grep: обход глубокого дерева без рекурсии и номера строк через mmap"""
+        path = "logs"
+        for _ in range(400):
+            path = os.path.join(path, "d")
+            os.makedirs(path, exist_ok=True)
+        Path(path, "app.log").write_text("ok\n" * 5000 + "fatal error\n")
+        Path("logs", "a.log").write_text("fatal first\n")
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(300)
+        try:
+            with patch('sys.stdout', new_callable=io.StringIO) as output:
+                self.assertIsNone(grep(["-rn", "fatal", "logs"]))
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            ["logs/a.log:1:fatal first", f"{path}/app.log:5001:fatal error"],
+        )
+
+    def test_rm_parallel_tree(self) -> None:
+        """Тест параллельного rm -r: ссылки не раскрываются, ошибки собираются"""
+        for number in range(60):
+            directory = Path("build", f"d{number % 6}", f"e{number % 3}")
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"{number}.o").write_text("obj")
+        os.symlink(os.path.join(self.test_dir, "subdir"), Path("build", "d0", "outside"))
+
+        with patch('builtins.input', return_value='y'):
+            self.assertIsNone(rm(["-r", "-j", "4", "build"]))
+        self.assertFalse(Path("build").exists())
+        self.assertTrue(Path("subdir", "nested.txt").exists())
+
+        Path("cache", "a", "b").mkdir(parents=True)
+        Path("cache", "a", "b", "f").write_text("x")
+        with patch("os.unlink", side_effect=PermissionError(errno.EACCES, "Permission denied")):
+            removed, errors = remove_tree("cache", jobs=1)
+        self.assertEqual(removed, 0)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Permission denied", errors[0])
+        self.assertEqual(remove_tree("cache").removed, 4)
+        self.assertFalse(Path("cache").exists())
+
+    def test_rm_trash_restore_purge(self) -> None:
+        """Тест rm --trash: перенос в корзину, восстановление и очистка"""
+        with patch.dict(os.environ, {"HOME": self.test_dir}):
+            self.assertIsNone(rm(["--trash", "file1.txt"]))
+            self.assertIn("ERROR", str(rm(["--trash", "subdir"])))
+            self.assertIsNone(rm(["-r", "--trash", "subdir"]))
+            self.assertFalse(Path("file1.txt").exists())
+            self.assertFalse(Path("subdir").exists())
+            self.assertTrue(Path(".shell_trash", "files").is_dir())
+
+            listing = str(trash(["list"]))
+            self.assertIn(str(Path(self.test_dir, "file1.txt")), listing)
+            self.assertIn(str(Path(self.test_dir, "subdir")), listing)
+
+            self.assertIsNone(trash(["restore", "file1.txt"]))
+            self.assertEqual(Path("file1.txt").read_text(), "Hello World!\nLine 2")
+            self.assertIn("not in trash", str(trash(["restore", "file1.txt"])))
+
+            self.assertIsNone(trash(["purge", "--wait", "subdir"]))
+            self.assertEqual(trash(["list"]), "Trash is empty")
+            self.assertEqual(os.listdir(Path(".shell_trash", "purging")), [])
+
+            self.assertIsNone(rm(["--trash", "file2.txt"]))
+            purging_dirs = trash_store.claim_for_purge(trash_store.list_entries())
+            process = trash_store.start_purge(purging_dirs, rate=10)
+            self.assertEqual(process.wait(timeout=30), 0)
+            self.assertEqual(os.listdir(Path(".shell_trash", "purging")), [])
+
+    def test_do_command_logs_only_errors(self) -> None:
+        """Тест do_command: в лог как ошибка попадает только результат "ERROR: ..." """
+        with patch.dict(os.environ, {"HOME": self.test_dir}), patch("src.main.log_command") as logged:
+            self.assertIsNone(rm(["--trash", "file1.txt"]))
+            self.assertIn("file1.txt", str(do_command("file_ops", "trash", ["list"], "trash list")))
+            logged.assert_not_called()
+            do_command("file_ops", "trash", ["restore", "missing"], "trash restore missing")
+        logged.assert_called_once_with("trash restore missing", False, "ERROR: 'missing' is not in trash")
+
+    def test_trash_dir_fallback(self) -> None:
+        """Тест корзины вне домашней файловой системы: корень точки монтирования недоступен"""
+        home = tempfile.mkdtemp(dir="/dev/shm") if os.path.isdir("/dev/shm") else None
+        if home is None or os.stat(home).st_dev == os.stat(self.test_dir).st_dev:
+            self.skipTest("no second file system for the home directory")
+
+        def writable(path: str, mode: int) -> bool:
+            return Path(path) == Path(self.test_dir)
+
+        try:
+            with patch.dict(os.environ, {"HOME": home}), patch("src.core.trash.os.access", writable):
+                self.assertIsNone(rm(["--trash", "file1.txt"]))
+                trash_dir = Path(self.test_dir, f"{trash_store.TRASH_NAME}-{os.getuid()}")
+                self.assertTrue(Path(trash_dir, "files").is_dir())
+                self.assertIn(trash_dir, trash_store.known_trash_dirs())
+
+                result = trash(["purge", "--wait"])
+                self.assertIsNone(result)
+                self.assertEqual(trash(["list"]), "Trash is empty")
+
+            with patch.dict(os.environ, {"HOME": home}), patch("src.core.trash.os.access", return_value=False):
+                shutil.rmtree(trash_dir)
+                self.assertIn("No writable directory for trash", str(rm(["--trash", "file2.txt"])))
+        finally:
+            shutil.rmtree(home)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)